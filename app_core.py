@@ -6,11 +6,11 @@ import subprocess
 import platform
 import datetime
 import threading
+import atexit
 import queue
 import time
 import json
 import re
-import io
 import csv
 import zipfile
 import hashlib
@@ -19,8 +19,11 @@ import tempfile
 import importlib
 import urllib.request
 import urllib.error
+from concurrent.futures import ThreadPoolExecutor
 from urllib.parse import urlparse, urljoin, parse_qs, parse_qsl, urlencode, urlunparse
 
+from captcha_service import CaptchaService
+
 # --- External Libraries for Scraper (lazy-loaded for faster app startup) ---
 requests = None
 BeautifulSoup = None
@@ -230,20 +233,170 @@ def _save_user_settings(settings):
         json.dump(settings, f, indent=2)
     os.replace(tmp_file, USER_SETTINGS_FILE)
 
+# Settings that grow with the number of projects live in a SQLite key-value shard next to
+# user_settings.json, so changing one project's blob writes one row instead of the whole file.
+USER_SETTINGS_SHARD_FILE = os.path.join(APP_CONFIG_DIR, "user_settings_kv.db")
+SHARDED_USER_SETTING_PREFIXES = ("project_tender_extra_info_", "project_details_table_layout_")
+# set_user_setting only updates memory; changes are written by one coalesced flush this
+# many seconds after the first unsaved change, and at interpreter exit.
+USER_SETTINGS_FLUSH_DELAY = 1.5
+_DELETED = object()
+
+
+def _is_sharded_user_setting(key):
+    return str(key).startswith(SHARDED_USER_SETTING_PREFIXES)
+
+
+def _open_user_settings_shard():
+    os.makedirs(APP_CONFIG_DIR, exist_ok=True)
+    conn = sqlite3.connect(USER_SETTINGS_SHARD_FILE, timeout=10)
+    conn.execute("CREATE TABLE IF NOT EXISTS user_settings_kv (key TEXT PRIMARY KEY, value TEXT)")
+    return conn
+
+
+def _read_user_setting_shard(key):
+    conn = _open_user_settings_shard()
+    try:
+        row = conn.execute("SELECT value FROM user_settings_kv WHERE key=?", (key,)).fetchone()
+    finally:
+        conn.close()
+    if row is None:
+        return _DELETED
+    try:
+        return json.loads(row[0])
+    except Exception:
+        return _DELETED
+
+
+def _write_user_setting_shard(changes):
+    conn = _open_user_settings_shard()
+    try:
+        conn.executemany(
+            "INSERT OR REPLACE INTO user_settings_kv (key, value) VALUES (?, ?)",
+            [(k, json.dumps(v)) for k, v in changes.items() if v is not _DELETED],
+        )
+        conn.executemany(
+            "DELETE FROM user_settings_kv WHERE key=?",
+            [(k,) for k, v in changes.items() if v is _DELETED],
+        )
+        conn.commit()
+    finally:
+        conn.close()
+
+
 _user_settings_lock = threading.Lock()
+_user_settings_flush_lock = threading.Lock()
 _user_settings_cache = _load_user_settings()
+_user_settings_shard_cache = {}
+_user_settings_dirty = set()
+_user_settings_flush_timer = None
+_user_settings_migrated = False
+# Keys moved into the shard in memory but not yet saved there.
+_user_settings_unsaved_migration = set()
+
+
+def _migrate_user_settings_locked():
+    """Move per-project blobs left in user_settings.json by older versions into the shard.
+
+    Done in memory on first use; the move is saved with the first settings write, so
+    processes that only read settings (backend, scripts) never rewrite the settings files.
+    Caller holds _user_settings_lock.
+    """
+    global _user_settings_migrated
+    if _user_settings_migrated:
+        return
+    _user_settings_migrated = True
+    for key in [k for k in _user_settings_cache if _is_sharded_user_setting(k)]:
+        _user_settings_shard_cache[key] = _user_settings_cache.pop(key)
+        _user_settings_unsaved_migration.add(key)
+
+
+def _arm_user_settings_flush_locked():
+    global _user_settings_flush_timer
+    if _user_settings_flush_timer is None:
+        timer = threading.Timer(USER_SETTINGS_FLUSH_DELAY, flush_user_settings)
+        timer.daemon = True
+        try:
+            timer.start()
+        except RuntimeError:
+            return  # interpreter shutting down; the exit flush is the last chance anyway
+        _user_settings_flush_timer = timer
+
 
 def get_user_setting(key, default=None):
+    if not _is_sharded_user_setting(key):
+        with _user_settings_lock:
+            _migrate_user_settings_locked()
+            return _user_settings_cache.get(key, default)
     with _user_settings_lock:
-        return _user_settings_cache.get(key, default)
+        _migrate_user_settings_locked()
+        if key in _user_settings_shard_cache:
+            value = _user_settings_shard_cache[key]
+            return default if value is _DELETED else value
+    try:
+        value = _read_user_setting_shard(key)
+    except Exception:
+        return default
+    with _user_settings_lock:
+        # A set_user_setting that raced the read wins.
+        value = _user_settings_shard_cache.setdefault(key, value)
+    return default if value is _DELETED else value
+
 
 def set_user_setting(key, value):
     with _user_settings_lock:
-        _user_settings_cache[key] = value
-        try:
-            _save_user_settings(_user_settings_cache)
-        except Exception:
-            pass
+        _migrate_user_settings_locked()
+        store = _user_settings_shard_cache if _is_sharded_user_setting(key) else _user_settings_cache
+        old = store.get(key, _DELETED)
+        # Same object means the caller mutated it in place, which still needs a write.
+        if old is not value and old == value:
+            return
+        store[key] = value
+        _user_settings_dirty.add(key if store is _user_settings_shard_cache else None)
+        if _user_settings_unsaved_migration:
+            # None marks user_settings.json itself as dirty.
+            _user_settings_dirty.update(_user_settings_unsaved_migration | {None})
+            _user_settings_unsaved_migration.clear()
+        _arm_user_settings_flush_locked()
+
+
+def flush_user_settings():
+    """Write pending user setting changes now; safe to call from any thread and at exit."""
+    global _user_settings_flush_timer
+    with _user_settings_flush_lock:
+        with _user_settings_lock:
+            if _user_settings_flush_timer is not None:
+                _user_settings_flush_timer.cancel()
+                _user_settings_flush_timer = None
+            dirty = set(_user_settings_dirty)
+            _user_settings_dirty.clear()
+            json_snapshot = dict(_user_settings_cache) if None in dirty else None
+            shard_changes = {k: _user_settings_shard_cache.get(k, _DELETED) for k in dirty if k is not None}
+        failed = set()
+        if shard_changes:
+            try:
+                _write_user_setting_shard(shard_changes)
+            except Exception as e:
+                log_to_gui(f"Failed to save project settings: {e}")
+                failed.update(shard_changes)
+        # Write the JSON only after the shard, so migrated blobs are never in neither store.
+        if json_snapshot is not None and not failed:
+            try:
+                _save_user_settings(json_snapshot)
+            except Exception as e:
+                log_to_gui(f"Failed to save user settings: {e}")
+                failed.add(None)
+        elif json_snapshot is not None:
+            failed.add(None)
+        if failed:
+            # Retry on the next debounce instead of holding the changes until exit.
+            with _user_settings_lock:
+                _user_settings_dirty.update(failed)
+                _arm_user_settings_flush_locked()
+
+
+# Every entry point (desktop app, scripts, templates UI) gets the pending debounce written at exit.
+atexit.register(flush_user_settings)
 
 
 def _version_tuple(raw):
@@ -585,6 +738,23 @@ def log_to_gui(message):
     log_queue.put(message)
     print(message)
 
+# Set to stop the running scrape at the next tender/page boundary. Whoever starts a run
+# clears it; the scrape loops only read it, so a multi-website run stops as a whole.
+scrape_cancel_event = threading.Event()
+
+def request_scrape_cancel():
+    scrape_cancel_event.set()
+
+def reset_scrape_cancel():
+    scrape_cancel_event.clear()
+
+def scrape_cancelled():
+    return scrape_cancel_event.is_set()
+
+CAPTCHA_SERVICE_STATE_FILE = os.path.join(APP_CONFIG_DIR, "captcha_service.json")
+captcha_service = CaptchaService(CAPTCHA_SERVICE_STATE_FILE, GOOGLE_API_KEY, log=log_to_gui)
+captcha_service.use_local_backend(get_user_setting("captcha_local_solver", ""))
+
 def resolve_project_folder_path(saved_path, project_title=""):
     raw = str(saved_path or "").strip()
     title = str(project_title or "").strip()
@@ -802,6 +972,11 @@ def init_db():
     )
     c.execute("DROP INDEX IF EXISTS idx_downloaded_file_unique")
     c.execute("CREATE UNIQUE INDEX IF NOT EXISTS idx_downloaded_file_unique ON downloaded_files(tender_id, file_name, file_type)")
+    create_hot_path_indexes(c)
+    ensure_tender_fts(c)
+    ensure_tender_sort_keys(c)
+    ensure_download_state_columns(c)
+    ensure_status_check_columns(c)
     c.execute('''CREATE TABLE IF NOT EXISTS app_settings (
         key TEXT PRIMARY KEY,
         value TEXT
@@ -820,11 +995,1213 @@ def init_db():
     conn.commit()
     conn.close()
 
+# Index plan for the hot tender/download-log queries. The expression columns must match
+# the COALESCE(...) predicates used by the table loaders and download pipeline verbatim,
+# otherwise SQLite will not pick them.
+HOT_PATH_INDEXES = [
+    # Active/Archived tender tabs (all websites): is_archived filter + ORDER BY COALESCE(created_at,'') DESC,
+    # non-NULL so the tabs can page with a keyset on (created_at, id).
+    ("idx_tenders_archived_created_nn", "tenders(COALESCE(is_archived,0), COALESCE(created_at,''))"),
+    # Same tabs filtered to one website.
+    ("idx_tenders_site_archived_created_nn", "tenders(website_id, COALESCE(is_archived,0), COALESCE(created_at,''))"),
+    # download_tenders_logic / status checks: marked tenders of a website.
+    ("idx_tenders_site_marked", "tenders(website_id, COALESCE(is_downloaded,0), COALESCE(is_archived,0))"),
+    # upsert_tender_row third probe (org_chain, title, closing_date); covering for ORDER BY id.
+    ("idx_tenders_site_org_title_closing", "tenders(website_id, org_chain, title, closing_date)"),
+    # Download log (get_download_log_rows, all websites or one) walked newest first.
+    ("idx_downloaded_files_at", "downloaded_files(downloaded_at)"),
+]
+
+
+# Superseded by the *_nn variants above; per-tender file lookups use idx_downloaded_file_unique.
+RETIRED_INDEXES = ["idx_tenders_archived_created", "idx_tenders_site_archived_created", "idx_downloaded_files_tid_at"]
+
+
+def create_hot_path_indexes(cursor):
+    for name in RETIRED_INDEXES:
+        cursor.execute(f"DROP INDEX IF EXISTS {name}")
+    for name, target in HOT_PATH_INDEXES:
+        cursor.execute(f"CREATE INDEX IF NOT EXISTS {name} ON {target}")
+
+
+TENDER_FTS_TABLE = "tenders_fts"
+TENDER_FTS_COLUMNS = (
+    "tender_id", "title", "work_description", "org_chain", "location", "tender_category",
+    "tender_value", "emd", "status",
+)
+# Trigram tokens match any substring of three or more characters.
+TENDER_FTS_MIN_TERM = 3
+_tender_fts_available = None
+_tender_fts_trigram = False
+
+
+def _fts_trigram_supported(cursor):
+    try:
+        cursor.execute("CREATE VIRTUAL TABLE temp._fts_trigram_probe USING fts5(x, tokenize='trigram')")
+        cursor.execute("DROP TABLE temp._fts_trigram_probe")
+        return True
+    except sqlite3.OperationalError:
+        return False
+
+
+def _drop_tender_fts(cursor):
+    for suffix in ("ai", "ad", "au"):
+        cursor.execute(f"DROP TRIGGER IF EXISTS {TENDER_FTS_TABLE}_{suffix}")
+    cursor.execute(f"DROP TABLE IF EXISTS {TENDER_FTS_TABLE}")
+
+
+def ensure_tender_fts(cursor):
+    """
+    Create the external-content FTS5 index over tenders and its sync triggers.
+    Uses the trigram tokenizer (substring matching) when SQLite has it, else unicode61
+    with prefix matching; an index built with an older tokenizer or column set is rebuilt.
+    """
+    global _tender_fts_available, _tender_fts_trigram
+    cols_csv = ", ".join(TENDER_FTS_COLUMNS)
+    new_csv = ", ".join(f"new.{col}" for col in TENDER_FTS_COLUMNS)
+    old_csv = ", ".join(f"old.{col}" for col in TENDER_FTS_COLUMNS)
+    trigram = _fts_trigram_supported(cursor)
+    row = cursor.execute(
+        "SELECT sql FROM sqlite_master WHERE type='table' AND name=?", (TENDER_FTS_TABLE,)
+    ).fetchone()
+    existed = bool(row)
+    if existed:
+        existing_sql = str(row[0] or "")
+        current = ("trigram" in existing_sql) == trigram and all(col in existing_sql for col in TENDER_FTS_COLUMNS)
+        if not current:
+            _drop_tender_fts(cursor)
+            existed = False
+    tokenize = "tokenize='trigram'" if trigram else "tokenize='unicode61 remove_diacritics 2', prefix='2 3'"
+    try:
+        cursor.execute(
+            f"""CREATE VIRTUAL TABLE IF NOT EXISTS {TENDER_FTS_TABLE} USING fts5(
+                {cols_csv},
+                content='tenders', content_rowid='id',
+                {tokenize}
+            )"""
+        )
+    except sqlite3.OperationalError as e:
+        # SQLite build without FTS5: callers fall back to in-Python matching.
+        _tender_fts_available = False
+        log_to_gui(f"FTS5 unavailable, using fallback search: {e}")
+        return False
+    cursor.execute(
+        f"""CREATE TRIGGER IF NOT EXISTS {TENDER_FTS_TABLE}_ai AFTER INSERT ON tenders BEGIN
+            INSERT INTO {TENDER_FTS_TABLE}(rowid, {cols_csv}) VALUES (new.id, {new_csv});
+        END"""
+    )
+    cursor.execute(
+        f"""CREATE TRIGGER IF NOT EXISTS {TENDER_FTS_TABLE}_ad AFTER DELETE ON tenders BEGIN
+            INSERT INTO {TENDER_FTS_TABLE}({TENDER_FTS_TABLE}, rowid, {cols_csv}) VALUES ('delete', old.id, {old_csv});
+        END"""
+    )
+    cursor.execute(
+        f"""CREATE TRIGGER IF NOT EXISTS {TENDER_FTS_TABLE}_au AFTER UPDATE OF {cols_csv} ON tenders BEGIN
+            INSERT INTO {TENDER_FTS_TABLE}({TENDER_FTS_TABLE}, rowid, {cols_csv}) VALUES ('delete', old.id, {old_csv});
+            INSERT INTO {TENDER_FTS_TABLE}(rowid, {cols_csv}) VALUES (new.id, {new_csv});
+        END"""
+    )
+    # Rebuild when freshly created, or when a DB snapshot was written by a build
+    # without the triggers and the index drifted from the content table.
+    needs_rebuild = not existed
+    if not needs_rebuild:
+        indexed = cursor.execute(f"SELECT COUNT(*) FROM {TENDER_FTS_TABLE}_docsize").fetchone()[0]
+        total = cursor.execute("SELECT COUNT(*) FROM tenders").fetchone()[0]
+        needs_rebuild = int(indexed or 0) != int(total or 0)
+    if needs_rebuild:
+        cursor.execute(f"INSERT INTO {TENDER_FTS_TABLE}({TENDER_FTS_TABLE}) VALUES ('rebuild')")
+    _tender_fts_available = True
+    _tender_fts_trigram = trigram
+    return True
+
+
+def tender_fts_available():
+    global _tender_fts_available, _tender_fts_trigram
+    if _tender_fts_available is None:
+        conn = sqlite3.connect(DB_FILE)
+        try:
+            row = conn.execute(
+                "SELECT sql FROM sqlite_master WHERE type='table' AND name=?", (TENDER_FTS_TABLE,)
+            ).fetchone()
+            _tender_fts_available = bool(row)
+            _tender_fts_trigram = bool(row) and "trigram" in str(row[0] or "")
+        except Exception:
+            _tender_fts_available = False
+        finally:
+            conn.close()
+    return _tender_fts_available
+
+
+def build_fts_match(text, columns=None):
+    """
+    Turn free text into an FTS5 MATCH expression in which every whitespace-separated word
+    must match. With the trigram index a word matches as a substring ("road" finds
+    "Railroad") and words shorter than TENDER_FTS_MIN_TERM are left out, since trigrams
+    cannot match them; otherwise a word is a token-prefix phrase ("2024 mcgm"* for 2024_MCGM).
+    Returns "" when the text has no searchable words.
+    """
+    terms = []
+    for word in str(text or "").split():
+        if _tender_fts_trigram:
+            if len(word) >= TENDER_FTS_MIN_TERM:
+                terms.append('"' + word.replace('"', '""') + '"')
+            continue
+        parts = re.findall(r"[^\W_]+", word.lower())
+        if parts:
+            terms.append('"' + " ".join(parts) + '"*')
+    if not terms:
+        return ""
+    expr = " AND ".join(terms)
+    cols = [c for c in (columns or []) if c in TENDER_FTS_COLUMNS]
+    if cols:
+        return "{" + " ".join(cols) + "} : (" + expr + ")"
+    return expr
+
+
+def build_fts_substring(text, columns):
+    """
+    MATCH expression for "columns contain text" with the same meaning as a substring test,
+    or "" when the index cannot answer that (no trigram tokenizer, or text too short).
+    """
+    text = str(text or "").strip()
+    cols = [c for c in (columns or []) if c in TENDER_FTS_COLUMNS]
+    if not _tender_fts_trigram or len(text) < TENDER_FTS_MIN_TERM or not cols:
+        return ""
+    return "{" + " ".join(cols) + '} : "' + text.replace('"', '""') + '"'
+
+
+def search_tender_ids(text, columns=None, limit=None):
+    """Return tender row ids matching text, best bm25 rank first."""
+    match = build_fts_match(text, columns)
+    if not match or not tender_fts_available():
+        return []
+    sql = (
+        f"SELECT rowid FROM {TENDER_FTS_TABLE} WHERE {TENDER_FTS_TABLE} MATCH ? "
+        f"ORDER BY bm25({TENDER_FTS_TABLE})"
+    )
+    params = [match]
+    if limit:
+        sql += " LIMIT ?"
+        params.append(int(limit))
+    conn = sqlite3.connect(DB_FILE)
+    try:
+        return [int(r[0]) for r in conn.execute(sql, tuple(params)).fetchall()]
+    except sqlite3.OperationalError:
+        return []
+    finally:
+        conn.close()
+
+
+# Normalised copies of the free-text scraped columns, so the tender tables can filter,
+# sort and page in SQL. sort_keys_ready is cleared by trigger whenever a source column
+# changes (and is 0 for new rows); refresh_tender_sort_keys() re-derives those rows.
+TENDER_SORT_KEY_COLUMNS = [
+    ("value_num", "REAL"),
+    ("emd_num", "REAL"),
+    ("closing_day_text", "TEXT"),
+    ("closing_time_text", "TEXT"),
+    ("closing_at", "TEXT"),
+    ("pre_bid_at", "TEXT"),
+    ("sort_keys_ready", "INTEGER DEFAULT 0"),
+]
+TENDER_DATE_FORMATS = ("%d-%b-%Y %I:%M %p", "%d-%b-%Y", "%d-%m-%Y", "%Y-%m-%d %H:%M:%S", "%Y-%m-%d")
+
+
+def parse_amount(value):
+    """Parse a scraped amount ("1,23,456.00", "Rs. 500", "INR 10") to float, None for NA/text."""
+    try:
+        return float(str(value).replace(",", "").replace("Rs.", "").replace("INR", "").strip())
+    except Exception:
+        return None
+
+
+def parse_tender_datetime(value):
+    """Parse a scraped portal date to ISO "YYYY-MM-DD HH:MM:SS", "" when unparseable."""
+    s = str(value or "").strip()
+    for fmt in TENDER_DATE_FORMATS:
+        try:
+            return datetime.datetime.strptime(s, fmt).strftime("%Y-%m-%d %H:%M:%S")
+        except Exception:
+            continue
+    return ""
+
+
+def split_closing_date(value):
+    """Split "12-Mar-2025 03:00 PM" into ("12-Mar-2025", "03:00 PM") as the tender tables show it."""
+    txt = str(value or "").strip()
+    if not txt:
+        return "", ""
+    m = re.search(r"^(.+?)\s+(\d{1,2}:\d{2}(?::\d{2})?\s*[APMapm]{0,2})$", txt)
+    if m:
+        return m.group(1).strip(), m.group(2).strip().upper()
+    return txt, ""
+
+
+def ensure_tender_sort_keys(cursor):
+    for col, ddl in TENDER_SORT_KEY_COLUMNS:
+        try:
+            cursor.execute(f"ALTER TABLE tenders ADD COLUMN {col} {ddl}")
+        except sqlite3.OperationalError:
+            pass
+    cursor.execute(
+        """CREATE TRIGGER IF NOT EXISTS tenders_sort_keys_au
+           AFTER UPDATE OF tender_value, emd, closing_date, pre_bid_meeting_date ON tenders BEGIN
+               UPDATE tenders SET sort_keys_ready=0 WHERE id=new.id;
+           END"""
+    )
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_tenders_sort_keys_stale ON tenders(id) WHERE sort_keys_ready=0")
+    refresh_tender_sort_keys(cursor)
+
+
+def refresh_tender_sort_keys(conn, batch_size=2000):
+    """
+    Derive the normalised sort/filter columns for rows flagged stale. Cheap when nothing
+    changed (one probe of the partial index), so table loaders call it before querying.
+    Returns the number of rows refreshed; the caller commits.
+    """
+    total = 0
+    while True:
+        rows = conn.execute(
+            """SELECT id, tender_value, emd, closing_date, pre_bid_meeting_date
+               FROM tenders WHERE sort_keys_ready=0 LIMIT ?""",
+            (int(batch_size),),
+        ).fetchall()
+        if not rows:
+            break
+        updates = []
+        for db_id, value, emd, closing, pre_bid in rows:
+            day_text, time_text = split_closing_date(closing)
+            updates.append((
+                parse_amount(value), parse_amount(emd), day_text, time_text,
+                parse_tender_datetime(closing), parse_tender_datetime(pre_bid), db_id,
+            ))
+        conn.executemany(
+            """UPDATE tenders SET value_num=?, emd_num=?, closing_day_text=?, closing_time_text=?,
+                      closing_at=?, pre_bid_at=?, sort_keys_ready=1
+               WHERE id=?""",
+            updates,
+        )
+        total += len(rows)
+    return total
+
+
+# Cached "Download" action label per tender ('', 'Open', 'Unzip & Open'), so table loads never
+# touch the filesystem. download_state_key is "<folder>|<dir mtime_ns>" at the time the label
+# was computed; NULL means stale (new rows, or folder_path/last_downloaded_at changed).
+DOWNLOAD_STATE_COLUMNS = [
+    ("download_state", "TEXT DEFAULT ''"),
+    ("download_state_key", "TEXT"),
+]
+
+
+def ensure_download_state_columns(cursor):
+    for col, ddl in DOWNLOAD_STATE_COLUMNS:
+        try:
+            cursor.execute(f"ALTER TABLE tenders ADD COLUMN {col} {ddl}")
+        except sqlite3.OperationalError:
+            pass
+    cursor.execute(
+        """CREATE TRIGGER IF NOT EXISTS tenders_download_state_au
+           AFTER UPDATE OF tender_id, folder_path, last_downloaded_at ON tenders BEGIN
+               UPDATE tenders SET download_state_key=NULL WHERE id=new.id;
+           END"""
+    )
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_tenders_download_state_stale ON tenders(id) WHERE download_state_key IS NULL")
+
+
+def tender_archive_paths(folder_path, tender_id):
+    safe_id = re.sub(r'[\\/*?:"<>|]', "", str(tender_id or ""))
+    preferred = []
+    if safe_id:
+        preferred.append(os.path.join(folder_path, f"{safe_id}.rar"))
+        preferred.append(os.path.join(folder_path, f"{safe_id}.zip"))
+    existing = [p for p in preferred if os.path.exists(p)]
+    if existing:
+        return existing
+    generic = []
+    try:
+        for name in os.listdir(folder_path):
+            lower = name.lower()
+            if lower.endswith(".rar") or lower.endswith(".zip"):
+                generic.append(os.path.join(folder_path, name))
+    except Exception:
+        return []
+    return sorted(generic)
+
+
+def is_tender_folder_extracted(folder_path, archive_paths):
+    archive_names = {os.path.basename(p).lower() for p in archive_paths}
+    try:
+        for name in os.listdir(folder_path):
+            low = name.lower()
+            if low in archive_names:
+                continue
+            if low.endswith(".crdownload") or low.endswith(".part"):
+                continue
+            return True
+    except Exception:
+        return False
+    return False
+
+
+def compute_download_state(folder_path, tender_id):
+    if not folder_path or not os.path.exists(folder_path):
+        return ""
+    archive_paths = tender_archive_paths(folder_path, tender_id)
+    if not archive_paths:
+        return "Open"
+    return "Open" if is_tender_folder_extracted(folder_path, archive_paths) else "Unzip & Open"
+
+
+def _download_state_key(folder_path):
+    if not folder_path:
+        return ""
+    try:
+        return f"{folder_path}|{os.stat(folder_path).st_mtime_ns}"
+    except OSError:
+        return f"{folder_path}|missing"
+
+
+def refresh_download_states(full=False, tender_ids=None):
+    """
+    Recompute tenders.download_state where it may be out of date. By default only rows
+    flagged stale are probed; full=True also stats every tender folder and recomputes those
+    whose directory mtime moved (files added/extracted outside the app). tender_ids limits
+    the pass to those rows. Returns the number of rows whose label changed.
+    """
+    conn = sqlite3.connect(DB_FILE)
+    try:
+        sql = "SELECT id, COALESCE(tender_id,''), COALESCE(folder_path,''), download_state_key, COALESCE(download_state,'') FROM tenders"
+        params = []
+        if tender_ids:
+            ids = [int(x) for x in tender_ids]
+            sql += f" WHERE id IN ({','.join('?' * len(ids))})"
+            params.extend(ids)
+        elif not full:
+            sql += " WHERE download_state_key IS NULL"
+        rows = conn.execute(sql, tuple(params)).fetchall()
+        updates = []
+        changed = 0
+        for db_id, tender_id, folder_path, old_key, old_state in rows:
+            key = _download_state_key(folder_path)
+            if key == old_key and not tender_ids:
+                continue
+            state = compute_download_state(folder_path, tender_id) if folder_path else ""
+            if state != old_state:
+                changed += 1
+            updates.append((state, key, db_id))
+        for i in range(0, len(updates), 500):
+            conn.executemany("UPDATE tenders SET download_state=?, download_state_key=? WHERE id=?", updates[i:i + 500])
+            conn.commit()
+        return changed
+    finally:
+        conn.close()
+
+
+def mark_download_states_stale(tender_ids=None):
+    conn = sqlite3.connect(DB_FILE)
+    try:
+        if tender_ids:
+            ids = [int(x) for x in tender_ids]
+            conn.execute(f"UPDATE tenders SET download_state_key=NULL WHERE id IN ({','.join('?' * len(ids))})", ids)
+        else:
+            conn.execute("UPDATE tenders SET download_state_key=NULL")
+        conn.commit()
+    finally:
+        conn.close()
+
+
+# Status checks: a status is re-read from the portal only once it is older than the TTL,
+# and never once the tender has reached a terminal stage.
+TERMINAL_TENDER_STATUSES = ("AOC", "Concluded", "Cancelled")
+DEFAULT_STATUS_CHECK_TTL_HOURS = 6
+STATUS_BATCH_MIN_TENDERS = 2
+STATUS_BATCH_MAX_PAGES = 40
+
+
+def ensure_status_check_columns(cursor):
+    try:
+        cursor.execute("ALTER TABLE tenders ADD COLUMN status_checked_at TEXT")
+    except sqlite3.OperationalError:
+        pass
+
+
+def status_check_ttl_hours():
+    try:
+        return max(0.0, float(get_user_setting("status_check_ttl_hours", DEFAULT_STATUS_CHECK_TTL_HOURS)))
+    except Exception:
+        return float(DEFAULT_STATUS_CHECK_TTL_HOURS)
+
+
+def status_check_due_sql(include_terminal=False):
+    """WHERE fragment (and params) selecting tenders whose cached status needs a portal check."""
+    clauses = [
+        "(TRIM(COALESCE(status,''))='' OR status_checked_at IS NULL OR status_checked_at < datetime('now', ?))"
+    ]
+    params = [f"-{status_check_ttl_hours()} hours"]
+    if not include_terminal:
+        clauses.append(f"COALESCE(status,'') NOT IN ({','.join('?' * len(TERMINAL_TENDER_STATUSES))})")
+        params.extend(TERMINAL_TENDER_STATUSES)
+    return " AND ".join(clauses), params
+
+
+def save_tender_statuses(statuses):
+    """Write {tender db id: status} in one transaction, stamping status_checked_at."""
+    if not statuses:
+        return 0
+    conn = sqlite3.connect(DB_FILE, timeout=30)
+    try:
+        with conn:
+            conn.executemany(
+                "UPDATE tenders SET status=?, status_checked_at=datetime('now') WHERE id=?",
+                [(status, int(db_id)) for db_id, status in statuses.items()],
+            )
+    finally:
+        conn.close()
+    return len(statuses)
+
+
+def optimize_db():
+    """Refresh planner statistics; run from scheduled maintenance, not on hot paths."""
+    conn = sqlite3.connect(DB_FILE)
+    try:
+        has_stats = conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE type='table' AND name='sqlite_stat1'"
+        ).fetchone()
+        if not has_stats:
+            # First run: PRAGMA optimize only analyzes tables it considers stale,
+            # so collect a full baseline once.
+            conn.execute("ANALYZE")
+        conn.execute("PRAGMA optimize")
+        conn.commit()
+        return True
+    except Exception as e:
+        log_to_gui(f"Database optimize failed: {e}")
+        return False
+    finally:
+        conn.close()
+
+
+class ScrapeCheckpoint:
+    """Items a long scrape has finished, appended to a JSON-lines file as each completes.
+
+    A resumed run loads the file (or is seeded with `done`) and skips those items.
+    """
+
+    def __init__(self, path=None, done=()):
+        self.path = path
+        self._lock = threading.Lock()
+        self._done = set()
+        if path and os.path.exists(path):
+            with open(path, "r", encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        self._done.add(str(json.loads(line)["item"]))
+                    except Exception:
+                        continue
+        for item in done:
+            if str(item) not in self._done:
+                self.mark_done(item)
+
+    @property
+    def done(self):
+        with self._lock:
+            return frozenset(self._done)
+
+    def is_done(self, item):
+        with self._lock:
+            return str(item) in self._done
+
+    def mark_done(self, item):
+        item = str(item)
+        with self._lock:
+            self._done.add(item)
+            if not self.path:
+                return
+            try:
+                with open(self.path, "a", encoding="utf-8") as f:
+                    f.write(json.dumps({"item": item, "at": datetime.datetime.now().isoformat()}) + "\n")
+            except Exception as e:
+                log_to_gui(f"Checkpoint write failed: {e}")
+
+
+class DownloadLogSession:
+    """Per-tender view of downloaded_files: skip checks from memory, one write per tender.
+
+    Each tender being processed gets its own session, so concurrent tenders never
+    share state; the lock only guards callbacks racing within one tender.
+    """
+
+    def __init__(self, tender_id):
+        self.tender_id = str(tender_id)
+        self._lock = threading.Lock()
+        self._logged = None
+        self._pending = {}
+
+    def _ensure_loaded(self):
+        if self._logged is None:
+            conn = sqlite3.connect(DB_FILE, timeout=30)
+            try:
+                rows = conn.execute(
+                    "SELECT file_name FROM downloaded_files WHERE tender_id=?", (self.tender_id,)
+                ).fetchall()
+            finally:
+                conn.close()
+            self._logged = {r[0] for r in rows}
+            self._logged.update(name for name, _ in self._pending)
+        return self._logged
+
+    def record(self, file_name, file_type="document", source_url=None, local_path=None):
+        file_name = str(file_name)
+        file_type = str(file_type)
+        with self._lock:
+            if self._logged is not None:
+                self._logged.add(file_name)
+            # Same key as idx_downloaded_file_unique; first record wins like INSERT OR IGNORE.
+            self._pending.setdefault((file_name, file_type), (source_url, local_path))
+
+    def should_skip(self, file_name, file_path):
+        file_name = str(file_name)
+        if not os.path.exists(file_path):
+            return False
+        with self._lock:
+            logged = self._ensure_loaded()
+            if file_name not in logged:
+                # Backfill legacy files into DB log on first encounter.
+                logged.add(file_name)
+                self._pending.setdefault((file_name, "document"), (None, None))
+        return True
+
+    def flush(self):
+        with self._lock:
+            if not self._pending:
+                return 0
+            pending, self._pending = self._pending, {}
+        rows = [
+            (self.tender_id, name, ftype, source_url, local_path)
+            for (name, ftype), (source_url, local_path) in pending.items()
+        ]
+        conn = sqlite3.connect(DB_FILE, timeout=30)
+        try:
+            with conn:
+                conn.executemany(
+                    "INSERT OR IGNORE INTO downloaded_files (tender_id, file_name, file_type, source_url, local_path) VALUES (?, ?, ?, ?, ?)",
+                    rows
+                )
+        except Exception:
+            with self._lock:
+                for key, val in pending.items():
+                    self._pending.setdefault(key, val)
+            raise
+        finally:
+            conn.close()
+        return len(rows)
+
+    def close(self):
+        try:
+            self.flush()
+        except Exception as e:
+            log_to_gui(f"Could not save download log for {self.tender_id}: {e}")
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+        return False
+
+
+DOWNLOAD_WORKERS = 4
+DOWNLOAD_CHUNK_SIZE = 256 * 1024
+DOWNLOAD_ATTEMPTS = 3
+DOWNLOAD_TIMEOUT = (20, 120)
+PARTIAL_DOWNLOAD_SUFFIX = ".part"
+
+_portal_sessions = {}
+_portal_sessions_lock = threading.Lock()
+_partial_downloads = {}
+_partial_downloads_lock = threading.Lock()
+_download_executor = None
+_download_executor_lock = threading.Lock()
+# Shared DocumentBlobStore set by the backend; the desktop app downloads straight to its folders.
+document_blob_store = None
+# Backend hook recording each saved document for the running job: `record(path, sha256=None)`.
+download_journal = None
+
+
+class DownloadVerificationError(Exception):
+    pass
+
+
+def _cookie_signature(cookies):
+    return tuple(sorted(
+        (str(c.get("name")), str(c.get("value")), str(c.get("domain") or ""), str(c.get("path") or "/"))
+        for c in (cookies or [])
+    ))
+
+
+def portal_download_session(url, cookies):
+    """Return the pooled requests session for the portal serving `url`.
+
+    Cookies are copied from the Selenium driver only when they differ from the
+    last set applied, so repeated downloads reuse the same jar and connections.
+    """
+    netloc = urlparse(url).netloc.lower()
+    signature = _cookie_signature(cookies)
+    with _portal_sessions_lock:
+        entry = _portal_sessions.get(netloc)
+        if entry is None:
+            s = _new_scraper_session()
+            adapter = requests.adapters.HTTPAdapter(pool_connections=1, pool_maxsize=DOWNLOAD_WORKERS)
+            s.mount("http://", adapter)
+            s.mount("https://", adapter)
+            entry = {"session": s, "cookies": None}
+            _portal_sessions[netloc] = entry
+        if entry["cookies"] != signature:
+            # Swap in a fresh jar so downloads already in flight never see a half-filled one.
+            jar = requests.cookies.RequestsCookieJar()
+            for c in cookies or []:
+                jar.set(c["name"], c["value"], domain=c.get("domain"), path=c.get("path"))
+            entry["session"].cookies = jar
+            entry["cookies"] = signature
+        return entry["session"]
+
+
+def _content_range_total(value):
+    m = re.match(r"bytes\s+(\d+)-(\d+)/(\d+|\*)", str(value or "").strip())
+    if not m:
+        return None, None
+    total = int(m.group(3)) if m.group(3) != "*" else None
+    return int(m.group(1)), total
+
+
+def _file_sha256(path):
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(DOWNLOAD_CHUNK_SIZE), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def _forget_partial(part_path):
+    with _partial_downloads_lock:
+        _partial_downloads.pop(part_path, None)
+
+
+def _fetch_to_partial(session, url, part_path):
+    """Stream `url` into `part_path`, resuming with Range when a partial file exists.
+
+    Returns the expected total size, or None when the server did not state one.
+    """
+    offset = os.path.getsize(part_path) if os.path.exists(part_path) else 0
+    with _partial_downloads_lock:
+        meta = _partial_downloads.get(part_path)
+    headers = {}
+    if offset and meta:
+        headers["Range"] = f"bytes={offset}-"
+        if meta.get("validator"):
+            headers["If-Range"] = meta["validator"]
+    else:
+        # Without the validator from the run that wrote it, a leftover partial could
+        # belong to a different version of the document.
+        offset = 0
+    r = session.get(url, stream=True, timeout=DOWNLOAD_TIMEOUT, headers=headers)
+    try:
+        if r.status_code == 416 and offset:
+            if meta.get("total") == offset:
+                return offset
+            _forget_partial(part_path)
+            raise DownloadVerificationError("server rejected the resume range")
+        r.raise_for_status()
+        if r.status_code == 206:
+            start, total = _content_range_total(r.headers.get("Content-Range"))
+            known_total = (meta or {}).get("total")
+            if start != offset or (known_total and total and total != known_total):
+                _forget_partial(part_path)
+                raise DownloadVerificationError("server returned an unexpected byte range")
+            mode = "ab"
+        else:
+            offset = 0
+            length = r.headers.get("Content-Length")
+            total = int(length) if length and length.isdigit() and "Content-Encoding" not in r.headers else None
+            mode = "wb"
+        validator = _strong_validator(r.headers)
+        with _partial_downloads_lock:
+            _partial_downloads[part_path] = {"validator": validator, "total": total}
+        with open(part_path, mode) as f:
+            for chunk in r.iter_content(chunk_size=DOWNLOAD_CHUNK_SIZE):
+                if chunk:
+                    f.write(chunk)
+        return total
+    finally:
+        r.close()
+
+
+def download_document(url, file_path, cookies, expected_sha256=None):
+    """Download `url` to `file_path` through the portal's pooled session.
+
+    Data is written to `<file_path>.part` and renamed into place only after the
+    size (Content-Length/Content-Range) and optional SHA-256 check pass, so an
+    interrupted download never leaves a truncated file under the final name.
+    Interrupted transfers resume with an HTTP Range request on the next attempt.
+    Returns the response validators as {"validator": ETag/Last-Modified, "total": size}.
+    """
+    session = portal_download_session(url, cookies)
+    part_path = file_path + PARTIAL_DOWNLOAD_SUFFIX
+    last_error = None
+    for attempt in range(DOWNLOAD_ATTEMPTS):
+        try:
+            total = _fetch_to_partial(session, url, part_path)
+            size = os.path.getsize(part_path)
+            if total is not None and size != total:
+                raise DownloadVerificationError(f"received {size} of {total} bytes")
+            if expected_sha256 and _file_sha256(part_path).lower() != str(expected_sha256).lower():
+                os.remove(part_path)
+                _forget_partial(part_path)
+                raise DownloadVerificationError("SHA-256 mismatch")
+            with _partial_downloads_lock:
+                meta = dict(_partial_downloads.get(part_path) or {})
+            os.replace(part_path, file_path)
+            _forget_partial(part_path)
+            return {"validator": meta.get("validator"), "total": meta.get("total")}
+        except (DownloadVerificationError, requests.exceptions.ConnectionError,
+                requests.exceptions.Timeout, requests.exceptions.ChunkedEncodingError) as e:
+            last_error = e
+        if attempt + 1 < DOWNLOAD_ATTEMPTS:
+            time.sleep(1 + attempt)
+    raise last_error
+
+
+def _strong_validator(headers):
+    """Strong ETag, else Last-Modified; weak ETags (W/...) identify no particular bytes."""
+    etag = str(headers.get("ETag") or "").strip()
+    if etag and not etag.startswith("W/"):
+        return etag
+    return headers.get("Last-Modified") or None
+
+
+def _head_validators(url, cookies):
+    """Strong ETag/Last-Modified and Content-Length the portal reports for `url` now, or None."""
+    try:
+        r = portal_download_session(url, cookies).head(url, allow_redirects=True, timeout=DOWNLOAD_TIMEOUT)
+    except requests.exceptions.RequestException:
+        return None
+    try:
+        if r.status_code != 200:
+            return None
+        length = r.headers.get("Content-Length")
+        total = int(length) if length and length.isdigit() and "Content-Encoding" not in r.headers else None
+        return {"validator": _strong_validator(r.headers), "total": total}
+    finally:
+        r.close()
+
+
+def fetch_document(url, file_path, cookies, expected_sha256=None):
+    """Save `url` to `file_path` with download_document, through the shared blob store if one is set.
+
+    A URL fetched within the store's reuse window is linked from its blob if it was saved
+    with a strong ETag or Last-Modified and a HEAD still reports the same one. Portal
+    DirectLink hrefs are session-scoped, so a URL without such a validator is never
+    trusted (nor HEADed): it is downloaded again and deduplicated by content hash. The
+    saved file is reported to `download_journal` when one is set.
+    Returns True when the file came from the store.
+    """
+    store = document_blob_store
+    reused = False
+    sha256 = None
+    entry = store.recent(url) if store is not None else None
+    if entry is not None and entry.get("validator"):
+        head = _head_validators(url, cookies)
+        if head and store.still_valid(entry, head["validator"], head["total"]):
+            reused = store.materialize(entry, file_path, expected_sha256=expected_sha256)
+            sha256 = entry["sha256"] if reused else None
+    if not reused:
+        validators = download_document(url, file_path, cookies, expected_sha256=expected_sha256)
+        if store is not None:
+            try:
+                sha256 = store.add(url, file_path, validators.get("validator"), validators.get("total"))
+            except OSError as e:
+                # The download itself is fine; it just stays a private copy.
+                log_to_gui(f"Document store skipped {os.path.basename(file_path)}: {e}")
+    journal = download_journal
+    if journal is not None:
+        journal.record(file_path, sha256=sha256)
+    return reused
+
+
+def download_pool():
+    """Shared bounded pool for document downloads across tenders."""
+    global _download_executor
+    with _download_executor_lock:
+        if _download_executor is None:
+            _download_executor = ThreadPoolExecutor(max_workers=DOWNLOAD_WORKERS, thread_name_prefix="doc-download")
+        return _download_executor
+
+# Selenium wait profiles. `settle` is an extra pause after a readiness condition
+# holds, for portals that render late; `fast` relies on the conditions alone.
+SELENIUM_TIMING_PROFILES = {
+    "fast": {"settle": 0.0, "page_timeout": 20, "submit_timeout": 10, "poll": 0.1},
+    "balanced": {"settle": 0.3, "page_timeout": 30, "submit_timeout": 15, "poll": 0.2},
+    "cautious": {"settle": 1.5, "page_timeout": 45, "submit_timeout": 25, "poll": 0.5},
+}
+DEFAULT_SELENIUM_TIMING_PROFILE = "balanced"
+
+_selenium_step_timings = {}
+_selenium_step_timings_lock = threading.Lock()
+
+
+def selenium_timing_profile():
+    """Active profile from the `selenium_timing_profile` user setting."""
+    name = str(get_user_setting("selenium_timing_profile", DEFAULT_SELENIUM_TIMING_PROFILE) or "").strip().lower()
+    return SELENIUM_TIMING_PROFILES.get(name) or SELENIUM_TIMING_PROFILES[DEFAULT_SELENIUM_TIMING_PROFILE]
+
+
+def _record_selenium_step(step, elapsed, timed_out):
+    with _selenium_step_timings_lock:
+        stats = _selenium_step_timings.setdefault(step, {"count": 0, "total": 0.0, "max": 0.0, "timeouts": 0})
+        stats["count"] += 1
+        stats["total"] += elapsed
+        stats["max"] = max(stats["max"], elapsed)
+        if timed_out:
+            stats["timeouts"] += 1
+
+
+def selenium_timing_summary(reset=True):
+    """One-line summary of wait time per step since the last reset."""
+    with _selenium_step_timings_lock:
+        items = sorted(_selenium_step_timings.items(), key=lambda kv: -kv[1]["total"])
+        if reset:
+            _selenium_step_timings.clear()
+    parts = []
+    for step, stats in items:
+        txt = f"{step} {stats['total']:.1f}s/{stats['count']}x (max {stats['max']:.1f}s"
+        if stats["timeouts"]:
+            txt += f", {stats['timeouts']} timed out"
+        parts.append(txt + ")")
+    return "Selenium waits: " + ("; ".join(parts) if parts else "none")
+
+
+def _document_ready(driver):
+    try:
+        return driver.execute_script("return document.readyState") == "complete"
+    except Exception:
+        return False
+
+
+def wait_for_page(driver, step, condition=None, timeout=None, profile=None):
+    """Wait until `condition` holds (if given) and the document has finished loading.
+
+    Replaces fixed sleeps: returns as soon as the page is ready, or False after the
+    profile timeout so callers can carry on with their own checks as before.
+    """
+    profile = profile or selenium_timing_profile()
+    timeout = profile["page_timeout"] if timeout is None else timeout
+    started = time.monotonic()
+    timed_out = False
+    try:
+        waiter = WebDriverWait(driver, timeout, poll_frequency=profile["poll"])
+        if condition is not None:
+            waiter.until(condition)
+        waiter.until(_document_ready)
+    except Exception:
+        timed_out = True
+    if profile["settle"]:
+        time.sleep(profile["settle"])
+    _record_selenium_step(step, time.monotonic() - started, timed_out)
+    return not timed_out
+
+
+def wait_after_submit(driver, step, submitted_element, ready_condition=None, profile=None):
+    """Wait for a form submit to take effect: the submitted element (or captcha image)
+    going stale, or `ready_condition` holding, then for the new document to load."""
+    profile = profile or selenium_timing_profile()
+
+    def _submitted(d):
+        if ready_condition is not None and ready_condition(d):
+            return True
+        return EC.staleness_of(submitted_element)(d)
+
+    return wait_for_page(driver, step, _submitted, timeout=profile["submit_timeout"], profile=profile)
+
+
+# --- SELENIUM DRIVER POOL ---
+GECKODRIVER_CACHE_FILE = os.path.join(APP_CONFIG_DIR, "geckodriver_path.json")
+DRIVER_POOL_MAX_IDLE = 2
+DRIVER_POOL_MAX_USES = 25
+DRIVER_POOL_IDLE_SECONDS = 20 * 60
+DRIVER_POOL_MAX_RSS_GROWTH_MB = 800
+# Whose jobs may share a warm browser; the backend sets this to the job's API key so
+# tenants never get each other's cookies or solved captcha session.
+driver_pool_scope = ""
+
+_geckodriver_path_lock = threading.Lock()
+
+
+def resolve_geckodriver_path():
+    """geckodriver path, resolved through webdriver_manager once and cached on disk."""
+    with _geckodriver_path_lock:
+        try:
+            with open(GECKODRIVER_CACHE_FILE, "r", encoding="utf-8") as f:
+                cached = str(json.load(f).get("path") or "")
+            if cached and os.path.isfile(cached):
+                return cached
+        except Exception:
+            pass
+        path = GeckoDriverManager().install()
+        try:
+            with open(GECKODRIVER_CACHE_FILE, "w", encoding="utf-8") as f:
+                json.dump({"path": path, "resolved_at": datetime.datetime.now().isoformat()}, f)
+        except Exception:
+            pass
+        return path
+
+
+def build_firefox_options():
+    options = FirefoxOptions()
+    if get_user_setting("selenium_headless", True):
+        options.add_argument("-headless")
+    # Return once the DOM is parsed; wait_for_page covers the remaining readiness checks.
+    options.page_load_strategy = "eager"
+    # 3 = block third-party images only: the captcha is served by the portal itself
+    # and has to render for its screenshot.
+    options.set_preference("permissions.default.image", 3)
+    options.set_preference("gfx.downloadable_fonts.enabled", False)
+    options.set_preference("browser.display.use_document_fonts", 0)
+    options.set_preference("media.autoplay.default", 5)
+    options.set_preference("media.autoplay.blocking_policy", 2)
+    options.set_preference("media.hardware-video-decoding.enabled", False)
+    return options
+
+
+def _process_tree_rss_mb(pid):
+    """RSS of a process and its children in MB, or None when psutil is unavailable."""
+    try:
+        psutil = importlib.import_module("psutil")
+        proc = psutil.Process(pid)
+        procs = [proc] + proc.children(recursive=True)
+        return sum(p.memory_info().rss for p in procs) / (1024 * 1024)
+    except Exception:
+        return None
+
+
+def portal_host(url):
+    """Normalised host of a portal URL ("www." and port dropped)."""
+    host = (urlparse(str(url or "")).hostname or "").lower()
+    return host[4:] if host.startswith("www.") else host
+
+
+class PooledDriver:
+    def __init__(self, key, driver):
+        self.key = key
+        self.driver = driver
+        self.uses = 0
+        self.captcha_solved = False
+        self.created_at = time.monotonic()
+        self.last_used = self.created_at
+        self.baseline_rss = self.rss_mb()
+
+    def rss_mb(self):
+        try:
+            return _process_tree_rss_mb(self.driver.service.process.pid)
+        except Exception:
+            return None
+
+    def current_portal(self):
+        """Host of the page the driver has loaded, or "" for a fresh or broken driver."""
+        try:
+            return portal_host(self.driver.current_url)
+        except Exception:
+            return ""
+
+    def is_healthy(self):
+        try:
+            self.driver.execute_script("return 1")
+            return bool(self.driver.window_handles)
+        except Exception:
+            return False
+
+    def quit(self):
+        try:
+            self.driver.quit()
+        except Exception:
+            pass
+
+
+class SeleniumDriverPool:
+    """Keeps warm Firefox drivers leased by (driver_pool_scope, portal host), so a job reuses
+    a browser that has already loaded the same portal and solved its captcha for the same
+    tenant."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._idle = {}
+
+    @staticmethod
+    def key_for(portal_url):
+        return f"{driver_pool_scope}|{portal_host(portal_url)}"
+
+    def acquire(self, portal_url):
+        key = self.key_for(portal_url)
+        portal = portal_host(portal_url)
+        while True:
+            with self._lock:
+                self._reap_idle_locked()
+                bucket = self._idle.get(key) or []
+                entry = bucket.pop() if bucket else None
+            if entry is None:
+                break
+            if entry.is_healthy():
+                log_to_gui(f"Reusing warm browser session ({entry.uses} previous job(s)).")
+                # The solved captcha only carries over while the driver is still on this portal.
+                ScraperBackend.captcha_solved_in_session = entry.captcha_solved and entry.current_portal() == portal
+                return entry
+            entry.quit()
+        # Resolve the captcha model while Firefox starts.
+        captcha_service.warm_up_async()
+        service = FirefoxService(resolve_geckodriver_path())
+        entry = PooledDriver(key, webdriver.Firefox(service=service, options=build_firefox_options()))
+        ScraperBackend.captcha_solved_in_session = False
+        return entry
+
+    def release(self, entry, discard=False):
+        entry.uses += 1
+        entry.last_used = time.monotonic()
+        entry.captcha_solved = bool(ScraperBackend.captcha_solved_in_session)
+        if not discard:
+            discard = self._should_recycle(entry)
+        if not discard:
+            try:
+                # Drop popups left behind by an aborted step.
+                handles = entry.driver.window_handles
+                for handle in handles[1:]:
+                    entry.driver.switch_to.window(handle)
+                    entry.driver.close()
+                entry.driver.switch_to.window(handles[0])
+            except Exception:
+                discard = True
+        if discard:
+            entry.quit()
+            return
+        with self._lock:
+            bucket = self._idle.setdefault(entry.key, [])
+            bucket.append(entry)
+            surplus = []
+            while sum(len(b) for b in self._idle.values()) > DRIVER_POOL_MAX_IDLE:
+                oldest = min((e for b in self._idle.values() for e in b), key=lambda e: e.last_used)
+                self._idle[oldest.key].remove(oldest)
+                surplus.append(oldest)
+        for e in surplus:
+            e.quit()
+
+    def _should_recycle(self, entry):
+        if entry.uses >= DRIVER_POOL_MAX_USES:
+            return True
+        rss = entry.rss_mb()
+        if rss is not None and entry.baseline_rss is not None and rss - entry.baseline_rss > DRIVER_POOL_MAX_RSS_GROWTH_MB:
+            log_to_gui(f"Recycling browser session after memory growth to {rss:.0f} MB.")
+            return True
+        return not entry.is_healthy()
+
+    def _reap_idle_locked(self):
+        now = time.monotonic()
+        for key, bucket in list(self._idle.items()):
+            for e in [e for e in bucket if now - e.last_used > DRIVER_POOL_IDLE_SECONDS]:
+                bucket.remove(e)
+                threading.Thread(target=e.quit, daemon=True).start()
+
+    def shutdown(self):
+        with self._lock:
+            entries = [e for b in self._idle.values() for e in b]
+            self._idle.clear()
+        for e in entries:
+            e.quit()
+
+
+driver_pool = SeleniumDriverPool()
+atexit.register(driver_pool.shutdown)
+
+
+# Collects every link the download steps need from a tender page in one round trip.
+# direct_links maps each id containing "DirectLink_" to all anchors carrying it, in page
+# order: corrigendum popups repeat ids and nest prefixes (the old contains(@id) XPath).
+TENDER_PAGE_HARVEST_JS = r"""
+var out = {
+    title: document.title || "",
+    direct_links: {},
+    zip_href: null,
+    has_doc_download: !!document.getElementById("docDownload"),
+    corrigendum_history: false
+};
+var anchors = document.getElementsByTagName("a");
+for (var i = 0; i < anchors.length; i++) {
+    var a = anchors[i];
+    var id = a.id || "";
+    var text = (a.innerText || a.textContent || "").trim();
+    if (id.indexOf("DirectLink_") !== -1) {
+        (out.direct_links[id] = out.direct_links[id] || []).push({href: a.href || "", text: text});
+    }
+    if (!out.zip_href && a.href && text.indexOf("Download as zip") !== -1) {
+        out.zip_href = a.href;
+    }
+    if ((a.getAttribute("title") || "").indexOf("View Corrigendum History") !== -1) {
+        out.corrigendum_history = true;
+    }
+}
+return JSON.stringify(out);
+"""
+
+# Picks the organisation filter on the status search form by option text.
+STATUS_SELECT_ORG_JS = r"""
+var want = (arguments[0] || "").trim().toLowerCase();
+var selects = document.getElementsByTagName("select");
+for (var i = 0; i < selects.length; i++) {
+    var opts = selects[i].options;
+    for (var j = 0; j < opts.length; j++) {
+        if ((opts[j].text || "").trim().toLowerCase() === want) {
+            selects[i].selectedIndex = j;
+            selects[i].dispatchEvent(new Event("change", {bubbles: true}));
+            return selects[i].id || selects[i].name || "select";
+        }
+    }
+}
+return null;
+"""
+
+# Reads every result row of the status list (tabList) in one pass.
+STATUS_LIST_HARVEST_JS = r"""
+var table = document.getElementById("tabList");
+if (!table) return JSON.stringify({rows: [], has_next: false});
+var cellText = function (td) { return (td.innerText || td.textContent || "").trim(); };
+var header = table.querySelectorAll("tr.list_header td");
+if (!header.length) header = table.querySelectorAll("tbody tr:first-child td");
+var headers = Array.prototype.map.call(header, cellText);
+var idIdx = -1, stageIdx = headers.indexOf("Tender Stage");
+for (var h = 0; h < headers.length; h++) {
+    if (headers[h].toLowerCase().indexOf("tender id") !== -1) { idIdx = h; break; }
+}
+var rows = [];
+var trs = table.querySelectorAll("tr.even, tr.odd");
+for (var i = 0; i < trs.length; i++) {
+    var cells = trs[i].getElementsByTagName("td");
+    rows.push({
+        tender_id: idIdx >= 0 && idIdx < cells.length ? cellText(cells[idIdx]) : "",
+        stage: stageIdx >= 0 && stageIdx < cells.length ? cellText(cells[stageIdx]) : "",
+        text: cellText(trs[i])
+    });
+}
+var next = document.getElementById("linkFwd");
+if (!next) {
+    var anchors = document.getElementsByTagName("a");
+    for (var k = 0; k < anchors.length; k++) {
+        if (/^next\b/i.test(cellText(anchors[k]))) { next = anchors[k]; break; }
+    }
+}
+return JSON.stringify({rows: rows, has_next: !!next, has_stage: stageIdx >= 0});
+"""
+
 # --- SCRAPER BACKEND ---
 class ScraperBackend:
     captcha_solved_in_session = False
-    gemini_model = None
-    gemini_model_name = None
     session = None
 
     @staticmethod
@@ -973,78 +2350,14 @@ class ScraperBackend:
     def get_working_gemini_model():
         if not ensure_scraper_dependencies():
             return None
-        if ScraperBackend.gemini_model is not None:
-            return ScraperBackend.gemini_model
-        try:
-            genai.configure(api_key=GOOGLE_API_KEY)
-        except Exception as e:
-            log_to_gui(f"Gemini config error: {e}")
-            return None
-
-        discovered = []
-        try:
-            for m in genai.list_models():
-                methods = getattr(m, "supported_generation_methods", []) or []
-                if "generateContent" in methods:
-                    mname = getattr(m, "name", None)
-                    if mname:
-                        discovered.append(mname)
-        except Exception as e:
-            log_to_gui(f"Gemini list_models warning: {e}")
-
-        def norm(name):
-            return name.split("/", 1)[1] if name.startswith("models/") else name
-
-        discovered_norm = [norm(x) for x in discovered]
-        discovered_norm.sort(key=lambda n: (0 if "flash" in n.lower() else 1, 0 if "pro" in n.lower() else 1, n))
-        fallback = [
-            "gemini-2.0-flash",
-            "gemini-2.0-flash-lite",
-            "gemini-1.5-flash-latest",
-            "gemini-1.5-pro-latest",
-            "gemini-1.5-flash",
-            "gemini-pro",
-        ]
-        candidates = []
-        seen = set()
-        for name in discovered_norm + fallback:
-            if name and name not in seen:
-                seen.add(name)
-                candidates.append(name)
-
-        last_error = None
-        for name in candidates:
-            try:
-                model = genai.GenerativeModel(name)
-                # lightweight capability probe
-                _ = model.generate_content("ok", generation_config={"temperature": 0})
-                ScraperBackend.gemini_model = model
-                ScraperBackend.gemini_model_name = name
-                log_to_gui(f"Gemini model selected: {name}")
-                return model
-            except Exception as e:
-                last_error = e
-                continue
-
-        if last_error:
-            log_to_gui(f"Gemini model detection failed: {last_error}")
-        return None
+        return captcha_service.model()
 
     @staticmethod
     def solve_captcha_with_gemini(image_data):
         if not ensure_scraper_dependencies():
             return None
-        try:
-            model = ScraperBackend.get_working_gemini_model()
-            if model is None:
-                return None
-            img = Image.open(io.BytesIO(image_data))
-            response = model.generate_content(["Extract the 6 alphanumeric characters from this CAPTCHA image. Return ONLY the text.", img])
-            text = re.sub(r'[^a-zA-Z0-9]', '', response.text.strip())
-            return text if len(text) == 6 else None
-        except Exception as e:
-            log_to_gui(f"Gemini Error: {e}")
-            return None
+        attempt = captcha_service.solve(image_data)
+        return attempt.text if attempt else None
 
     @staticmethod
     def handle_captcha_interaction(driver, context, submit_id="Submit"):
@@ -1065,7 +2378,7 @@ class ScraperBackend:
             try:
                 btn = driver.find_element(By.ID, submit_id)
                 driver.execute_script("arguments[0].click();", btn)
-                time.sleep(2)
+                wait_after_submit(driver, "captcha_resubmit", btn, lambda d: _status_table_visible())
                 if _status_table_visible():
                     return True
                 # Session may have expired; fall through to solve CAPTCHA again.
@@ -1091,8 +2404,9 @@ class ScraperBackend:
                 btn = driver.find_element(By.ID, submit_id)
                 img_data = captcha_img.screenshot_as_png
 
-                # Try Gemini first (auto attempts).
-                solution = ScraperBackend.solve_captcha_with_gemini(img_data)
+                # Local solvers, then Gemini (auto attempts).
+                attempt_result = captcha_service.solve(img_data)
+                solution = attempt_result.text if attempt_result else None
                 if not solution:
                     log_to_gui(f"CAPTCHA auto-solve failed for {context}. Retrying ({attempt + 1}/{max_retries})...")
                     try:
@@ -1104,11 +2418,13 @@ class ScraperBackend:
                 captcha_input.clear()
                 captcha_input.send_keys(solution)
                 driver.execute_script("arguments[0].click();", btn)
-                time.sleep(3)
+                wait_after_submit(driver, "captcha_submit", captcha_img, lambda d: _status_table_visible())
                 
                 # Check success: either result table loaded or CAPTCHA image disappeared.
-                if _status_table_visible() or len(driver.find_elements(By.ID, "captchaImage")) == 0:
-                    log_to_gui("CAPTCHA Solved!")
+                solved = _status_table_visible() or len(driver.find_elements(By.ID, "captchaImage")) == 0
+                captcha_service.report(attempt_result, solved)
+                if solved:
+                    log_to_gui(f"CAPTCHA Solved! ({attempt_result.source}, {attempt_result.latency:.1f}s)")
                     ScraperBackend.captcha_solved_in_session = True
                     return True
                 else:
@@ -1122,7 +2438,8 @@ class ScraperBackend:
                 try:
                     captcha_input = driver.find_element(By.ID, "captchaText")
                     btn = driver.find_element(By.ID, submit_id)
-                    img_data = driver.find_element(By.ID, "captchaImage").screenshot_as_png
+                    captcha_img = driver.find_element(By.ID, "captchaImage")
+                    img_data = captcha_img.screenshot_as_png
                 except Exception:
                     log_to_gui(f"Could not load CAPTCHA image for manual input ({context}).")
                     return False
@@ -1136,7 +2453,7 @@ class ScraperBackend:
                 captcha_input.clear()
                 captcha_input.send_keys(solution)
                 driver.execute_script("arguments[0].click();", btn)
-                time.sleep(3)
+                wait_after_submit(driver, "captcha_submit_manual", captcha_img, lambda d: _status_table_visible())
                 if _status_table_visible() or len(driver.find_elements(By.ID, "captchaImage")) == 0:
                     log_to_gui("CAPTCHA Solved (manual)!")
                     ScraperBackend.captcha_solved_in_session = True
@@ -1173,6 +2490,9 @@ class ScraperBackend:
                 pass
         c.execute("DROP INDEX IF EXISTS idx_downloaded_file_unique")
         c.execute("CREATE UNIQUE INDEX IF NOT EXISTS idx_downloaded_file_unique ON downloaded_files(tender_id, file_name, file_type)")
+        for name, target in HOT_PATH_INDEXES:
+            if target.startswith("downloaded_files("):
+                c.execute(f"CREATE INDEX IF NOT EXISTS {name} ON {target}")
         conn.commit()
         conn.close()
 
@@ -1186,7 +2506,10 @@ class ScraperBackend:
         return {r[0] for r in rows}
 
     @staticmethod
-    def log_downloaded_file(tender_id, file_name, file_type="document", source_url=None, local_path=None):
+    def log_downloaded_file(tender_id, file_name, file_type="document", source_url=None, local_path=None, log_session=None):
+        if log_session is not None:
+            log_session.record(file_name, file_type=file_type, source_url=source_url, local_path=local_path)
+            return
         conn = sqlite3.connect(DB_FILE)
         conn.execute(
             "INSERT OR IGNORE INTO downloaded_files (tender_id, file_name, file_type, source_url, local_path) VALUES (?, ?, ?, ?, ?)",
@@ -1196,7 +2519,9 @@ class ScraperBackend:
         conn.close()
 
     @staticmethod
-    def should_skip_file(tender_id, file_name, file_path):
+    def should_skip_file(tender_id, file_name, file_path, log_session=None):
+        if log_session is not None:
+            return log_session.should_skip(file_name, file_path)
         existing_log = ScraperBackend.get_downloaded_file_log(tender_id)
         file_name = str(file_name)
         if os.path.exists(file_path) and file_name not in existing_log:
@@ -1211,9 +2536,9 @@ class ScraperBackend:
             return False
         try:
             driver.get(init_url)
-            time.sleep(2)
+            wait_for_page(driver, "session_refresh")
             driver.get(tender_url)
-            time.sleep(2)
+            wait_for_page(driver, "tender_page")
             title = (driver.title or "").lower()
             return not ("stale session" in title or title.strip() == "error")
         except Exception:
@@ -1224,7 +2549,7 @@ class ScraperBackend:
         if not ensure_scraper_dependencies():
             return False
         driver.get(tender_url)
-        time.sleep(2)
+        wait_for_page(driver, "tender_page")
         title = (driver.title or "").lower()
         if "stale session" in title or title.strip() == "error":
             log_to_gui("Stale session detected. Reinitializing Selenium session...")
@@ -1232,6 +2557,40 @@ class ScraperBackend:
                 return False
         return True
 
+    @staticmethod
+    def harvest_tender_page(driver):
+        try:
+            return json.loads(driver.execute_script(TENDER_PAGE_HARVEST_JS) or "{}")
+        except Exception as e:
+            log_to_gui(f"  Could not read tender page links: {e}")
+            return None
+
+    @staticmethod
+    def open_and_harvest_tender_page(driver, init_url, tender_url):
+        """Open the tender page once and return its link map, or None if it could not be opened.
+
+        Callers reuse the map for every download step and set page["stale"] after
+        anything that navigates away (captcha submit), which triggers one reload.
+        """
+        if not ScraperBackend.open_tender_page_with_recovery(driver, init_url, tender_url):
+            return None
+        return ScraperBackend.harvest_tender_page(driver)
+
+    @staticmethod
+    def harvested_link(page, *link_ids):
+        links = (page or {}).get("direct_links") or {}
+        for link_id in link_ids:
+            # First anchor with the id, like find_element(By.ID, ...).
+            for link in links.get(link_id) or []:
+                if link.get("href"):
+                    return link["href"]
+        return None
+
+    @staticmethod
+    def harvested_links(page):
+        """Every DirectLink anchor of a harvested page, duplicates included, in page order per id."""
+        return [link for links in ((page or {}).get("direct_links") or {}).values() for link in links]
+
     @staticmethod
     def fetch_organisations_logic(website_id):
         if not ensure_scraper_dependencies():
@@ -1615,7 +2974,7 @@ class ScraperBackend:
         return len(to_delete)
 
     @staticmethod
-    def fetch_tenders_logic(website_id):
+    def fetch_tenders_logic(website_id, checkpoint=None):
         if not ensure_scraper_dependencies():
             log_to_gui("Scraper dependencies are missing. Install requirements and rebuild.")
             return
@@ -1633,12 +2992,22 @@ class ScraperBackend:
         failed_orgs = set()
 
         for org_name, url in selected_orgs:
+            if scrape_cancelled():
+                log_to_gui("Stop requested; remaining organisations skipped.")
+                break
+            if checkpoint is not None and checkpoint.is_done(f"org:{org_name}"):
+                log_to_gui(f"Skipping {org_name} (finished before resume).")
+                continue
             log_to_gui(f"Scraping tenders for: {org_name}")
             current_url = url
             org_seen_ids = set()
             org_scrape_ok = False
+            org_stopped = False
             
             while current_url:
+                if scrape_cancelled():
+                    org_stopped = True
+                    break
                 try:
                     res = ScraperBackend.safe_request(current_url)
                     if not res: break
@@ -1757,8 +3126,14 @@ class ScraperBackend:
                 except Exception as e:
                     log_to_gui(f"Error scraping {org_name}: {e}")
                     break
-            if org_scrape_ok:
+            if org_stopped:
+                # A partly scraped org must not drive the stale-tender archive below.
+                log_to_gui(f"Stop requested; {org_name} left unfinished.")
+                failed_orgs.add(org_name)
+            elif org_scrape_ok:
                 scraped_org_seen_ids[org_name] = org_seen_ids
+                if checkpoint is not None:
+                    checkpoint.mark_done(f"org:{org_name}")
             else:
                 failed_orgs.add(org_name)
         try:
@@ -1838,35 +3213,59 @@ class ScraperBackend:
         return None
 
     @staticmethod
-    def download_file_with_requests(url, file_path, cookies, tender_id=None, file_type="document"):
+    def download_file_with_requests(url, file_path, cookies, tender_id=None, file_type="document", log_session=None, expected_sha256=None):
         if not ensure_scraper_dependencies():
             return False
         try:
-            s = requests.Session()
-            for c in cookies:
-                s.cookies.set(c['name'], c['value'], domain=c.get('domain'), path=c.get('path'))
-            s.headers.update({
-                'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWeb7Kit/537.36 (KHTML, like Gecko) Chrome/100.0.4896.88 Safari/537.36'
-            })
-            r = s.get(url, stream=True, timeout=120)
-            r.raise_for_status()
-            with open(file_path, 'wb') as f:
-                for chunk in r.iter_content(chunk_size=8192):
-                    f.write(chunk)
-            
+            if fetch_document(url, file_path, cookies, expected_sha256=expected_sha256):
+                log_to_gui(f"Reused stored copy of {os.path.basename(file_path)}.")
             if tender_id:
                 ScraperBackend.log_downloaded_file(
                     tender_id,
                     os.path.basename(file_path),
                     file_type=file_type,
                     source_url=url,
-                    local_path=file_path
+                    local_path=file_path,
+                    log_session=log_session
                 )
             return True
         except Exception as e:
             log_to_gui(f"Download failed for {os.path.basename(file_path)}: {e}")
             return False
 
+    @staticmethod
+    def submit_download(pending, url, file_path, cookies, tender_id=None, file_type="document", log_session=None, done_message=None):
+        """Queue a download on the shared pool; `pending` collects it for wait_for_downloads.
+
+        Cookies must be read from the driver by the caller: the driver is not thread-safe.
+        A path already queued in `pending` is not queued twice.
+        """
+        for future, _message, queued_path in pending:
+            if queued_path == file_path:
+                return future
+        future = download_pool().submit(
+            ScraperBackend.download_file_with_requests,
+            url, file_path, cookies, tender_id, file_type, log_session,
+        )
+        pending.append((future, done_message, file_path))
+        return future
+
+    @staticmethod
+    def wait_for_downloads(pending):
+        ok_count = 0
+        for future, done_message, _path in pending:
+            try:
+                ok = future.result()
+            except Exception as e:
+                log_to_gui(f"Download failed: {e}")
+                ok = False
+            if ok:
+                ok_count += 1
+                if done_message:
+                    log_to_gui(done_message)
+        pending.clear()
+        return ok_count
+
     @staticmethod
     def _extract_status_and_row(driver):
         if not ensure_scraper_dependencies():
@@ -1891,12 +3290,12 @@ class ScraperBackend:
         return cells[idx].text.strip(), first_row
 
     @staticmethod
-    def _download_result_docs_from_popup(driver, tender_id, base_folder):
+    def _download_result_docs_from_popup(driver, tender_id, base_folder, log_session=None):
         if not ensure_scraper_dependencies():
             return False
         wait = WebDriverWait(driver, 20)
         main_window = driver.current_window_handle
-        downloaded_any = False
+        pending = []
         result_folder = os.path.join(base_folder, "Financial Result")
         os.makedirs(result_folder, exist_ok=True)
         try:
@@ -1913,6 +3312,7 @@ class ScraperBackend:
             driver.switch_to.window(popup)
             wait.until(EC.presence_of_element_located((By.TAG_NAME, "body")))
             links = driver.find_elements(By.TAG_NAME, "a")
+            cookies = driver.get_cookies()
             for link in links:
                 href = link.get_attribute("href")
                 if not href:
@@ -1925,11 +3325,12 @@ class ScraperBackend:
                     name = os.path.basename(urlparse(href).path) or f"result_{int(time.time())}"
                 safe_name = re.sub(r'[\\/*?:"<>|]', "", name)
                 fpath = os.path.join(result_folder, safe_name)
-                if ScraperBackend.should_skip_file(tender_id, safe_name, fpath):
+                if ScraperBackend.should_skip_file(tender_id, safe_name, fpath, log_session=log_session):
                     continue
-                if ScraperBackend.download_file_with_requests(href, fpath, driver.get_cookies(), tender_id=tender_id, file_type="result"):
-                    downloaded_any = True
-                    log_to_gui(f"    Downloaded Result File: {safe_name}")
+                ScraperBackend.submit_download(
+                    pending, href, fpath, cookies, tender_id=tender_id, file_type="result",
+                    log_session=log_session, done_message=f"    Downloaded Result File: {safe_name}",
+                )
             driver.close()
             driver.switch_to.window(main_window)
         except Exception as e:
@@ -1940,10 +3341,108 @@ class ScraperBackend:
                 driver.switch_to.window(main_window)
             except Exception:
                 pass
-        return downloaded_any
+        return ScraperBackend.wait_for_downloads(pending) > 0
+
+    @staticmethod
+    def _match_status_rows(rows, wanted):
+        found = {}
+        for row in rows:
+            stage = str(row.get("stage") or "").strip()
+            if not stage:
+                continue
+            tokens = set(re.split(r"\s+", str(row.get("tender_id") or "").strip()))
+            if not tokens - {""}:
+                tokens = set(re.split(r"\s+", str(row.get("text") or "")))
+            for tid in tokens & wanted:
+                found[tid] = stage
+        return found
 
     @staticmethod
-    def check_tender_status_logic(website_id, archived_only=False):
+    def batch_status_search(driver, status_url, org_name, tender_ids):
+        """Search the status list by organisation and read every result page, so one
+        captcha covers all of that organisation's tenders.
+
+        Returns {tender_id: stage}, empty when the search worked but listed none of them;
+        None when the form has no matching organisation filter, the captcha failed or the
+        result list could not be read.
+        """
+        wanted = {str(t).strip() for t in tender_ids if str(t or "").strip()}
+        driver.get(status_url)
+        wait_for_page(driver, "status_page", EC.presence_of_element_located((By.ID, "tenderId")))
+        try:
+            picked = driver.execute_script(STATUS_SELECT_ORG_JS, str(org_name or ""))
+        except Exception:
+            picked = None
+        if not picked:
+            return None
+        wait_for_page(driver, "status_filter", EC.presence_of_element_located((By.ID, "tenderId")))
+        if not ScraperBackend.handle_captcha_interaction(driver, f"Status batch {org_name}", "Search"):
+            return None
+        found = {}
+        parsed = False
+        for _page in range(STATUS_BATCH_MAX_PAGES):
+            try:
+                data = json.loads(driver.execute_script(STATUS_LIST_HARVEST_JS) or "{}")
+            except Exception:
+                break
+            if not data.get("has_stage"):
+                break
+            parsed = True
+            found.update(ScraperBackend._match_status_rows(data.get("rows") or [], wanted - found.keys()))
+            if wanted <= found.keys() or not data.get("has_next"):
+                break
+            next_links = driver.find_elements(By.ID, "linkFwd") or driver.find_elements(By.PARTIAL_LINK_TEXT, "Next")
+            if not next_links:
+                break
+            table = driver.find_element(By.ID, "tabList")
+            driver.execute_script("arguments[0].click();", next_links[0])
+            wait_after_submit(driver, "status_next_page", table)
+        return found if parsed else None
+
+    @staticmethod
+    def refresh_statuses_in_batches(driver, status_url, targets):
+        """Batch-check (db_id, tender_id, org_name) targets organisation by organisation.
+
+        Saves what was found and returns ({db_id: status}, targets still unresolved).
+        """
+        by_org = {}
+        for target in targets:
+            by_org.setdefault(str(target[2] or "").strip(), []).append(target)
+        statuses = {}
+        remaining = []
+        batch_supported = True
+        for org_name, group in by_org.items():
+            if scrape_cancelled():
+                remaining.extend(group)
+                continue
+            if not batch_supported or not org_name or len(group) < STATUS_BATCH_MIN_TENDERS:
+                remaining.extend(group)
+                continue
+            log_to_gui(f"Batch status search: {org_name} ({len(group)} tenders)")
+            try:
+                found = ScraperBackend.batch_status_search(driver, status_url, org_name, [t[1] for t in group])
+            except Exception as e:
+                log_to_gui(f"  Batch status search failed: {e}")
+                found = None
+            if found is None:
+                # The portal's form did not filter this way; don't spend another captcha per org.
+                batch_supported = False
+                remaining.extend(group)
+                continue
+            resolved = 0
+            for db_id, tid, org in group:
+                stage = found.get(str(tid).strip())
+                if stage:
+                    statuses[db_id] = stage
+                    resolved += 1
+                else:
+                    remaining.append((db_id, tid, org))
+            log_to_gui(f"  Resolved {resolved} of {len(group)} from one search.")
+        save_tender_statuses(statuses)
+        return statuses, remaining
+
+    @staticmethod
+    def check_tender_status_logic(website_id, archived_only=False, force=False):
         if not ensure_scraper_dependencies():
             log_to_gui("Scraper dependencies are missing. Install requirements and rebuild.")
             return 0
@@ -1957,15 +3456,7 @@ class ScraperBackend:
         status_url = site_url[0]
 
         if archived_only:
-            tenders = c.execute(
-                """SELECT id, tender_id
-                   FROM tenders
-                   WHERE website_id=?
-                     AND COALESCE(is_archived,0)=1
-                     AND COALESCE(is_downloaded,0)=1
-                     AND TRIM(COALESCE(tender_id,''))<>''""",
-                (website_id,)
-            ).fetchall()
+            scope_sql = "COALESCE(is_archived,0)=1"
         else:
             # Keep status blank for unselected active tenders, and check only selected active tenders.
             c.execute(
@@ -1973,40 +3464,52 @@ class ScraperBackend:
                 (website_id,)
             )
             conn.commit()
-            tenders = c.execute(
-                """SELECT id, tender_id
-                   FROM tenders
-                   WHERE website_id=?
-                     AND COALESCE(is_archived,0)=0
-                     AND COALESCE(is_downloaded,0)=1
-                     AND TRIM(COALESCE(tender_id,''))<>''""",
-                (website_id,)
-            ).fetchall()
+            scope_sql = "COALESCE(is_archived,0)=0"
+        base_sql = (
+            f"FROM tenders WHERE website_id=? AND {scope_sql} "
+            "AND COALESCE(is_downloaded,0)=1 AND TRIM(COALESCE(tender_id,''))<>''"
+        )
+        selected_count = c.execute(f"SELECT COUNT(*) {base_sql}", (website_id,)).fetchone()[0]
+        params = [website_id]
+        if not force:
+            due_sql, due_params = status_check_due_sql()
+            base_sql += f" AND {due_sql}"
+            params.extend(due_params)
+        tenders = c.execute(
+            f"SELECT id, tender_id, COALESCE(org_chain,'') {base_sql} ORDER BY org_chain, id",
+            tuple(params)
+        ).fetchall()
         conn.close()
 
+        mode_txt = "selected archived" if archived_only else "selected"
+        skipped = selected_count - len(tenders)
+        if skipped:
+            log_to_gui(f"Skipping {skipped} {mode_txt} tender(s) with a final or recently checked status.")
         if not tenders:
-            if archived_only:
-                log_to_gui("No selected archived tenders to check status.")
-            else:
-                log_to_gui("No selected tenders to check status.")
+            if not selected_count:
+                if archived_only:
+                    log_to_gui("No selected archived tenders to check status.")
+                else:
+                    log_to_gui("No selected tenders to check status.")
             return 0
 
-        mode_txt = "selected archived" if archived_only else "selected"
         log_to_gui(f"Checking status for {len(tenders)} {mode_txt} tenders...")
         
-        options = FirefoxOptions()
-        # options.add_argument("--headless") 
-        service = FirefoxService(GeckoDriverManager().install())
-        driver = webdriver.Firefox(service=service, options=options)
         # Solve once per Selenium session; retry only if portal asks again.
-        ScraperBackend.captcha_solved_in_session = False
+        lease = driver_pool.acquire(status_url)
+        driver = lease.driver
 
         updated_count = 0
         try:
-            for db_id, tid in tenders:
+            statuses, tenders = ScraperBackend.refresh_statuses_in_batches(driver, status_url, tenders)
+            updated_count += len(statuses)
+            for db_id, tid, _org in tenders:
+                if scrape_cancelled():
+                    log_to_gui("Stop requested; remaining status checks skipped.")
+                    break
                 log_to_gui(f"Checking: {tid}")
                 driver.get(status_url)
-                time.sleep(2)
+                wait_for_page(driver, "status_page", EC.presence_of_element_located((By.ID, "tenderId")))
                 
                 try:
                     # Input Tender ID
@@ -2018,10 +3521,7 @@ class ScraperBackend:
                     if ScraperBackend.handle_captcha_interaction(driver, f"Status {tid}", "Search"):
                         new_status, _ = ScraperBackend._extract_status_and_row(driver)
                         if new_status:
-                            conn = sqlite3.connect(DB_FILE)
-                            conn.execute("UPDATE tenders SET status=? WHERE id=?", (new_status, db_id))
-                            conn.commit()
-                            conn.close()
+                            save_tender_statuses({db_id: new_status})
                             updated_count += 1
                             log_to_gui(f"Updated status for {tid}: {new_status}")
                         else:
@@ -2031,12 +3531,13 @@ class ScraperBackend:
                 except Exception as e:
                     log_to_gui(f"Error checking {tid}: {e}")
         finally:
-            driver.quit()
+            driver_pool.release(lease)
+        log_to_gui(selenium_timing_summary())
         log_to_gui("Status check complete.")
         return updated_count
 
     @staticmethod
-    def download_tender_results_logic(website_id):
+    def download_tender_results_logic(website_id, checkpoint=None):
         if not ensure_scraper_dependencies():
             log_to_gui("Scraper dependencies are missing. Install requirements and rebuild.")
             return
@@ -2048,7 +3549,12 @@ class ScraperBackend:
             log_to_gui("Status URL not configured for this website.")
             return
         status_url = site_row[0]
-        c.execute("SELECT id, tender_id, folder_path FROM tenders WHERE website_id=? AND is_downloaded=1", (website_id,))
+        due_sql, due_params = status_check_due_sql()
+        c.execute(
+            f"SELECT id, tender_id, folder_path, COALESCE(org_chain,''), COALESCE(status,''), CASE WHEN {due_sql} THEN 1 ELSE 0 END "
+            "FROM tenders WHERE website_id=? AND COALESCE(is_downloaded,0)=1",
+            (*due_params, website_id)
+        )
         targets = c.fetchall()
         conn.close()
         if not targets:
@@ -2056,17 +3562,30 @@ class ScraperBackend:
             return
 
         log_to_gui(f"Starting result file checks for {len(targets)} tenders...")
-        options = FirefoxOptions()
-        service = FirefoxService(GeckoDriverManager().install())
-        driver = webdriver.Firefox(service=service, options=options)
-        ScraperBackend.captcha_solved_in_session = False
+        lease = driver_pool.acquire(status_url)
+        driver = lease.driver
         target_statuses = {"Financial Bid Opening", "Financial Evaluation", "AOC", "Concluded"}
         try:
-            for db_id, tender_id, folder_path in targets:
+            # Refresh stale statuses in organisation batches first, so only tenders that
+            # can have result documents get a per-tender visit.
+            known = {db_id: status for db_id, _tid, _folder, _org, status, due in targets if status and not due}
+            stale = [(db_id, tid, org) for db_id, tid, _folder, org, status, due in targets if due or not status]
+            if stale:
+                batch_statuses, _unresolved = ScraperBackend.refresh_statuses_in_batches(driver, status_url, stale)
+                known.update(batch_statuses)
+            for db_id, tender_id, folder_path, _org, _status, _due in targets:
+                if scrape_cancelled():
+                    log_to_gui("Stop requested; remaining result checks skipped.")
+                    break
+                if checkpoint is not None and checkpoint.is_done(f"result:{tender_id}"):
+                    continue
                 try:
+                    if db_id in known and known[db_id] not in target_statuses:
+                        log_to_gui(f"  Status '{known[db_id]}' for {tender_id} not eligible for result docs.")
+                        continue
                     log_to_gui(f"Checking result status: {tender_id}")
                     driver.get(status_url)
-                    time.sleep(2)
+                    wait_for_page(driver, "status_page", EC.presence_of_element_located((By.ID, "tenderId")))
                     inp = WebDriverWait(driver, 12).until(EC.presence_of_element_located((By.ID, "tenderId")))
                     inp.clear()
                     inp.send_keys(tender_id)
@@ -2075,10 +3594,7 @@ class ScraperBackend:
                         continue
                     status, row = ScraperBackend._extract_status_and_row(driver)
                     if status:
-                        conn = sqlite3.connect(DB_FILE)
-                        conn.execute("UPDATE tenders SET status=? WHERE id=?", (status, db_id))
-                        conn.commit()
-                        conn.close()
+                        save_tender_statuses({db_id: status})
                     if status not in target_statuses:
                         log_to_gui(f"  Status '{status}' not eligible for result docs.")
                         continue
@@ -2090,7 +3606,17 @@ class ScraperBackend:
                         log_to_gui("  Result view link not found.")
                         continue
                     driver.execute_script("arguments[0].click();", view_links[0])
-                    time.sleep(2)
+                    # Returns once the view page has loaded, with or without a result summary, instead
+                    # of waiting the whole page timeout on tenders that have no results published.
+                    wait_after_submit(
+                        driver, "result_view", view_links[0],
+                        lambda d: bool(d.find_elements(By.PARTIAL_LINK_TEXT, "summary details")),
+                    )
+                    if not driver.find_elements(By.PARTIAL_LINK_TEXT, "summary details"):
+                        log_to_gui("  No result summary published.")
+                        if checkpoint is not None:
+                            checkpoint.mark_done(f"result:{tender_id}")
+                        continue
 
                     safe_id = re.sub(r'[\\/*?:"<>|]', "", str(tender_id))
                     existing_folder = (folder_path or "").strip()
@@ -2103,20 +3629,24 @@ class ScraperBackend:
                     conn.execute("UPDATE tenders SET folder_path=? WHERE id=?", (tender_folder, db_id))
                     conn.commit()
                     conn.close()
-                    got = ScraperBackend._download_result_docs_from_popup(driver, tender_id, tender_folder)
+                    with DownloadLogSession(tender_id) as log_session:
+                        got = ScraperBackend._download_result_docs_from_popup(driver, tender_id, tender_folder, log_session=log_session)
                     if got:
                         conn = sqlite3.connect(DB_FILE)
                         conn.execute("UPDATE tenders SET folder_path=?, last_downloaded_at=CURRENT_TIMESTAMP WHERE id=?", (tender_folder, db_id))
                         conn.commit()
                         conn.close()
+                    if checkpoint is not None:
+                        checkpoint.mark_done(f"result:{tender_id}")
                 except Exception as e:
                     log_to_gui(f"  Result download error for {tender_id}: {e}")
         finally:
-            driver.quit()
+            driver_pool.release(lease)
+        log_to_gui(selenium_timing_summary())
         log_to_gui("Result file check complete.")
 
     @staticmethod
-    def download_tenders_logic(website_id, target_db_ids=None, forced_mode=None):
+    def download_tenders_logic(website_id, target_db_ids=None, forced_mode=None, checkpoint=None):
         if not ensure_scraper_dependencies():
             log_to_gui("Scraper dependencies are missing. Install requirements and rebuild.")
             return
@@ -2158,80 +3688,81 @@ class ScraperBackend:
 
         log_to_gui(f"Starting download for {len(to_download)} tenders...")
         
-        options = FirefoxOptions()
-        service = FirefoxService(GeckoDriverManager().install())
-        driver = webdriver.Firefox(service=service, options=options)
+        lease = driver_pool.acquire(base_url)
+        driver = lease.driver
         wait = WebDriverWait(driver, 20)
-        ScraperBackend.captcha_solved_in_session = False
-        # Establish Selenium session once (same pattern as tender_scraper.py).
-        try:
-            driver.get(base_url)
-            time.sleep(4)
-        except Exception as e:
-            log_to_gui(f"Failed to initialize Selenium session: {e}")
-            driver.quit()
-            return
+        # Establish Selenium session once (same pattern as tender_scraper.py); a warm
+        # pooled driver still on this portal has already done this.
+        if lease.current_portal() != portal_host(base_url):
+            try:
+                driver.get(base_url)
+                wait_for_page(driver, "session_init")
+            except Exception as e:
+                log_to_gui(f"Failed to initialize Selenium session: {e}")
+                driver_pool.release(lease, discard=True)
+                return
         
-        for db_id, t_id, title, url, last_dl, existing_folder in to_download:
-            download_mode = mode_override if mode_override else ('update' if last_dl else 'full')
-            log_to_gui(f"Processing: {t_id} (Mode: {download_mode})...")
+        try:
+            for db_id, t_id, title, url, last_dl, existing_folder in to_download:
+                if scrape_cancelled():
+                    log_to_gui("Stop requested; remaining tenders skipped.")
+                    break
+                if checkpoint is not None and checkpoint.is_done(f"tender:{t_id}"):
+                    log_to_gui(f"Skipping {t_id} (finished before resume).")
+                    continue
+                download_mode = mode_override if mode_override else ('update' if last_dl else 'full')
+                log_to_gui(f"Processing: {t_id} (Mode: {download_mode})...")
             
-            safe_id = re.sub(r'[\\/*?:"<>|]',"", t_id)
-            preferred_dir = os.path.join(BASE_DOWNLOAD_DIRECTORY, safe_id)
-            existing = str(existing_folder or "").strip()
-            if existing:
-                try:
-                    ex_abs = os.path.normcase(os.path.abspath(existing))
-                    pref_abs = os.path.normcase(os.path.abspath(preferred_dir))
-                    save_dir = existing if ex_abs == pref_abs else preferred_dir
-                except Exception:
+                safe_id = re.sub(r'[\\/*?:"<>|]',"", t_id)
+                preferred_dir = os.path.join(BASE_DOWNLOAD_DIRECTORY, safe_id)
+                existing = str(existing_folder or "").strip()
+                if existing:
+                    try:
+                        ex_abs = os.path.normcase(os.path.abspath(existing))
+                        pref_abs = os.path.normcase(os.path.abspath(preferred_dir))
+                        save_dir = existing if ex_abs == pref_abs else preferred_dir
+                    except Exception:
+                        save_dir = preferred_dir
+                else:
                     save_dir = preferred_dir
-            else:
-                save_dir = preferred_dir
-            if not os.path.exists(save_dir): os.makedirs(save_dir)
+                if not os.path.exists(save_dir): os.makedirs(save_dir)
+                log_session = DownloadLogSession(t_id)
+                pending = []
             
-            try:
-                if not ScraperBackend.open_tender_page_with_recovery(driver, base_url, url):
-                    log_to_gui(f"Could not recover session for {t_id}. Skipping.")
-                    continue
+                try:
+                    page = ScraperBackend.open_and_harvest_tender_page(driver, base_url, url)
+                    if page is None:
+                        log_to_gui(f"Could not recover session for {t_id}. Skipping.")
+                        continue
 
-                # --- 1. Tender Notice (Full Mode Only) ---
-                if download_mode == 'full':
-                    try:
-                        notice_filename = f"Tendernotice_{safe_id}.pdf"
-                        notice_path = os.path.join(save_dir, notice_filename)
-                        if not ScraperBackend.should_skip_file(t_id, notice_filename, notice_path):
-                            log_to_gui("  Checking Tender Notice...")
-                            if not ScraperBackend.open_tender_page_with_recovery(driver, base_url, url):
-                                log_to_gui("  Could not open tender page for Tender Notice.")
-                            else:
+                    # --- 1. Tender Notice (Full Mode Only) ---
+                    if download_mode == 'full':
+                        try:
+                            notice_filename = f"Tendernotice_{safe_id}.pdf"
+                            notice_path = os.path.join(save_dir, notice_filename)
+                            if not ScraperBackend.should_skip_file(t_id, notice_filename, notice_path, log_session=log_session):
+                                log_to_gui("  Checking Tender Notice...")
                                 downloaded_notice = False
                                 # If captcha already solved in this session, final link is often directly available.
                                 if ScraperBackend.captcha_solved_in_session:
-                                    try:
-                                        final_link = wait.until(EC.presence_of_element_located((By.ID, "DirectLink_0")))
-                                        href = final_link.get_attribute('href')
-                                        if href and ScraperBackend.download_file_with_requests(href, notice_path, driver.get_cookies(), t_id, file_type="notice"):
-                                            log_to_gui("  Downloaded Tender Notice.")
-                                            downloaded_notice = True
-                                    except Exception:
-                                        pass
+                                    href = ScraperBackend.harvested_link(page, "DirectLink_0")
+                                    if href and ScraperBackend.download_file_with_requests(href, notice_path, driver.get_cookies(), t_id, file_type="notice", log_session=log_session):
+                                        log_to_gui("  Downloaded Tender Notice.")
+                                        downloaded_notice = True
                                 if not downloaded_notice:
-                                    trigger = None
-                                    try:
-                                        trigger = wait.until(EC.element_to_be_clickable((By.ID, "docDownload")))
-                                    except Exception:
-                                        try:
-                                            trigger = wait.until(EC.element_to_be_clickable((By.ID, "DirectLink_8")))
-                                        except Exception:
-                                            pass
-                                    if trigger:
+                                    trigger_id = "docDownload" if page.get("has_doc_download") else None
+                                    if not trigger_id and ScraperBackend.harvested_link(page, "DirectLink_8"):
+                                        trigger_id = "DirectLink_8"
+                                    if trigger_id:
+                                        trigger = driver.find_element(By.ID, trigger_id)
                                         driver.execute_script("arguments[0].click();", trigger)
+                                        # The captcha flow navigates away; later steps need the tender page back.
+                                        page["stale"] = True
                                         if ScraperBackend.handle_captcha_interaction(driver, "Tender Notice"):
                                             try:
                                                 final_link = wait.until(EC.presence_of_element_located((By.ID, "DirectLink_0")))
                                                 href = final_link.get_attribute('href')
-                                                if href and ScraperBackend.download_file_with_requests(href, notice_path, driver.get_cookies(), t_id, file_type="notice"):
+                                                if href and ScraperBackend.download_file_with_requests(href, notice_path, driver.get_cookies(), t_id, file_type="notice", log_session=log_session):
                                                     log_to_gui("  Downloaded Tender Notice.")
                                                     downloaded_notice = True
                                                 else:
@@ -2240,111 +3771,113 @@ class ScraperBackend:
                                                 log_to_gui("  Could not find final Notice link.")
                                 if not downloaded_notice:
                                     log_to_gui("  Tender Notice not downloaded.")
-                        else:
-                            log_to_gui("  Skipping Tender Notice (already logged and file exists).")
-                    except Exception as e:
-                        log_to_gui(f"  Notice download error: {e}")
-
-                # --- 2. Zip File (Full Mode Only) ---
-                if download_mode == 'full':
-                    try:
-                        zip_filename = f"{safe_id}.zip"
-                        zip_path = os.path.join(save_dir, zip_filename)
-                        if not ScraperBackend.should_skip_file(t_id, zip_filename, zip_path):
-                            log_to_gui("  Checking Zip File...")
-                            if ScraperBackend.open_tender_page_with_recovery(driver, base_url, url):
-                                zip_href = None
-                                try:
-                                    zip_elem = wait.until(EC.presence_of_element_located((By.PARTIAL_LINK_TEXT, "Download as zip file")))
-                                    zip_href = zip_elem.get_attribute('href')
-                                except Exception:
-                                    try:
-                                        zip_elem = wait.until(EC.presence_of_element_located((By.PARTIAL_LINK_TEXT, "Download as zip")))
-                                        zip_href = zip_elem.get_attribute('href')
-                                    except Exception:
-                                        try:
-                                            zip_elem = wait.until(EC.presence_of_element_located((By.ID, "DirectLink_7")))
-                                            zip_href = zip_elem.get_attribute('href')
-                                        except Exception:
-                                            try:
-                                                zip_elem = wait.until(EC.presence_of_element_located((By.ID, "DirectLink_8")))
-                                                zip_href = zip_elem.get_attribute('href')
-                                            except Exception:
-                                                pass
-                                if zip_href and ScraperBackend.download_file_with_requests(zip_href, zip_path, driver.get_cookies(), t_id, file_type="zip"):
-                                    log_to_gui("  Downloaded Zip File.")
+                            else:
+                                log_to_gui("  Skipping Tender Notice (already logged and file exists).")
+                        except Exception as e:
+                            log_to_gui(f"  Notice download error: {e}")
+
+                    if page.get("stale"):
+                        page = ScraperBackend.open_and_harvest_tender_page(driver, base_url, url)
+                        if page is None:
+                            log_to_gui(f"  Could not reopen tender page for {t_id}.")
+                            page = {}
+
+                    # --- 2. Zip File (Full Mode Only) ---
+                    if download_mode == 'full':
+                        try:
+                            zip_filename = f"{safe_id}.zip"
+                            zip_path = os.path.join(save_dir, zip_filename)
+                            if not ScraperBackend.should_skip_file(t_id, zip_filename, zip_path, log_session=log_session):
+                                log_to_gui("  Checking Zip File...")
+                                zip_href = page.get("zip_href") or ScraperBackend.harvested_link(page, "DirectLink_7", "DirectLink_8")
+                                if zip_href:
+                                    ScraperBackend.submit_download(
+                                        pending, zip_href, zip_path, driver.get_cookies(), t_id, file_type="zip",
+                                        log_session=log_session, done_message="  Downloaded Zip File.",
+                                    )
                                 else:
                                     log_to_gui("  Zip link not found.")
-                        else:
-                            log_to_gui("  Skipping Zip file (already logged and file exists).")
-                    except Exception as e:
-                        log_to_gui(f"  Zip download error: {e}")
+                            else:
+                                log_to_gui("  Skipping Zip file (already logged and file exists).")
+                        except Exception as e:
+                            log_to_gui(f"  Zip download error: {e}")
 
-                # --- 3. Pre-Bid Meeting (Always Check) ---
-                try:
-                    prebid_filename = f"PreBid_Meeting_{safe_id}.pdf"
-                    prebid_path = os.path.join(save_dir, prebid_filename)
-                    if not ScraperBackend.should_skip_file(t_id, prebid_filename, prebid_path):
-                        if ScraperBackend.open_tender_page_with_recovery(driver, base_url, url):
-                            try:
-                                pb_link = wait.until(EC.presence_of_element_located((By.ID, "DirectLink_2")))
-                                href = pb_link.get_attribute('href')
-                                if href and ScraperBackend.download_file_with_requests(href, prebid_path, driver.get_cookies(), t_id, file_type="prebid"):
-                                    log_to_gui("  Downloaded Pre-Bid File.")
-                                else:
-                                    log_to_gui("  Pre-Bid file link not found.")
-                            except Exception:
+                    # --- 3. Pre-Bid Meeting (Always Check) ---
+                    try:
+                        prebid_filename = f"PreBid_Meeting_{safe_id}.pdf"
+                        prebid_path = os.path.join(save_dir, prebid_filename)
+                        if not ScraperBackend.should_skip_file(t_id, prebid_filename, prebid_path, log_session=log_session):
+                            href = ScraperBackend.harvested_link(page, "DirectLink_2")
+                            if href:
+                                ScraperBackend.submit_download(
+                                    pending, href, prebid_path, driver.get_cookies(), t_id, file_type="prebid",
+                                    log_session=log_session, done_message="  Downloaded Pre-Bid File.",
+                                )
+                            else:
                                 log_to_gui("  No Pre-Bid file found.")
-                    else:
-                        log_to_gui("  Skipping Pre-Bid file (already logged and file exists).")
-                except Exception as e:
-                    log_to_gui(f"  Pre-bid error: {e}")
+                        else:
+                            log_to_gui("  Skipping Pre-Bid file (already logged and file exists).")
+                    except Exception as e:
+                        log_to_gui(f"  Pre-bid error: {e}")
 
-                # --- 4. Corrigendums (Always Check) ---
-                try:
-                    log_to_gui("  Checking Corrigendums...")
-                    if ScraperBackend.open_tender_page_with_recovery(driver, base_url, url):
-                        main_window = driver.current_window_handle
-                        corr_links = driver.find_elements(By.XPATH, "//a[contains(@title, 'View Corrigendum History')]")
-                        if corr_links:
-                            driver.execute_script("arguments[0].click();", corr_links[0])
-                            wait.until(EC.number_of_windows_to_be(2))
-                            for handle in driver.window_handles:
-                                if handle != main_window:
-                                    driver.switch_to.window(handle)
-                                    break
-
-                            docs = wait.until(EC.presence_of_all_elements_located((By.XPATH, "//a[contains(@id, 'DirectLink_')]")))
-                            for doc in docs:
-                                href = doc.get_attribute('href')
-                                name = (doc.text or "").strip()
-                                if href and name:
-                                    safe_name = re.sub(r'[\\/*?:"<>|]', "", name)
-                                    fpath = os.path.join(save_dir, safe_name)
-                                    if ScraperBackend.should_skip_file(t_id, safe_name, fpath):
-                                        continue
-                                    if ScraperBackend.download_file_with_requests(href, fpath, driver.get_cookies(), t_id, file_type="corrigendum"):
-                                        log_to_gui(f"    Downloaded Corrigendum: {safe_name}")
-                            driver.close()
-                            driver.switch_to.window(main_window)
-                except Exception as e:
-                    log_to_gui(f"  Corrigendum error: {e}")
+                    # --- 4. Corrigendums (Always Check) ---
                     try:
-                        if 'main_window' in locals():
-                            driver.switch_to.window(main_window)
-                    except Exception:
-                        pass
+                        log_to_gui("  Checking Corrigendums...")
+                        if page.get("corrigendum_history"):
+                            main_window = driver.current_window_handle
+                            corr_links = driver.find_elements(By.XPATH, "//a[contains(@title, 'View Corrigendum History')]")
+                            if corr_links:
+                                driver.execute_script("arguments[0].click();", corr_links[0])
+                                wait.until(EC.number_of_windows_to_be(2))
+                                for handle in driver.window_handles:
+                                    if handle != main_window:
+                                        driver.switch_to.window(handle)
+                                        break
+
+                                wait.until(EC.presence_of_all_elements_located((By.XPATH, "//a[contains(@id, 'DirectLink_')]")))
+                                popup_page = ScraperBackend.harvest_tender_page(driver) or {}
+                                cookies = driver.get_cookies()
+                                for doc in ScraperBackend.harvested_links(popup_page):
+                                    href = doc.get("href")
+                                    name = (doc.get("text") or "").strip()
+                                    if href and name:
+                                        safe_name = re.sub(r'[\\/*?:"<>|]', "", name)
+                                        fpath = os.path.join(save_dir, safe_name)
+                                        if ScraperBackend.should_skip_file(t_id, safe_name, fpath, log_session=log_session):
+                                            continue
+                                        ScraperBackend.submit_download(
+                                            pending, href, fpath, cookies, t_id, file_type="corrigendum",
+                                            log_session=log_session, done_message=f"    Downloaded Corrigendum: {safe_name}",
+                                        )
+                                driver.close()
+                                driver.switch_to.window(main_window)
+                    except Exception as e:
+                        log_to_gui(f"  Corrigendum error: {e}")
+                        try:
+                            if 'main_window' in locals():
+                                driver.switch_to.window(main_window)
+                        except Exception:
+                            pass
 
-                # Update DB
-                conn = sqlite3.connect(DB_FILE)
-                conn.execute("UPDATE tenders SET folder_path=?, last_downloaded_at=CURRENT_TIMESTAMP WHERE id=?", (save_dir, db_id))
-                conn.commit()
-                conn.close()
+                    # Zip, pre-bid and corrigendum files download in parallel with the page work above.
+                    ScraperBackend.wait_for_downloads(pending)
 
-            except Exception as e:
-                log_to_gui(f"Error accessing {url}: {e}")
-        
-        driver.quit()
+                    # Update DB
+                    conn = sqlite3.connect(DB_FILE)
+                    conn.execute("UPDATE tenders SET folder_path=?, last_downloaded_at=CURRENT_TIMESTAMP WHERE id=?", (save_dir, db_id))
+                    conn.commit()
+                    conn.close()
+                    if checkpoint is not None:
+                        checkpoint.mark_done(f"tender:{t_id}")
+
+                except Exception as e:
+                    log_to_gui(f"Error accessing {url}: {e}")
+                finally:
+                    ScraperBackend.wait_for_downloads(pending)
+                    log_session.close()
+        finally:
+            driver_pool.release(lease)
+        log_to_gui(selenium_timing_summary())
         log_to_gui("Download process finished.")
 
     @staticmethod
@@ -2526,11 +4059,11 @@ class ScraperBackend:
         conn = sqlite3.connect(DB_FILE)
         c = conn.cursor()
         if website_id:
+            # Walk the log newest first and probe tenders by tender_id, so no sort is needed.
             c.execute(
                 """SELECT d.tender_id, d.file_name, COALESCE(d.file_type,'document'), d.downloaded_at
                    FROM downloaded_files d
-                   JOIN tenders t ON t.tender_id = d.tender_id
-                   WHERE t.website_id=?
+                   WHERE EXISTS (SELECT 1 FROM tenders t WHERE t.tender_id = d.tender_id AND t.website_id=?)
                    ORDER BY d.downloaded_at DESC LIMIT ?""",
                 (website_id, limit)
             )
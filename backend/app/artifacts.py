@@ -0,0 +1,192 @@
+from __future__ import annotations
+
+import hashlib
+import os
+import re
+import shutil
+import sqlite3
+import time
+import uuid
+import zipfile
+from pathlib import Path
+from typing import Iterator
+
+from document_store import link_or_copy
+
+STATE_DB_ARCNAME = "__state/tender_manager.db"
+STREAM_CHUNK_SIZE = 256 * 1024
+FAST_DEFLATE_LEVEL = 1
+# Formats that are already compressed; deflating them again costs CPU for a few bytes at best.
+STORED_SUFFIXES = {
+    ".zip", ".rar", ".7z", ".gz", ".tgz", ".bz2", ".xz",
+    ".pdf", ".jpg", ".jpeg", ".png", ".gif", ".webp", ".tif", ".tiff",
+    ".docx", ".xlsx", ".pptx", ".odt", ".ods", ".odp",
+    ".mp3", ".mp4", ".avi", ".mkv",
+}
+
+
+def compression_for(name: str) -> tuple[int, int | None]:
+    if Path(name).suffix.lower() in STORED_SUFFIXES:
+        return zipfile.ZIP_STORED, None
+    return zipfile.ZIP_DEFLATED, FAST_DEFLATE_LEVEL
+
+
+def stage_artifact(
+    job_id: str,
+    changed: list[str],
+    download_root: Path,
+    db_path: Path,
+    artifact_dir: Path,
+) -> tuple[Path | None, int]:
+    """Freeze a job's output as hardlinks plus a DB copy under `artifact_dir/<job_id>`.
+
+    The zip itself is produced while it is being downloaded (see `stream_artifact`).
+    """
+    staging = artifact_dir / job_id
+    if staging.exists():
+        shutil.rmtree(staging, ignore_errors=True)
+    count = 0
+    for rel in changed:
+        src = download_root / rel
+        if not src.is_file():
+            continue
+        dst = staging / rel
+        dst.parent.mkdir(parents=True, exist_ok=True)
+        link_or_copy(str(src), str(dst))
+        count += 1
+    if db_path.exists() and db_path.is_file():
+        # Always return a DB snapshot so frontend can sync local UI state.
+        state_db = staging / STATE_DB_ARCNAME
+        state_db.parent.mkdir(parents=True, exist_ok=True)
+        src_conn = sqlite3.connect(str(db_path))
+        dst_conn = sqlite3.connect(str(state_db))
+        try:
+            src_conn.backup(dst_conn)
+        finally:
+            dst_conn.close()
+            src_conn.close()
+    elif not count:
+        return None, 0
+    return staging, count
+
+
+def artifact_entries(staging: Path) -> list[tuple[str, Path]]:
+    """(arcname, path) pairs in a fixed order, so every rebuild of the zip is byte-identical."""
+    entries = []
+    for current, dirs, files in os.walk(staging):
+        dirs.sort()
+        for name in sorted(files):
+            path = Path(current) / name
+            entries.append((path.relative_to(staging).as_posix(), path))
+    return entries
+
+
+class _ChunkSink:
+    """Write-only, unseekable target for ZipFile; written bytes are collected for the caller."""
+
+    def __init__(self) -> None:
+        self.chunks: list[bytes] = []
+
+    def write(self, data: bytes) -> int:
+        if data:
+            self.chunks.append(bytes(data))
+        return len(data)
+
+    def flush(self) -> None:
+        pass
+
+    def take(self) -> bytes:
+        data, self.chunks = b"".join(self.chunks), []
+        return data
+
+
+def stream_artifact(staging: Path) -> Iterator[bytes]:
+    """Yield the artifact zip as it is built, picking the compression per file."""
+    sink = _ChunkSink()
+    with zipfile.ZipFile(sink, "w") as zf:
+        for arcname, path in artifact_entries(staging):
+            st = path.stat()
+            info = zipfile.ZipInfo(arcname, date_time=time.localtime(st.st_mtime)[:6])
+            info.compress_type, level = compression_for(arcname)
+            if level is not None:
+                # No public per-entry level before Python 3.13; ZipFile.open reads this attribute.
+                info._compresslevel = level
+            info.file_size = st.st_size
+            with open(path, "rb") as src, zf.open(info, "w") as dst:
+                for chunk in iter(lambda: src.read(STREAM_CHUNK_SIZE), b""):
+                    dst.write(chunk)
+                    if sum(len(c) for c in sink.chunks) >= STREAM_CHUNK_SIZE:
+                        yield sink.take()
+            yield sink.take()
+    yield sink.take()
+
+
+def cached_zip_path(staging: Path) -> Path:
+    return staging.with_name(f"{staging.name}.zip")
+
+
+def artifact_etag(staging: Path) -> str:
+    """Strong ETag for the zip built from `staging`; the zip bytes depend only on what it hashes."""
+    h = hashlib.sha256()
+    for arcname, path in artifact_entries(staging):
+        st = path.stat()
+        h.update(f"{arcname}\0{st.st_size}\0{int(st.st_mtime)}\n".encode("utf-8"))
+    return f'"{staging.name}-{h.hexdigest()[:16]}"'
+
+
+def ensure_cached_zip(staging: Path) -> Path:
+    cache = cached_zip_path(staging)
+    if not cache.exists():
+        for _ in stream_and_cache(staging):
+            pass
+    return cache
+
+
+def parse_byte_range(header: str, size: int) -> tuple[int, int] | None:
+    """Inclusive (start, end) of a single `bytes=` range; None when it cannot be satisfied.
+
+    Raises ValueError for a header this endpoint does not handle (e.g. several ranges).
+    """
+    m = re.fullmatch(r"\s*bytes\s*=\s*(\d*)\s*-\s*(\d*)\s*", str(header or ""))
+    if not m or (not m.group(1) and not m.group(2)):
+        raise ValueError("unsupported Range header")
+    if not m.group(1):
+        suffix = int(m.group(2))
+        if suffix == 0 or size == 0:
+            return None
+        return max(0, size - suffix), size - 1
+    start = int(m.group(1))
+    end = int(m.group(2)) if m.group(2) else size - 1
+    if start >= size or end < start:
+        return None
+    return start, min(end, size - 1)
+
+
+def iter_file_range(path: Path, start: int, end: int) -> Iterator[bytes]:
+    with open(path, "rb") as f:
+        f.seek(start)
+        remaining = end - start + 1
+        while remaining > 0:
+            chunk = f.read(min(STREAM_CHUNK_SIZE, remaining))
+            if not chunk:
+                return
+            remaining -= len(chunk)
+            yield chunk
+
+
+def stream_and_cache(staging: Path) -> Iterator[bytes]:
+    """stream_artifact, keeping a copy as `<job_id>.zip` once a stream has run to the end."""
+    cache = cached_zip_path(staging)
+    part = cache.with_name(f"{cache.name}.{uuid.uuid4().hex[:8]}.part")
+    completed = False
+    try:
+        with open(part, "wb") as f:
+            for chunk in stream_artifact(staging):
+                if chunk:
+                    f.write(chunk)
+                    yield chunk
+        os.replace(part, cache)
+        completed = True
+    finally:
+        if not completed:
+            part.unlink(missing_ok=True)
@@ -0,0 +1,160 @@
+from __future__ import annotations
+
+import base64
+import queue
+import threading
+import uuid
+from collections import deque
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from typing import Any
+
+from .models import utcnow
+
+# Captchas from jobs someone is actively waiting on (a single tender's documents) go ahead
+# of bulk crawls. A job can override this with payload["captcha_priority"].
+ACTION_CAPTCHA_PRIORITY = {
+    "deliver_tender_docs": 30,
+    "single_download": 30,
+    "download_tenders": 20,
+    "download_results": 10,
+    "check_status": 10,
+    "fetch_tenders": 0,
+    "fetch_organisations": 0,
+}
+WAIT_SAMPLE_LIMIT = 1000
+
+
+def captcha_priority(action: str, payload: dict[str, Any]) -> int:
+    try:
+        return int(payload["captcha_priority"])
+    except (KeyError, TypeError, ValueError):
+        return ACTION_CAPTCHA_PRIORITY.get(str(action), 0)
+
+
+@dataclass
+class CaptchaTicket:
+    challenge_id: str
+    job_id: str
+    api_key_id: str
+    action: str
+    image_base64: str
+    priority: int
+    expires_at: datetime
+    created_at: datetime = field(default_factory=utcnow)
+    answer: queue.Queue[str] = field(default_factory=queue.Queue)
+    outcome: str = "pending"
+
+    def to_item(self) -> dict[str, Any]:
+        return {
+            "challenge_id": self.challenge_id,
+            "job_id": self.job_id,
+            "action": self.action,
+            "priority": self.priority,
+            "image_base64": self.image_base64,
+            "created_at_utc": self.created_at.isoformat(),
+            "expires_at_utc": self.expires_at.isoformat(),
+        }
+
+
+class CaptchaBroker:
+    """Pending captchas of every job, answerable by challenge id from one place."""
+
+    def __init__(self, timeout_seconds: int = 300) -> None:
+        self.timeout_seconds = int(timeout_seconds)
+        self._lock = threading.Lock()
+        self._pending: dict[str, CaptchaTicket] = {}
+        # (api_key_id, outcome, seconds from open to answer/expiry)
+        self._waits: deque[tuple[str, str, float]] = deque(maxlen=WAIT_SAMPLE_LIMIT)
+
+    def open(self, job_id: str, api_key_id: str, action: str, image: bytes, priority: int) -> CaptchaTicket:
+        ticket = CaptchaTicket(
+            challenge_id=str(uuid.uuid4()),
+            job_id=job_id,
+            api_key_id=str(api_key_id or ""),
+            action=str(action),
+            image_base64=base64.b64encode(image).decode("ascii"),
+            priority=int(priority),
+            expires_at=utcnow() + timedelta(seconds=self.timeout_seconds),
+        )
+        with self._lock:
+            self._pending[ticket.challenge_id] = ticket
+        return ticket
+
+    def wait(self, ticket: CaptchaTicket, stop_evt: threading.Event) -> str | None:
+        """Block until the ticket is answered, expires or the job stops; an empty answer is a cancel."""
+        answer: str | None = None
+        while not stop_evt.is_set() and utcnow() < ticket.expires_at:
+            try:
+                answer = ticket.answer.get(timeout=0.25)
+                break
+            except queue.Empty:
+                continue
+        with self._lock:
+            self._pending.pop(ticket.challenge_id, None)
+            if answer is None:
+                ticket.outcome = "cancelled" if stop_evt.is_set() else "expired"
+            self._waits.append(
+                (ticket.api_key_id, ticket.outcome, (utcnow() - ticket.created_at).total_seconds())
+            )
+        return answer or None
+
+    def pending(self, api_key_id: str) -> list[dict[str, Any]]:
+        now = utcnow()
+        with self._lock:
+            tickets = [
+                t for t in self._pending.values()
+                if t.api_key_id == str(api_key_id or "") and t.outcome == "pending" and t.expires_at > now
+            ]
+        # Highest priority first, then the one closest to expiry.
+        tickets.sort(key=lambda t: (-t.priority, t.expires_at))
+        return [t.to_item() for t in tickets]
+
+    def answer(self, challenge_id: str, value: str, api_key_id: str | None = None, job_id: str | None = None) -> str:
+        """Hand an answer to the waiting job: "accepted", "expired" or "unknown"."""
+        with self._lock:
+            ticket = self._pending.get(str(challenge_id))
+            if ticket is None:
+                return "unknown"
+            if api_key_id is not None and ticket.api_key_id != str(api_key_id):
+                return "unknown"
+            if job_id is not None and ticket.job_id != job_id:
+                return "unknown"
+            if ticket.outcome != "pending" or ticket.expires_at <= utcnow():
+                return "expired"
+            ticket.outcome = "answered" if str(value or "").strip() else "cancelled"
+            ticket.answer.put(str(value or "").strip())
+        return "accepted"
+
+    def answer_many(self, api_key_id: str, answers: list[tuple[str, str]]) -> dict[str, str]:
+        return {challenge_id: self.answer(challenge_id, value, api_key_id=api_key_id) for challenge_id, value in answers}
+
+    def metrics(self, api_key_id: str | None = None) -> dict[str, Any]:
+        with self._lock:
+            samples = [s for s in self._waits if api_key_id is None or s[0] == str(api_key_id)]
+            pending = [t for t in self._pending.values() if api_key_id is None or t.api_key_id == str(api_key_id)]
+        now = utcnow()
+        answered = sorted(wait for _, outcome, wait in samples if outcome == "answered")
+        outcomes: dict[str, int] = {}
+        for _, outcome, _ in samples:
+            outcomes[outcome] = outcomes.get(outcome, 0) + 1
+
+        def pct(p: float) -> float | None:
+            if not answered:
+                return None
+            return round(answered[min(len(answered) - 1, int(p * len(answered)))], 2)
+
+        return {
+            "pending": len(pending),
+            "oldest_pending_seconds": (
+                round(max((now - t.created_at).total_seconds() for t in pending), 2) if pending else None
+            ),
+            "outcomes": outcomes,
+            "answered_wait_seconds": {
+                "count": len(answered),
+                "avg": round(sum(answered) / len(answered), 2) if answered else None,
+                "p50": pct(0.5),
+                "p95": pct(0.95),
+                "max": round(answered[-1], 2) if answered else None,
+            },
+        }
@@ -0,0 +1,252 @@
+from __future__ import annotations
+
+import json
+import threading
+from datetime import timedelta
+from pathlib import Path
+from urllib.parse import urlparse
+
+import app_core as core
+
+from .models import utcnow
+
+# Portal columns of a tender, in ScraperBackend.upsert_tender_row order after website_id.
+TENDER_FIELDS = (
+    "org_chain", "tender_id", "title", "tender_value", "emd", "closing_date", "opening_date",
+    "tender_url", "location", "tender_category", "pre_bid_meeting_date", "work_description",
+)
+
+
+def portal_key(url: str) -> str:
+    parsed = urlparse(str(url or "").strip())
+    return (parsed.netloc or parsed.path).lower().strip("/")
+
+
+class TenderCatalogue:
+    """Public portal data shared by every tenant, keyed by portal host.
+
+    Crawls publish organisations and per-organisation tender listings here; tenant
+    workspaces are filled from it while it is fresh, keeping their own selection,
+    download and folder state.
+    """
+
+    def __init__(self, db_path: Path, ttl_minutes: int = 60) -> None:
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.ttl_seconds = max(0, int(ttl_minutes)) * 60
+        self._lock = threading.Lock()
+        conn = self._connect()
+        try:
+            conn.executescript(
+                """
+                CREATE TABLE IF NOT EXISTS catalogue_orgs (
+                    portal TEXT,
+                    name TEXT,
+                    tender_count TEXT,
+                    tenders_url TEXT,
+                    crawled_at TEXT,
+                    PRIMARY KEY (portal, name)
+                );
+                CREATE TABLE IF NOT EXISTS catalogue_org_crawls (
+                    portal TEXT,
+                    org_name TEXT,
+                    crawled_at TEXT,
+                    tender_ids TEXT,
+                    PRIMARY KEY (portal, org_name)
+                );
+                CREATE TABLE IF NOT EXISTS catalogue_tenders (
+                    portal TEXT,
+                    normalized_tender_url TEXT,
+                    org_chain TEXT,
+                    tender_id TEXT,
+                    title TEXT,
+                    tender_value TEXT,
+                    emd TEXT,
+                    closing_date TEXT,
+                    opening_date TEXT,
+                    tender_url TEXT,
+                    location TEXT,
+                    tender_category TEXT,
+                    pre_bid_meeting_date TEXT,
+                    work_description TEXT,
+                    crawled_at TEXT,
+                    PRIMARY KEY (portal, normalized_tender_url)
+                );
+                CREATE INDEX IF NOT EXISTS idx_catalogue_tenders_org ON catalogue_tenders(portal, org_chain);
+                """
+            )
+            conn.commit()
+        finally:
+            conn.close()
+
+    def _connect(self):
+        conn = core.sqlite3.connect(str(self.db_path), timeout=30)
+        conn.execute("PRAGMA journal_mode=WAL")
+        return conn
+
+    def _cutoff(self) -> str:
+        return (utcnow() - timedelta(seconds=self.ttl_seconds)).isoformat()
+
+    @staticmethod
+    def tenant_portal(tenant_db: str, website_id: int) -> str:
+        conn = core.sqlite3.connect(tenant_db)
+        try:
+            row = conn.execute("SELECT url FROM websites WHERE id=?", (int(website_id),)).fetchone()
+        finally:
+            conn.close()
+        return portal_key(row[0]) if row else ""
+
+    # --- organisations ---
+    def organisations_fresh(self, portal: str) -> bool:
+        conn = self._connect()
+        try:
+            row = conn.execute(
+                "SELECT COUNT(*) FROM catalogue_orgs WHERE portal=? AND crawled_at>=?",
+                (portal, self._cutoff()),
+            ).fetchone()
+        finally:
+            conn.close()
+        return bool(row and row[0])
+
+    def publish_organisations(self, portal: str, tenant_db: str, website_id: int) -> int:
+        src = core.sqlite3.connect(tenant_db)
+        try:
+            rows = src.execute(
+                "SELECT name, tender_count, tenders_url FROM organizations WHERE website_id=?",
+                (int(website_id),),
+            ).fetchall()
+        finally:
+            src.close()
+        now = utcnow().isoformat()
+        with self._lock:
+            conn = self._connect()
+            try:
+                conn.execute("DELETE FROM catalogue_orgs WHERE portal=?", (portal,))
+                conn.executemany(
+                    "INSERT INTO catalogue_orgs (portal, name, tender_count, tenders_url, crawled_at) VALUES (?, ?, ?, ?, ?)",
+                    [(portal, name, count, url, now) for name, count, url in rows],
+                )
+                conn.commit()
+            finally:
+                conn.close()
+        return len(rows)
+
+    def apply_organisations(self, portal: str, tenant_db: str, website_id: int) -> int:
+        conn = self._connect()
+        try:
+            rows = conn.execute(
+                "SELECT name, tender_count, tenders_url FROM catalogue_orgs WHERE portal=?",
+                (portal,),
+            ).fetchall()
+        finally:
+            conn.close()
+        dst = core.sqlite3.connect(tenant_db)
+        try:
+            # is_selected stays whatever the tenant chose.
+            dst.executemany(
+                """INSERT INTO organizations (website_id, name, tender_count, tenders_url) VALUES (?, ?, ?, ?)
+                   ON CONFLICT(website_id, name) DO UPDATE SET
+                       tender_count=excluded.tender_count, tenders_url=excluded.tenders_url""",
+                [(int(website_id), name, count, url) for name, count, url in rows],
+            )
+            dst.commit()
+        finally:
+            dst.close()
+        return len(rows)
+
+    # --- tenders ---
+    def fresh_org_names(self, portal: str, org_names) -> set[str]:
+        names = sorted({str(x).strip() for x in (org_names or []) if str(x).strip()})
+        if not names:
+            return set()
+        conn = self._connect()
+        try:
+            placeholders = ",".join("?" for _ in names)
+            rows = conn.execute(
+                f"SELECT org_name FROM catalogue_org_crawls WHERE portal=? AND crawled_at>=? AND org_name IN ({placeholders})",
+                (portal, self._cutoff(), *names),
+            ).fetchall()
+        finally:
+            conn.close()
+        return {r[0] for r in rows}
+
+    def publish_org_tenders(self, portal: str, tenant_db: str, website_id: int, org_names) -> int:
+        """Copy the tenant's just-crawled listing of these organisations into the catalogue."""
+        names = [str(x).strip() for x in (org_names or []) if str(x).strip()]
+        if not names:
+            return 0
+        cols = ", ".join(TENDER_FIELDS)
+        src = core.sqlite3.connect(tenant_db)
+        try:
+            by_org = {
+                name: src.execute(
+                    f"SELECT normalized_tender_url, {cols} FROM tenders "
+                    "WHERE website_id=? AND org_chain=? AND COALESCE(is_archived,0)=0",
+                    (int(website_id), name),
+                ).fetchall()
+                for name in names
+            }
+        finally:
+            src.close()
+        now = utcnow().isoformat()
+        placeholders = ", ".join("?" for _ in range(len(TENDER_FIELDS) + 3))
+        published = 0
+        with self._lock:
+            conn = self._connect()
+            try:
+                for name, rows in by_org.items():
+                    conn.execute("DELETE FROM catalogue_tenders WHERE portal=? AND org_chain=?", (portal, name))
+                    conn.executemany(
+                        f"INSERT OR REPLACE INTO catalogue_tenders (portal, normalized_tender_url, {cols}, crawled_at) "
+                        f"VALUES ({placeholders})",
+                        [(portal, *row, now) for row in rows],
+                    )
+                    seen = sorted({str(row[2] or "").strip() for row in rows if str(row[2] or "").strip()})
+                    conn.execute(
+                        "INSERT OR REPLACE INTO catalogue_org_crawls (portal, org_name, crawled_at, tender_ids) VALUES (?, ?, ?, ?)",
+                        (portal, name, now, json.dumps(seen)),
+                    )
+                    published += len(rows)
+                conn.commit()
+            finally:
+                conn.close()
+        return published
+
+    def apply_org_tenders(self, portal: str, tenant_db: str, website_id: int, org_names) -> int:
+        """Bring the tenant's tenders for these organisations up to the catalogue's listing.
+
+        Goes through the same upsert/dedupe/stale-archive steps as a crawl, so tenant
+        columns (is_downloaded, bookmarks, folders, status) are kept.
+        """
+        names = sorted({str(x).strip() for x in (org_names or []) if str(x).strip()})
+        if not names:
+            return 0
+        cols = ", ".join(TENDER_FIELDS)
+        placeholders = ",".join("?" for _ in names)
+        conn = self._connect()
+        try:
+            rows = conn.execute(
+                f"SELECT {cols} FROM catalogue_tenders WHERE portal=? AND org_chain IN ({placeholders})",
+                (portal, *names),
+            ).fetchall()
+            seen = {
+                org: json.loads(ids or "[]")
+                for org, ids in conn.execute(
+                    f"SELECT org_name, tender_ids FROM catalogue_org_crawls WHERE portal=? AND org_name IN ({placeholders})",
+                    (portal, *names),
+                ).fetchall()
+            }
+        finally:
+            conn.close()
+        dst = core.sqlite3.connect(tenant_db)
+        try:
+            for row in rows:
+                core.ScraperBackend.upsert_tender_row(dst, (int(website_id), *row))
+            core.ScraperBackend.dedupe_tenders_for_website(dst, int(website_id))
+            for org, ids in seen.items():
+                core.ScraperBackend.archive_missing_tenders_for_org(dst, int(website_id), org, set(ids))
+            dst.commit()
+        finally:
+            dst.close()
+        return len(rows)
+
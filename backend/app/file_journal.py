@@ -0,0 +1,146 @@
+from __future__ import annotations
+
+import hashlib
+import importlib
+import os
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any
+
+HASH_CHUNK_SIZE = 256 * 1024
+JOURNAL_RETENTION_SECONDS = 30 * 24 * 3600
+
+
+def _sha256(path: Path) -> str:
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(HASH_CHUNK_SIZE), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+class DownloadJournal:
+    """Files written under a workspace's download root, recorded per job.
+
+    app_core calls `record()` through `core.download_journal` for every document it
+    saves, so the artifact builder can read a job's changes instead of walking the tree.
+    """
+
+    def __init__(self, db_path: Path, download_root: Path, job_id: str) -> None:
+        self.db_path = Path(db_path)
+        self.download_root = Path(download_root).resolve()
+        self.job_id = job_id
+        self._lock = threading.Lock()
+        conn = self._connect()
+        try:
+            conn.execute(
+                """CREATE TABLE IF NOT EXISTS download_journal (
+                       id INTEGER PRIMARY KEY AUTOINCREMENT,
+                       path TEXT,
+                       size INTEGER,
+                       sha256 TEXT,
+                       job_id TEXT,
+                       source TEXT,
+                       written_at REAL
+                   )"""
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_download_journal_job ON download_journal(job_id)")
+            conn.execute("DELETE FROM download_journal WHERE written_at<?", (time.time() - JOURNAL_RETENTION_SECONDS,))
+            conn.commit()
+        finally:
+            conn.close()
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(str(self.db_path), timeout=30)
+        conn.execute("PRAGMA journal_mode=WAL")
+        return conn
+
+    def relative_path(self, file_path: Any) -> str | None:
+        try:
+            rel = Path(file_path).resolve().relative_to(self.download_root)
+        except (OSError, ValueError):
+            return None
+        return rel.as_posix()
+
+    def record(self, file_path: Any, sha256: str | None = None, source: str = "download") -> None:
+        rel = self.relative_path(file_path)
+        if rel is None:
+            return
+        path = self.download_root / rel
+        try:
+            size = path.stat().st_size
+            digest = sha256 or _sha256(path)
+        except OSError:
+            return
+        with self._lock:
+            conn = self._connect()
+            try:
+                conn.execute(
+                    "INSERT INTO download_journal (path, size, sha256, job_id, source, written_at) VALUES (?, ?, ?, ?, ?, ?)",
+                    (rel, int(size), digest, self.job_id, source, time.time()),
+                )
+                conn.commit()
+            finally:
+                conn.close()
+
+    def changed_paths(self) -> list[str]:
+        """Relative paths this job wrote that still exist."""
+        conn = self._connect()
+        try:
+            rows = conn.execute(
+                "SELECT DISTINCT path FROM download_journal WHERE job_id=?", (self.job_id,)
+            ).fetchall()
+        finally:
+            conn.close()
+        return sorted(r[0] for r in rows if (self.download_root / r[0]).is_file())
+
+
+class DownloadWatcher:
+    """Optional watchdog (inotify on Linux) observer that journals files written by other tools.
+
+    Inactive when the watchdog package is not installed.
+    """
+
+    def __init__(self, journal: DownloadJournal) -> None:
+        self.journal = journal
+        self._observer = None
+        self._seen: set[str] = set()
+        self._lock = threading.Lock()
+
+    def start(self) -> bool:
+        try:
+            observers = importlib.import_module("watchdog.observers")
+            events = importlib.import_module("watchdog.events")
+        except ImportError:
+            return False
+        watcher = self
+
+        class _Handler(events.FileSystemEventHandler):
+            def on_any_event(self, event):
+                if not event.is_directory:
+                    watcher._saw(getattr(event, "dest_path", "") or event.src_path)
+
+        self._observer = observers.Observer()
+        self._observer.schedule(_Handler(), str(self.journal.download_root), recursive=True)
+        self._observer.start()
+        return True
+
+    def _saw(self, path: str) -> None:
+        with self._lock:
+            self._seen.add(str(path))
+
+    def stop(self) -> None:
+        """Stop watching and journal the seen files the download layer did not record itself."""
+        if self._observer is None:
+            return
+        self._observer.stop()
+        self._observer.join(timeout=2)
+        self._observer = None
+        with self._lock:
+            seen, self._seen = sorted(self._seen), set()
+        recorded = set(self.journal.changed_paths())
+        for path in seen:
+            if os.path.isfile(path) and self.journal.relative_path(path) not in recorded:
+                self.journal.record(path, source="watcher")
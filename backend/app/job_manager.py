@@ -1,27 +1,77 @@
 from __future__ import annotations
 
 import base64
+import hashlib
+import json
 import os
 import queue
-import shutil
 import threading
+import time
 import uuid
-import zipfile
 from contextlib import contextmanager
-from dataclasses import dataclass, field
-from datetime import datetime, timedelta, timezone
+from dataclasses import dataclass, field, replace
+from datetime import datetime, timezone
 from pathlib import Path
 from typing import Any
 
 import app_core as core
+from document_store import DocumentBlobStore
 
-from .models import JobAction, JobView, utcnow
+from .artifacts import stage_artifact
+from .captcha_broker import CaptchaBroker, captcha_priority
+from .catalogue import TenderCatalogue
+from .file_journal import DownloadJournal, DownloadWatcher
+from .models import MAX_BATCH_ITEMS, JobAction, JobView, utcnow
+from .scheduler import JobScheduler, priority_class
+from .workspace_pool import WORKSPACE_DB_NAME, WorkspacePool
+
+
+# Portal reads whose result depends only on their inputs: an identical request attaches to the
+# job already doing (or that just did) the work instead of crawling the portal again.
+COALESCE_ACTIONS = {"fetch_organisations", "fetch_tenders", "check_status", "download_results"}
+COALESCE_ACTIVE_STATUSES = ("queued", "running", "captcha_required")
 
 
 def _safe_key_fragment(api_key: str) -> str:
     return "".join(ch for ch in api_key if ch.isalnum())[:12] or "client"
 
 
+def _job_coalesce_key(action: str, payload: dict[str, Any], selection: str | None = "") -> str | None:
+    """Key under which identical requests share one job; None when the request must run alone.
+
+    `selection` fingerprints the workspace state the action reads (see `_workspace_selection`);
+    None means it could not be read, so the request is not coalesced. An uploaded DB snapshot is
+    part of the key because ephemeral jobs run against it and return it in their artifact.
+    """
+    if selection is None or action not in COALESCE_ACTIONS or payload.get("website_id") in (None, ""):
+        return None
+    try:
+        website_id = int(payload["website_id"])
+    except (TypeError, ValueError):
+        return None
+    org_names = sorted({str(x).strip() for x in (payload.get("selected_org_names") or []) if str(x).strip()})
+    workspace = "{}:{}".format(
+        "ephemeral" if payload.get("_ephemeral_workspace") else "shared",
+        _safe_key_fragment(str(payload.get("_api_key_id", ""))),
+    )
+    return json.dumps(
+        [
+            action,
+            website_id,
+            org_names,
+            bool(payload.get("archived_only", False)),
+            bool(payload.get("force", False)),
+            workspace,
+            _digest(str(payload.get("db_snapshot_base64") or "")),
+            selection,
+        ]
+    )
+
+
+def _digest(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()[:16] if text else ""
+
+
 @contextmanager
 def _temporary_selected_orgs(db_path: Path, website_id: int, selected_org_names):
     names = [str(x).strip() for x in (selected_org_names or []) if str(x).strip()]
@@ -53,6 +103,40 @@ def _temporary_selected_orgs(db_path: Path, website_id: int, selected_org_names)
             conn.close()
 
 
+def _selected_org_names(db_path: Path, website_id: int) -> list[str]:
+    conn = core.sqlite3.connect(str(db_path))
+    try:
+        rows = conn.execute(
+            "SELECT DISTINCT TRIM(COALESCE(name,'')) FROM organizations WHERE website_id=? AND COALESCE(is_selected,0)=1",
+            (int(website_id),),
+        ).fetchall()
+    finally:
+        conn.close()
+    return [r[0] for r in rows if r[0]]
+
+
+def _workspace_selection(db_path: Path, action: str, website_id: int) -> str:
+    """Digest of the selection state `action` reads from a shared workspace DB."""
+    if action in ("check_status", "download_results"):
+        sql = (
+            "SELECT id, COALESCE(tender_id,''), COALESCE(is_archived,0) FROM tenders "
+            "WHERE website_id=? AND COALESCE(is_downloaded,0)=1 ORDER BY id"
+        )
+    elif action == "fetch_tenders":
+        sql = (
+            "SELECT TRIM(COALESCE(name,'')) FROM organizations "
+            "WHERE website_id=? AND COALESCE(is_selected,0)=1 ORDER BY 1"
+        )
+    else:
+        return ""
+    conn = core.sqlite3.connect(str(db_path), timeout=10)
+    try:
+        rows = conn.execute(sql, (int(website_id),)).fetchall()
+    finally:
+        conn.close()
+    return _digest(json.dumps(rows))
+
+
 @contextmanager
 def _temporary_marked_tenders(db_path: Path, target_db_ids):
     ids = []
@@ -87,49 +171,25 @@ def _temporary_marked_tenders(db_path: Path, target_db_ids):
             conn.close()
 
 
-def _list_files_with_meta(root: Path) -> dict[str, tuple[int, int]]:
-    out: dict[str, tuple[int, int]] = {}
-    if not root.exists():
-        return out
-    for p in root.rglob("*"):
-        if not p.is_file():
-            continue
-        rel = str(p.relative_to(root)).replace("\\", "/")
-        st = p.stat()
-        out[rel] = (int(st.st_mtime_ns), int(st.st_size))
-    return out
+def _files_under(root: Path, prefix: str) -> list[str]:
+    base = root / prefix
+    if base.is_file():
+        return [prefix]
+    if not base.is_dir():
+        return []
+    return [p.relative_to(root).as_posix() for p in base.rglob("*") if p.is_file()]
 
 
-def _build_changed_artifact(
-    job_id: str,
-    before: dict[str, tuple[int, int]],
-    after: dict[str, tuple[int, int]],
+def _artifact_paths(
+    changed: list[str],
     download_root: Path,
-    db_path: Path,
-    artifact_dir: Path,
     force_include_prefixes: list[str] | None = None,
-) -> tuple[Path | None, int]:
-    changed = [rel for rel, meta in after.items() if before.get(rel) != meta]
+) -> list[str]:
     prefixes = [str(x or "").strip().replace("\\", "/").strip("/") for x in (force_include_prefixes or []) if str(x or "").strip()]
     if prefixes:
-        forced = [
-            rel for rel in after
-            if any(rel == prefix or rel.startswith(prefix + "/") for prefix in prefixes)
-        ]
+        forced = [rel for prefix in prefixes for rel in _files_under(download_root, prefix)]
         changed = sorted(set(changed).union(forced))
-    artifact_dir.mkdir(parents=True, exist_ok=True)
-    zip_path = artifact_dir / f"{job_id}.zip"
-    with zipfile.ZipFile(zip_path, "w", compression=zipfile.ZIP_DEFLATED) as zf:
-        for rel in changed:
-            abs_path = download_root / rel
-            if abs_path.exists() and abs_path.is_file():
-                zf.write(abs_path, arcname=rel)
-        # Always return a DB snapshot so frontend can sync local UI state.
-        if db_path.exists() and db_path.is_file():
-            zf.write(db_path, arcname="__state/tender_manager.db")
-    if not changed and (not db_path.exists()):
-        return None, 0
-    return zip_path, len(changed)
+    return changed
 
 
 @dataclass
@@ -146,10 +206,27 @@ class JobState:
     logs: list[str] = field(default_factory=list)
     captcha: dict[str, Any] | None = None
     pending_challenge_id: str | None = None
-    pending_answer: queue.Queue[str | None] = field(default_factory=queue.Queue)
     artifact_path: Path | None = None
-
-    def to_view(self) -> JobView:
+    coalesce_key: str | None = None
+    attached_requests: int = 0
+    finished_at: datetime | None = None
+    cancel_requested: bool = False
+    resume_from: str | None = None
+    batch_items: list[dict[str, Any]] | None = None
+    # Worker turns taken so far; a batch may give up its worker between items.
+    turns: int = 0
+    # Ephemeral workspace a batch keeps between turns.
+    workspace_lease: Path | None = None
+
+    def work_units(self) -> list[str]:
+        """Actions still to run: one per unfinished batch item, else the job's own action."""
+        if self.action != "batch":
+            return [self.action]
+        if self.batch_items is None:
+            return [str(item.get("action")) for item in self.payload.get("items") or []]
+        return [str(item.get("action")) for item in self.batch_items if item.get("status") == "queued"]
+
+    def to_view(self, queue_position: int | None = None, eta_seconds: float | None = None) -> JobView:
         return JobView(
             job_id=self.job_id,
             action=self.action,
@@ -161,27 +238,189 @@ class JobState:
             error=self.error,
             logs=self.logs[-400:],
             captcha=self.captcha,
+            attached_requests=self.attached_requests,
+            priority_class=priority_class(self.action),
+            queue_position=queue_position,
+            eta_seconds=eta_seconds,
+            cancel_requested=self.cancel_requested,
+            resume_from=self.resume_from,
+            batch_items=[dict(item) for item in self.batch_items] if self.batch_items is not None else None,
         )
 
 
 class JobManager:
-    def __init__(self, server_data_dir: str, captcha_timeout_seconds: int = 300) -> None:
+    def __init__(
+        self,
+        server_data_dir: str,
+        captcha_timeout_seconds: int = 300,
+        coalesce_window_seconds: int = 120,
+        workers: int = 1,
+        max_running_per_key: int = 1,
+        max_queued_per_key: int = 20,
+        catalogue_ttl_minutes: int = 60,
+        blob_reuse_minutes: int = 1440,
+        warm_workspaces: int = 2,
+        watch_downloads: bool = False,
+    ) -> None:
         self.server_data_dir = Path(server_data_dir).resolve()
         self.server_data_dir.mkdir(parents=True, exist_ok=True)
         self.captcha_timeout_seconds = int(captcha_timeout_seconds)
+        self.coalesce_window_seconds = max(0, int(coalesce_window_seconds))
+        self.captcha_broker = CaptchaBroker(timeout_seconds=self.captcha_timeout_seconds)
+        self.catalogue = TenderCatalogue(
+            self.server_data_dir / "_catalogue" / "catalogue.db",
+            ttl_minutes=catalogue_ttl_minutes,
+        )
+        # Public documents are stored once and hardlinked into every workspace that fetches them.
+        self.blob_store = DocumentBlobStore(
+            self.server_data_dir / "_blobs",
+            max_age_seconds=max(0, int(blob_reuse_minutes)) * 60,
+        )
+        core.document_blob_store = self.blob_store
+        self.blob_store.prune()
+        self.workspace_pool = WorkspacePool(
+            self.server_data_dir / "_ephemeral",
+            size=warm_workspaces,
+            on_reset=self.blob_store.prune,
+        )
+        self.watch_downloads = bool(watch_downloads)
+        # Shared workspaces whose schema is already current in this process.
+        self._initialised_dbs: set[str] = set()
         self._jobs: dict[str, JobState] = {}
+        self._job_by_key: dict[str, str] = {}
+        self._active_job_id: str | None = None
         self._lock = threading.Lock()
-        # app_core uses process-wide globals/queues, so keep one scraping job at a time.
+        # app_core uses process-wide globals/queues, so keep one scraping job at a time. A second
+        # worker would pop jobs it cannot start, breaking dispatch order and queue ETAs.
+        if int(workers) > 1:
+            raise ValueError("JOB_WORKERS must be 1: app_core state is process-wide, so jobs cannot run in parallel.")
         self._worker_lock = threading.Lock()
-
-    def create_job(self, action: JobAction, payload: dict[str, Any], build_artifact: bool) -> JobView:
-        job_id = str(uuid.uuid4())
-        st = JobState(job_id=job_id, action=action, payload=payload, build_artifact=build_artifact)
+        self._scheduler = JobScheduler(
+            workers=workers,
+            max_running_per_key=max_running_per_key,
+            max_queued_per_key=max_queued_per_key,
+        )
+        for i in range(self._scheduler.workers):
+            threading.Thread(target=self._worker_loop, name=f"job-worker-{i}", daemon=True).start()
+
+    def create_job(
+        self,
+        action: JobAction,
+        payload: dict[str, Any],
+        build_artifact: bool,
+        resume_from: str | None = None,
+    ) -> JobView:
+        """Queue a job, or return the identical job it coalesces with; raises JobQuotaExceeded,
+        or ValueError for a malformed request."""
+        if resume_from:
+            try:
+                resume_from = str(uuid.UUID(str(resume_from)))
+            except ValueError as exc:
+                raise ValueError("resume_from must be a job id.") from exc
+        # A resumed run is a continuation of specific earlier work, not a fresh crawl to share.
+        key = None if resume_from else _job_coalesce_key(action, payload, self._selection_fingerprint(action, payload))
         with self._lock:
-            self._jobs[job_id] = st
-        t = threading.Thread(target=self._run_job, args=(st,), daemon=True)
-        t.start()
-        return st.to_view()
+            job = self._coalescable_job(key, build_artifact) if key else None
+            if job is not None:
+                job.attached_requests += 1
+                attached = True
+            else:
+                job = JobState(
+                    job_id=str(uuid.uuid4()),
+                    action=action,
+                    payload=payload,
+                    build_artifact=build_artifact,
+                    coalesce_key=key,
+                    resume_from=resume_from,
+                )
+                self._scheduler.submit(job)
+                self._jobs[job.job_id] = job
+                if key:
+                    self._job_by_key[key] = job.job_id
+                attached = False
+        if attached:
+            self._append_log(job, f"Identical {action} request attached to this job.")
+        return self.job_view(job)
+
+    def create_batch(
+        self,
+        items: list[dict[str, Any]],
+        payload: dict[str, Any],
+        build_artifact: bool,
+        include_files: bool = True,
+        resume_from: str | None = None,
+    ) -> JobView:
+        """Queue several actions as one job: one workspace and one artifact.
+
+        `payload` holds the workspace-level options; raises ValueError for an empty, oversized
+        or nested batch and JobQuotaExceeded (each item counts as a queued job) like create_job.
+        """
+        if not items:
+            raise ValueError("A batch needs at least one item.")
+        if len(items) > MAX_BATCH_ITEMS:
+            raise ValueError(f"A batch holds at most {MAX_BATCH_ITEMS} items.")
+        for item in items:
+            if item.get("action") == "batch":
+                raise ValueError("A batch cannot contain another batch.")
+        if resume_from:
+            try:
+                resume_from = str(uuid.UUID(str(resume_from)))
+            except ValueError as exc:
+                raise ValueError("resume_from must be a job id.") from exc
+        batch_payload = dict(payload)
+        batch_payload["items"] = [
+            {"action": str(item["action"]), "payload": dict(item.get("payload") or {})} for item in items
+        ]
+        if not include_files:
+            batch_payload["_artifact_state_only"] = True
+        view = self.create_job("batch", batch_payload, build_artifact, resume_from=resume_from)
+        job = self.get_job(view.job_id)
+        if job is not None:
+            with self._lock:
+                if job.batch_items is None:
+                    job.batch_items = [
+                        {"index": i, "action": item["action"], "status": "queued"}
+                        for i, item in enumerate(batch_payload["items"])
+                    ]
+            view = self.job_view(job)
+        return view
+
+    def _selection_fingerprint(self, action: str, payload: dict[str, Any]) -> str | None:
+        """Selection digest for the coalesce key; ephemeral jobs are covered by their snapshot."""
+        if action not in COALESCE_ACTIONS or payload.get("_ephemeral_workspace") or payload.get("db_snapshot_base64"):
+            return ""
+        if action == "fetch_tenders" and payload.get("selected_org_names"):
+            return ""
+        db_path = self.server_data_dir / _safe_key_fragment(str(payload.get("_api_key_id", ""))) / WORKSPACE_DB_NAME
+        if not db_path.exists():
+            return ""
+        try:
+            return _workspace_selection(db_path, action, int(payload["website_id"]))
+        except (KeyError, TypeError, ValueError, core.sqlite3.Error):
+            return None
+
+    def job_view(self, job: JobState) -> JobView:
+        position, eta = self._scheduler.placement(job.job_id) if job.status == "queued" else (None, None)
+        return job.to_view(queue_position=position, eta_seconds=eta)
+
+    def _coalescable_job(self, key: str, build_artifact: bool) -> JobState | None:
+        """Job with the same key that can answer a new request; caller holds self._lock."""
+        job = self._jobs.get(self._job_by_key.get(key, ""))
+        if job is None or job.cancel_requested:
+            return None
+        if job.status == "queued":
+            # The artifact decision is made after the action runs, so a queued job can still take it on.
+            job.build_artifact = job.build_artifact or build_artifact
+            return job
+        if job.status in COALESCE_ACTIVE_STATUSES:
+            return job if (job.build_artifact or not build_artifact) else None
+        if job.status != "completed" or job.finished_at is None:
+            return None
+        if (utcnow() - job.finished_at).total_seconds() > self.coalesce_window_seconds:
+            return None
+        if build_artifact and not (job.artifact_path and job.artifact_path.exists()):
+            return None
+        return job
 
     def get_job(self, job_id: str) -> JobState | None:
         with self._lock:
@@ -191,11 +430,80 @@ class JobManager:
         job = self.get_job(job_id)
         if not job:
             return False
+        return self.captcha_broker.answer(challenge_id, value, job_id=job_id) == "accepted"
+
+    def cancel_job(self, job_id: str, api_key_id: str | None = None) -> JobState | None:
+        """Stop a job: dropped if still queued, otherwise stopped at the next tender or page.
+
+        While identical requests are attached to the job, cancelling only detaches the caller
+        and the job keeps running for the others. Returns None for another key's job.
+        """
+        job = self.get_job(job_id)
+        if not job:
+            return None
+        if api_key_id is not None and str(job.payload.get("_api_key_id", "")) != str(api_key_id):
+            return None
         with self._lock:
-            if job.pending_challenge_id != challenge_id:
-                return False
-            job.pending_answer.put(value.strip())
-            return True
+            if job.status in ("completed", "failed", "cancelled") or job.cancel_requested:
+                return job
+            detached = job.attached_requests > 0
+            if detached:
+                job.attached_requests -= 1
+                remaining = job.attached_requests + 1
+            else:
+                job.cancel_requested = True
+            active = self._active_job_id == job.job_id
+            challenge_id = job.pending_challenge_id
+        if detached:
+            self._append_log(job, f"A request detached; still running for {remaining} other request(s).")
+            return job
+        if self._scheduler.remove(job):
+            self._append_log(job, "Cancelled before it started." if job.turns == 0 else "Cancelled between batch items.")
+            with self._lock:
+                lease, job.workspace_lease = job.workspace_lease, None
+                if job.batch_items is not None:
+                    for item in job.batch_items:
+                        if item.get("status") == "queued":
+                            item["status"] = "cancelled"
+            if lease is not None:
+                self.workspace_pool.release(lease)
+            self._set_status(job, "cancelled")
+            return job
+        self._append_log(job, "Cancel requested; stopping at the next tender or page.")
+        if active:
+            core.request_scrape_cancel()
+        if challenge_id:
+            self.captcha_broker.answer(challenge_id, "", job_id=job.job_id)
+        return job
+
+    def _checkpoint_dir(self, job: JobState) -> Path:
+        path = self.server_data_dir / "_checkpoints" / _safe_key_fragment(str(job.payload.get("_api_key_id", "")))
+        path.mkdir(parents=True, exist_ok=True)
+        return path
+
+    def _open_checkpoint(self, job: JobState, ephemeral_workspace: bool, part: str | None = None) -> Any:
+        """Checkpoint for the job; a batch opens one per item (`part`), resumed item by item."""
+        ckpt_dir = self._checkpoint_dir(job)
+        suffix = f".{part}.jsonl" if part is not None else ".jsonl"
+        done: frozenset[str] = frozenset()
+        if job.resume_from:
+            prev = ckpt_dir / f"{job.resume_from}{suffix}"
+            if not prev.exists():
+                self._append_log(job, f"No checkpoint for job {job.resume_from}; starting from the beginning.")
+            elif ephemeral_workspace and not (ckpt_dir / f"{job.resume_from}.delivered").exists():
+                # Its workspace is gone and its files never reached the client.
+                self._append_log(job, f"Job {job.resume_from} never delivered its files; starting from the beginning.")
+            else:
+                done = core.ScrapeCheckpoint(str(prev)).done
+                self._append_log(job, f"Resuming from job {job.resume_from}: {len(done)} item(s) already finished.")
+        return core.ScrapeCheckpoint(str(ckpt_dir / f"{job.job_id}{suffix}"), done=done)
+
+    def mark_delivered(self, job_id: str) -> None:
+        """Record that a client received the whole artifact; resume_from of an ephemeral job
+        only skips checkpointed work once its files reached the client."""
+        job = self.get_job(job_id)
+        if job is not None:
+            (self._checkpoint_dir(job) / f"{job.job_id}.delivered").touch()
 
     def get_artifact_path(self, job_id: str) -> Path | None:
         job = self.get_job(job_id)
@@ -203,45 +511,86 @@ class JobManager:
             return None
         return job.artifact_path
 
-    def _run_job(self, job: JobState) -> None:
+    def _worker_loop(self) -> None:
+        while True:
+            job = self._scheduler.next_job()
+            yielded = False
+            try:
+                yielded = self._run_job(job)
+            finally:
+                # Batch items record their own durations.
+                self._scheduler.finished(job, record_duration=job.action != "batch")
+            if yielded:
+                self._scheduler.requeue(job)
+
+    def _run_job(self, job: JobState) -> bool:
+        """Run one worker turn of the job; True when a batch stopped early to let other jobs run."""
+        yielded = False
         bridge_stop: threading.Event | None = None
         log_stop: threading.Event | None = None
         bridge: threading.Thread | None = None
         log_thread: threading.Thread | None = None
         ephemeral_workspace = False
         user_root: Path | None = None
+        watcher: DownloadWatcher | None = None
         try:
             with self._worker_lock:
+                core.reset_scrape_cancel()
+                with self._lock:
+                    self._active_job_id = job.job_id
+                    cancelled_early = job.cancel_requested
+                if cancelled_early:
+                    with self._lock:
+                        for item in job.batch_items or []:
+                            if item.get("status") == "queued":
+                                item["status"] = "cancelled"
+                    self._set_status(job, "cancelled")
+                    return False
                 self._set_status(job, "running")
+                first_turn = job.turns == 0
+                job.turns += 1
                 ephemeral_workspace = bool(job.payload.get("_ephemeral_workspace"))
                 if ephemeral_workspace:
-                    user_root = (self.server_data_dir / "_ephemeral" / job.job_id).resolve()
+                    user_root = job.workspace_lease or self.workspace_pool.acquire()
+                    job.workspace_lease = user_root
                 else:
                     user_root = self.server_data_dir / _safe_key_fragment(str(job.payload.get("_api_key_id", "")))
-                user_db = user_root / "tender_manager.db"
+                user_db = user_root / WORKSPACE_DB_NAME
                 user_projects = user_root / "projects"
                 user_downloads = user_root / "downloads"
                 user_templates = user_root / "templates"
-                for p in (user_projects, user_downloads, user_templates):
-                    p.mkdir(parents=True, exist_ok=True)
-
-                core.save_app_paths_config(
-                    db_file=str(user_db),
-                    root_folder=str(user_projects),
-                    download_folder=str(user_downloads),
-                    template_folder=str(user_templates),
-                )
+                if not ephemeral_workspace:
+                    for p in (user_projects, user_downloads, user_templates):
+                        p.mkdir(parents=True, exist_ok=True)
+
+                # app_paths.json is only read at import, so the job just points the globals here.
                 core.DB_FILE = str(user_db)
                 core.ROOT_FOLDER = str(user_projects)
                 core.BASE_DOWNLOAD_DIRECTORY = str(user_downloads)
                 core.TEMPLATE_LIBRARY_FOLDER = str(user_templates)
-                incoming_db_b64 = str(job.payload.get("db_snapshot_base64") or "").strip()
+                # Warm browsers are only shared between jobs of the same key.
+                core.driver_pool_scope = str(job.payload.get("_api_key_id", ""))
+                # Later turns of a batch continue from the database its earlier items left behind.
+                incoming_db_b64 = str(job.payload.get("db_snapshot_base64") or "").strip() if first_turn else ""
                 if incoming_db_b64:
                     raw_db = base64.b64decode(incoming_db_b64.encode("ascii"))
                     user_db.write_bytes(raw_db)
-                core.init_db()
-
-                before = _list_files_with_meta(user_downloads)
+                    self._initialised_dbs.discard(str(user_db))
+                # Pool workspaces start from an initialised template.
+                if not ephemeral_workspace or incoming_db_b64:
+                    if str(user_db) not in self._initialised_dbs or not user_db.exists():
+                        core.init_db()
+                        if not ephemeral_workspace:
+                            self._initialised_dbs.add(str(user_db))
+
+                # The artifact is built from what this job journals, not from a walk of the download tree.
+                journal = DownloadJournal(user_root / "download_journal.db", user_downloads, job.job_id)
+                core.download_journal = journal
+                if self.watch_downloads:
+                    watcher = DownloadWatcher(journal)
+                    if not watcher.start():
+                        watcher = None
+                        self._append_log(job, "Download watcher unavailable (watchdog not installed).")
                 bridge_stop = threading.Event()
                 bridge = threading.Thread(
                     target=self._captcha_bridge_worker,
@@ -254,20 +603,35 @@ class JobManager:
                 log_thread = threading.Thread(target=self._log_pump_worker, args=(job, log_stop), daemon=True)
                 log_thread.start()
 
-                self._execute_action(job)
-                after = _list_files_with_meta(user_downloads)
+                if job.action == "batch":
+                    yielded = self._run_batch(job, ephemeral_workspace)
+                    if yielded:
+                        self._set_status(job, "queued")
+                        return True
+                else:
+                    checkpoint = self._open_checkpoint(job, ephemeral_workspace)
+                    self._execute_action(job, checkpoint)
+                if watcher is not None:
+                    watcher.stop()
                 changed_count = 0
                 if job.build_artifact:
                     artifact_dir = (self.server_data_dir / "_ephemeral_artifacts").resolve() if ephemeral_workspace else (user_root / "artifacts")
                     force_prefixes = job.payload.get("_artifact_include_prefixes") or []
-                    artifact, changed_count = _build_changed_artifact(
+                    if job.payload.get("_artifact_state_only"):
+                        # The client already has the documents (shared workspace); it only needs the DB.
+                        changed = []
+                    else:
+                        changed = _artifact_paths(
+                            journal.changed_paths(),
+                            user_downloads,
+                            force_include_prefixes=force_prefixes if isinstance(force_prefixes, list) else None,
+                        )
+                    artifact, changed_count = stage_artifact(
                         job_id=job.job_id,
-                        before=before,
-                        after=after,
+                        changed=changed,
                         download_root=user_downloads,
                         db_path=user_db,
                         artifact_dir=artifact_dir,
-                        force_include_prefixes=force_prefixes if isinstance(force_prefixes, list) else None,
                     )
                     job.artifact_path = artifact
 
@@ -277,12 +641,21 @@ class JobManager:
                     "changed_files": changed_count,
                     "artifact_available": bool(job.artifact_path and job.artifact_path.exists()),
                 }
-                self._set_status(job, "completed")
+                if job.batch_items is not None:
+                    with self._lock:
+                        statuses = [str(item.get("status")) for item in job.batch_items]
+                    job.result["batch"] = {
+                        status: statuses.count(status) for status in ("completed", "failed", "cancelled")
+                    }
+                self._set_status(job, "cancelled" if job.cancel_requested else "completed")
         except Exception as exc:
             job.error = str(exc)
             self._append_log(job, f"Job failed: {exc}")
             self._set_status(job, "failed")
         finally:
+            core.download_journal = None
+            if watcher is not None:
+                watcher.stop()
             if bridge_stop is not None:
                 bridge_stop.set()
             if log_stop is not None:
@@ -291,16 +664,85 @@ class JobManager:
                 bridge.join(timeout=1.5)
             if log_thread is not None:
                 log_thread.join(timeout=1.5)
-            if ephemeral_workspace and user_root is not None:
-                shutil.rmtree(user_root, ignore_errors=True)
+            if job.workspace_lease is not None and not yielded:
+                self.workspace_pool.release(job.workspace_lease)
+                job.workspace_lease = None
             with self._lock:
                 job.pending_challenge_id = None
                 job.captcha = None
+                if self._active_job_id == job.job_id:
+                    self._active_job_id = None
+        return yielded
+
+    def _run_batch(self, job: JobState, ephemeral_workspace: bool) -> bool:
+        """Run a batch's pending items back to back in the current workspace.
+
+        Warm browsers in `core.driver_pool` and the HTTP session carry over from one item to
+        the next. Between items the batch gives up its worker (returns True) when another
+        key's job or a higher-priority job is waiting; it is requeued and continues with the
+        next item, in the same workspace, on its next turn. A failed item is recorded and
+        the rest still run; the batch fails only when every item did.
+        """
+        items = list(job.payload.get("items") or [])
+        with self._lock:
+            if job.batch_items is None:
+                job.batch_items = [
+                    {"index": i, "action": str(item.get("action")), "status": "queued"} for i, item in enumerate(items)
+                ]
+        for i, item in enumerate(items):
+            progress = job.batch_items[i]
+            if progress.get("status") != "queued":
+                continue
+            if job.cancel_requested:
+                with self._lock:
+                    progress["status"] = "cancelled"
+                continue
+            action = str(item.get("action"))
+            item_payload = dict(item.get("payload") or {})
+            item_payload["_api_key_id"] = job.payload.get("_api_key_id", "")
+            # Same logs list, so the item's messages land in the batch job.
+            item_job = replace(job, action=action, payload=item_payload, batch_items=None)
+            with self._lock:
+                progress["status"] = "running"
+                job.updated_at = utcnow()
+            self._append_log(job, f"Batch item {i + 1}/{len(items)}: {action}.")
+            started = time.monotonic()
+            try:
+                self._execute_action(item_job, self._open_checkpoint(item_job, ephemeral_workspace, part=str(i)))
+            except Exception as exc:
+                self._append_log(job, f"Batch item {i + 1} failed: {exc}")
+                status_txt, error = "failed", str(exc)
+            else:
+                status_txt, error = ("cancelled" if job.cancel_requested else "completed"), None
+            seconds = time.monotonic() - started
+            self._scheduler.record_duration(action, seconds)
+            prefixes = item_job.payload.get("_artifact_include_prefixes")
+            if isinstance(prefixes, list):
+                job.payload.setdefault("_artifact_include_prefixes", []).extend(prefixes)
+            with self._lock:
+                progress["status"] = status_txt
+                progress["seconds"] = round(seconds, 1)
+                if error:
+                    progress["error"] = error
+                job.updated_at = utcnow()
+                pending = sum(1 for p in job.batch_items if p.get("status") == "queued")
+            if pending and not job.cancel_requested and self._scheduler.contended(job):
+                self._append_log(
+                    job, f"Batch paused after item {i + 1}/{len(items)} so other jobs can run; {pending} item(s) left."
+                )
+                return True
+        with self._lock:
+            failures = sum(1 for p in job.batch_items if p.get("status") == "failed")
+        if items and failures == len(items):
+            raise RuntimeError(f"All {failures} batch item(s) failed.")
+        return False
 
     def _set_status(self, job: JobState, status_txt: str) -> None:
         with self._lock:
             job.status = status_txt
             job.updated_at = utcnow()
+            if status_txt in ("completed", "failed"):
+                job.finished_at = job.updated_at
 
     def _append_log(self, job: JobState, text: str) -> None:
         with self._lock:
@@ -322,31 +764,28 @@ class JobManager:
                 img_data = core.captcha_req_queue.get(timeout=0.2)
             except queue.Empty:
                 continue
-            challenge_id = str(uuid.uuid4())
-            expires_at = (utcnow() + timedelta(seconds=self.captcha_timeout_seconds)).isoformat()
-            image_b64 = base64.b64encode(img_data).decode("ascii")
+            ticket = self.captcha_broker.open(
+                job_id=job.job_id,
+                api_key_id=str(job.payload.get("_api_key_id", "")),
+                action=job.action,
+                image=img_data,
+                priority=captcha_priority(job.action, job.payload),
+            )
             with self._lock:
-                job.pending_challenge_id = challenge_id
+                job.pending_challenge_id = ticket.challenge_id
                 job.captcha = {
-                    "challenge_id": challenge_id,
-                    "image_base64": image_b64,
-                    "expires_at_utc": expires_at,
+                    "challenge_id": ticket.challenge_id,
+                    "image_base64": ticket.image_base64,
+                    "expires_at_utc": ticket.expires_at.isoformat(),
+                    "priority": ticket.priority,
                 }
                 job.status = "captcha_required"
                 job.updated_at = utcnow()
 
-            answer: str | None = None
-            deadline = utcnow() + timedelta(seconds=self.captcha_timeout_seconds)
-            while utcnow() < deadline and not stop_evt.is_set():
-                try:
-                    answer = job.pending_answer.get(timeout=0.25)
-                    break
-                except queue.Empty:
-                    continue
-
+            answer = self.captcha_broker.wait(ticket, stop_evt)
             if not answer:
                 core.captcha_res_queue.put(None)
-                self._append_log(job, "Captcha timed out or was cancelled.")
+                self._append_log(job, f"Captcha {ticket.outcome}.")
             else:
                 core.captcha_res_queue.put(answer)
                 self._append_log(job, "Captcha submitted by client.")
@@ -358,7 +797,38 @@ class JobManager:
                     job.status = "running"
                 job.updated_at = utcnow()
 
-    def _execute_action(self, job: JobState) -> None:
+    def _fetch_organisations(self, job: JobState, website_id: int, force_crawl: bool) -> None:
+        portal = self.catalogue.tenant_portal(core.DB_FILE, website_id)
+        if portal and not force_crawl and self.catalogue.organisations_fresh(portal):
+            count = self.catalogue.apply_organisations(portal, core.DB_FILE, website_id)
+            self._append_log(job, f"Organisations for {portal} served from the shared catalogue ({count}).")
+            return
+        if core.ScraperBackend.fetch_organisations_logic(website_id) and portal:
+            self.catalogue.publish_organisations(portal, core.DB_FILE, website_id)
+
+    def _fetch_tenders(self, job: JobState, website_id: int, force_crawl: bool, checkpoint: Any) -> None:
+        """Fill selected organisations from the catalogue where fresh; crawl and publish the rest."""
+        portal = self.catalogue.tenant_portal(core.DB_FILE, website_id)
+        selected = _selected_org_names(Path(core.DB_FILE), website_id)
+        fresh = set() if (force_crawl or not portal) else self.catalogue.fresh_org_names(portal, selected)
+        if fresh:
+            count = self.catalogue.apply_org_tenders(portal, core.DB_FILE, website_id, fresh)
+            self._append_log(
+                job, f"{len(fresh)} organisation(s) served from the shared catalogue ({count} tenders)."
+            )
+        stale = [name for name in selected if name not in fresh]
+        if not stale and selected:
+            return
+        if checkpoint is None:
+            checkpoint = core.ScrapeCheckpoint()
+        done_before = checkpoint.done
+        with _temporary_selected_orgs(Path(core.DB_FILE), website_id, stale):
+            core.ScraperBackend.fetch_tenders_logic(website_id, checkpoint=checkpoint)
+        crawled = [item[len("org:"):] for item in checkpoint.done - done_before if item.startswith("org:")]
+        if portal and crawled:
+            self.catalogue.publish_org_tenders(portal, core.DB_FILE, website_id, crawled)
+
+    def _execute_action(self, job: JobState, checkpoint: Any = None) -> None:
         payload = dict(job.payload)
         payload.pop("_api_key", None)
         action = job.action
@@ -366,7 +836,7 @@ class JobManager:
         if action == "sync_state":
             return
         if action == "fetch_organisations":
-            core.ScraperBackend.fetch_organisations_logic(int(payload["website_id"]))
+            self._fetch_organisations(job, int(payload["website_id"]), bool(payload.get("force_crawl")))
             return
         if action == "fetch_tenders":
             website_id = int(payload["website_id"])
@@ -375,7 +845,7 @@ class JobManager:
                 website_id,
                 payload.get("selected_org_names") or [],
             ):
-                core.ScraperBackend.fetch_tenders_logic(website_id)
+                self._fetch_tenders(job, website_id, bool(payload.get("force_crawl")), checkpoint)
             return
         if action == "download_tenders":
             target_ids = payload.get("target_db_ids")
@@ -401,15 +871,17 @@ class JobManager:
                     int(payload["website_id"]),
                     target_db_ids=target_ids,
                     forced_mode=forced_mode,
+                    checkpoint=checkpoint,
                 )
             return
         if action == "download_results":
-            core.ScraperBackend.download_tender_results_logic(int(payload["website_id"]))
+            core.ScraperBackend.download_tender_results_logic(int(payload["website_id"]), checkpoint=checkpoint)
             return
         if action == "check_status":
             core.ScraperBackend.check_tender_status_logic(
                 int(payload["website_id"]),
                 archived_only=bool(payload.get("archived_only", False)),
+                force=bool(payload.get("force", False)),
             )
             return
         if action == "archive_completed":
@@ -420,6 +892,7 @@ class JobManager:
             for sid in target_ids:
                 total += int(core.ScraperBackend.archive_completed_tenders_logic(int(sid)) or 0)
             core.ScraperBackend.set_setting("last_auto_archive_utc", datetime.now(timezone.utc).isoformat())
+            core.optimize_db()
             core.ScraperBackend.log_auto_archive_run(
                 status="success",
                 archived_count=total,
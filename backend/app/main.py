@@ -6,16 +6,29 @@ import shutil
 import time
 from datetime import datetime, timezone
 from pathlib import Path
+from typing import Iterator
 
 from dotenv import load_dotenv
 from fastapi import Depends, FastAPI, HTTPException, Request
-from fastapi.responses import FileResponse
-
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import Response, StreamingResponse
+
+from .artifacts import (
+    artifact_etag,
+    cached_zip_path,
+    ensure_cached_zip,
+    iter_file_range,
+    parse_byte_range,
+    stream_and_cache,
+)
 from .auth import get_store, require_admin_key, require_api_key
 from .job_manager import JobManager
+from .scheduler import JobQuotaExceeded
 from .models import (
     ApiKeyIssueRequest,
+    CaptchaBatchAnswerRequest,
     CaptchaSubmitRequest,
+    JobBatchCreateRequest,
     JobCreateRequest,
     JobView,
     StorageDeleteFolderRequest,
@@ -26,11 +39,33 @@ from .models import (
 load_dotenv()
 
 app = FastAPI(title="BidManager Backend", version="1.0.0")
+
+
+class ApiGZipMiddleware(GZipMiddleware):
+    """GZip for API responses; artifacts are zips already and are served by byte range."""
+
+    async def __call__(self, scope, receive, send) -> None:
+        if scope["type"] == "http" and scope["path"].endswith("/artifact"):
+            await self.app(scope, receive, send)
+            return
+        await super().__call__(scope, receive, send)
+
+
+app.add_middleware(ApiGZipMiddleware, minimum_size=1024)
+
 server_data_dir = os.getenv("SERVER_DATA_DIR", "./server_data")
 
 manager = JobManager(
     server_data_dir=server_data_dir,
     captcha_timeout_seconds=int(os.getenv("CAPTCHA_TIMEOUT_SECONDS", "300")),
+    coalesce_window_seconds=int(os.getenv("JOB_COALESCE_WINDOW_SECONDS", "120")),
+    workers=int(os.getenv("JOB_WORKERS", "1")),
+    max_running_per_key=int(os.getenv("JOB_MAX_RUNNING_PER_KEY", "1")),
+    max_queued_per_key=int(os.getenv("JOB_MAX_QUEUED_PER_KEY", "20")),
+    catalogue_ttl_minutes=int(os.getenv("CATALOGUE_TTL_MINUTES", "60")),
+    blob_reuse_minutes=int(os.getenv("BLOB_REUSE_MINUTES", "1440")),
+    warm_workspaces=int(os.getenv("WARM_WORKSPACES", "2")),
+    watch_downloads=str(os.getenv("DOWNLOAD_WATCHER", "0")).strip().lower() in {"1", "true", "yes", "on"},
 )
 api_store = get_store()
 
@@ -116,6 +151,9 @@ def _storage_usage(root: Path) -> dict:
     file_count = 0
     dir_count = 0
     latest_mtime = None
+    # Stored documents are hardlinked into download folders; each inode counts once on disk.
+    inodes: set[tuple[int, int]] = set()
+    deduplicated_bytes = 0
     for current_root, dirs, files in os.walk(root):
         dir_count += len(dirs)
         for name in files:
@@ -127,9 +165,15 @@ def _storage_usage(root: Path) -> dict:
             file_count += 1
             total_bytes += int(stat.st_size)
             latest_mtime = max(latest_mtime or stat.st_mtime, stat.st_mtime)
+            inode = (stat.st_dev, stat.st_ino)
+            if stat.st_nlink < 2 or inode not in inodes:
+                inodes.add(inode)
+                deduplicated_bytes += int(stat.st_size)
     return {
         "root": root.as_posix(),
         "total_bytes": total_bytes,
+        "logical_bytes": total_bytes,
+        "deduplicated_bytes": deduplicated_bytes,
         "file_count": file_count,
         "dir_count": dir_count,
         "latest_modified_utc": (
@@ -183,7 +227,17 @@ def health() -> dict[str, str]:
 def create_job(req: JobCreateRequest, api_key: dict = Depends(require_api_key)) -> JobView:
     payload = dict(req.payload or {})
     payload["_api_key_id"] = str(api_key.get("key_id") or "")
-    return manager.create_job(action=req.action, payload=payload, build_artifact=req.build_artifact)
+    try:
+        return manager.create_job(
+            action=req.action,
+            payload=payload,
+            build_artifact=req.build_artifact,
+            resume_from=req.resume_from,
+        )
+    except JobQuotaExceeded as exc:
+        raise HTTPException(status_code=429, detail=str(exc)) from exc
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc)) from exc
 
 
 @app.get("/v1/jobs/{job_id}", response_model=JobView)
@@ -191,7 +245,43 @@ def get_job(job_id: str, _: dict = Depends(require_api_key)) -> JobView:
     job = manager.get_job(job_id)
     if not job:
         raise HTTPException(status_code=404, detail="Job not found.")
-    return job.to_view()
+    return manager.job_view(job)
+
+
+@app.post("/v1/job-batches", response_model=JobView)
+def create_job_batch(req: JobBatchCreateRequest, api_key: dict = Depends(require_api_key)) -> JobView:
+    """One queued job running every item in a single workspace; poll, cancel and fetch its
+    artifact through the usual /v1/jobs/{job_id} routes."""
+    payload = dict(req.payload or {})
+    payload["_api_key_id"] = str(api_key.get("key_id") or "")
+    try:
+        return manager.create_batch(
+            items=[item.model_dump() for item in req.items],
+            payload=payload,
+            build_artifact=req.build_artifact,
+            include_files=req.include_files,
+            resume_from=req.resume_from,
+        )
+    except JobQuotaExceeded as exc:
+        raise HTTPException(status_code=429, detail=str(exc)) from exc
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc)) from exc
+
+
+@app.get("/v1/job-batches/{job_id}", response_model=JobView)
+def get_job_batch(job_id: str, _: dict = Depends(require_api_key)) -> JobView:
+    job = manager.get_job(job_id)
+    if not job or job.action != "batch":
+        raise HTTPException(status_code=404, detail="Batch not found.")
+    return manager.job_view(job)
+
+
+@app.post("/v1/jobs/{job_id}/cancel", response_model=JobView)
+def cancel_job(job_id: str, api_key: dict = Depends(require_api_key)) -> JobView:
+    job = manager.cancel_job(job_id, api_key_id=str(api_key.get("key_id") or ""))
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found.")
+    return manager.job_view(job)
 
 
 @app.post("/v1/jobs/{job_id}/captcha")
@@ -202,18 +292,90 @@ def submit_captcha(job_id: str, req: CaptchaSubmitRequest, _: dict = Depends(req
     return {"accepted": True}
 
 
+@app.get("/v1/captchas")
+def list_captchas(api_key: dict = Depends(require_api_key)) -> dict:
+    items = manager.captcha_broker.pending(str(api_key.get("key_id") or ""))
+    return {"items": items, "server_time_utc": datetime.now(timezone.utc).isoformat()}
+
+
+@app.post("/v1/captchas/answers")
+def answer_captchas(req: CaptchaBatchAnswerRequest, api_key: dict = Depends(require_api_key)) -> dict:
+    results = manager.captcha_broker.answer_many(
+        str(api_key.get("key_id") or ""),
+        [(a.challenge_id, a.value) for a in req.answers],
+    )
+    return {"results": results, "accepted": sum(1 for r in results.values() if r == "accepted")}
+
+
+@app.get("/v1/captchas/metrics")
+def captcha_metrics(api_key: dict = Depends(require_api_key)) -> dict:
+    return {"metrics": manager.captcha_broker.metrics(str(api_key.get("key_id") or ""))}
+
+
+@app.get("/v1/admin/captchas/metrics")
+def admin_captcha_metrics(_: None = Depends(require_admin_key)) -> dict:
+    return {"metrics": manager.captcha_broker.metrics()}
+
+
 @app.get("/v1/jobs/{job_id}/artifact")
-def download_artifact(job_id: str, _: dict = Depends(require_api_key)) -> FileResponse:
+def download_artifact(job_id: str, request: Request, _: dict = Depends(require_api_key)) -> Response:
     artifact = manager.get_artifact_path(job_id)
     if not artifact or not artifact.exists():
         raise HTTPException(status_code=404, detail="Artifact not found for this job.")
-    return FileResponse(
-        path=Path(artifact),
-        media_type="application/zip",
-        filename=f"{job_id}.zip",
+    staging = Path(artifact)
+    etag = artifact_etag(staging)
+    headers = {
+        "ETag": etag,
+        "Accept-Ranges": "bytes",
+        "Content-Disposition": f'attachment; filename="{job_id}.zip"',
+    }
+    range_header = request.headers.get("range")
+    if_range = request.headers.get("if-range")
+    if range_header and (not if_range or if_range.strip() == etag):
+        # A resume needs the finished bytes; the rebuild is identical to what was streamed before.
+        cached = ensure_cached_zip(staging)
+        size = cached.stat().st_size
+        try:
+            span = parse_byte_range(range_header, size)
+        except ValueError:
+            # Multi-range and malformed headers are ignored, as RFC 9110 allows: full body below.
+            span = (0, size - 1)
+        if span is None:
+            return Response(status_code=416, headers={**headers, "Content-Range": f"bytes */{size}"})
+        start, end = span
+        if (start, end) != (0, size - 1):
+            chunks = iter_file_range(cached, start, end)
+            return StreamingResponse(
+                _delivered_when_done(chunks, job_id) if end == size - 1 else chunks,
+                status_code=206,
+                media_type="application/zip",
+                headers={
+                    **headers,
+                    "Content-Range": f"bytes {start}-{end}/{size}",
+                    "Content-Length": str(end - start + 1),
+                },
+            )
+    cached = cached_zip_path(staging)
+    if cached.exists():
+        size = cached.stat().st_size
+        return StreamingResponse(
+            _delivered_when_done(iter_file_range(cached, 0, size - 1), job_id),
+            media_type="application/zip",
+            headers={**headers, "Content-Length": str(size)},
+        )
+    # First download: the zip is built while it is sent, and kept for later requests.
+    return StreamingResponse(
+        _delivered_when_done(stream_and_cache(staging), job_id), media_type="application/zip", headers=headers
     )
 
 
+def _delivered_when_done(chunks: Iterator[bytes], job_id: str) -> Iterator[bytes]:
+    """Pass chunks through and mark the job delivered once the last byte has been sent;
+    a client that disconnects closes the generator before that."""
+    yield from chunks
+    manager.mark_delivered(job_id)
+
+
 @app.get("/v1/admin/keys")
 def list_api_keys(_: None = Depends(require_admin_key)) -> dict:
     return {"items": api_store.list_keys()}
@@ -244,6 +406,7 @@ def revoke_api_key(key_id: str, _: None = Depends(require_admin_key)) -> dict:
 def admin_storage_usage(_: None = Depends(require_admin_key)) -> dict:
     root = _server_root()
     usage = _storage_usage(root)
+    usage["document_store"] = manager.blob_store.stats()
     return {"usage": usage}
 
 
@@ -20,6 +20,7 @@ JobAction = Literal[
     "archive_completed",
     "single_download",
     "deliver_tender_docs",
+    "batch",
 ]
 
 
@@ -27,6 +28,27 @@ class JobCreateRequest(BaseModel):
     action: JobAction
     payload: dict[str, Any] = Field(default_factory=dict)
     build_artifact: bool = True
+    # Job id of an earlier run of the same work; items it finished are skipped.
+    resume_from: str | None = None
+
+
+# Each item also counts against JOB_MAX_QUEUED_PER_KEY (default 20).
+MAX_BATCH_ITEMS = 20
+
+
+class JobBatchItem(BaseModel):
+    action: JobAction
+    payload: dict[str, Any] = Field(default_factory=dict)
+
+
+class JobBatchCreateRequest(BaseModel):
+    items: list[JobBatchItem] = Field(min_length=1, max_length=MAX_BATCH_ITEMS)
+    # Workspace-level options shared by every item (db_snapshot_base64, _ephemeral_workspace).
+    payload: dict[str, Any] = Field(default_factory=dict)
+    build_artifact: bool = True
+    # False: the artifact carries only the state DB, not the documents the items downloaded.
+    include_files: bool = True
+    resume_from: str | None = None
 
 
 class CaptchaSubmitRequest(BaseModel):
@@ -34,6 +56,10 @@ class CaptchaSubmitRequest(BaseModel):
     value: str
 
 
+class CaptchaBatchAnswerRequest(BaseModel):
+    answers: list[CaptchaSubmitRequest] = Field(default_factory=list)
+
+
 class ApiKeyIssueRequest(BaseModel):
     label: str = "client"
 
@@ -55,7 +81,7 @@ class StorageDeleteOlderRequest(BaseModel):
 class JobView(BaseModel):
     job_id: str
     action: JobAction
-    status: Literal["queued", "running", "captcha_required", "completed", "failed"]
+    status: Literal["queued", "running", "captcha_required", "completed", "failed", "cancelled"]
     created_at: datetime
     updated_at: datetime
     payload: dict[str, Any]
@@ -63,3 +89,11 @@ class JobView(BaseModel):
     error: str | None = None
     logs: list[str] = Field(default_factory=list)
     captcha: dict[str, Any] | None = None
+    attached_requests: int = 0
+    priority_class: str = "bulk"
+    queue_position: int | None = None
+    eta_seconds: float | None = None
+    cancel_requested: bool = False
+    resume_from: str | None = None
+    # Per-item progress of a batch job.
+    batch_items: list[dict[str, Any]] | None = None
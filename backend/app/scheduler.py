@@ -0,0 +1,186 @@
+from __future__ import annotations
+
+import threading
+import time
+from collections import OrderedDict, deque
+from typing import Any
+
+# Lower class runs first. Interactive actions are ones a person is waiting on; maintenance can
+# always wait for the next gap.
+PRIORITY_CLASSES = ("interactive", "bulk", "maintenance")
+ACTION_PRIORITY_CLASS = {
+    "single_download": "interactive",
+    "deliver_tender_docs": "interactive",
+    "sync_state": "interactive",
+    "fetch_organisations": "bulk",
+    "fetch_tenders": "bulk",
+    "download_tenders": "bulk",
+    "download_results": "bulk",
+    "check_status": "bulk",
+    "batch": "bulk",
+    "archive_completed": "maintenance",
+}
+DEFAULT_JOB_SECONDS = 120.0
+DURATION_SMOOTHING = 0.3
+
+
+class JobQuotaExceeded(Exception):
+    pass
+
+
+def priority_class(action: str) -> str:
+    return ACTION_PRIORITY_CLASS.get(str(action), "bulk")
+
+
+class JobScheduler:
+    """Priority classes first, then round-robin across API keys, FIFO within a key.
+
+    Jobs are any objects with `job_id`, `action` and `payload["_api_key_id"]`. A job that runs
+    several actions (a batch) also has `work_units()`, the actions it still has to run; each one
+    counts against the queue quota and the ETA on its own.
+    """
+
+    def __init__(self, workers: int = 1, max_running_per_key: int = 1, max_queued_per_key: int = 20) -> None:
+        self.workers = max(1, int(workers))
+        self.max_running_per_key = max(1, int(max_running_per_key))
+        self.max_queued_per_key = max(1, int(max_queued_per_key))
+        self._cond = threading.Condition()
+        # class -> OrderedDict(api_key -> deque of jobs); the key served last moves to the end.
+        self._queues: dict[str, OrderedDict[str, deque[Any]]] = {c: OrderedDict() for c in PRIORITY_CLASSES}
+        self._running: dict[str, tuple[Any, float]] = {}
+        self._running_per_key: dict[str, int] = {}
+        self._avg_seconds: dict[str, float] = {}
+
+    @staticmethod
+    def _key(job: Any) -> str:
+        return str((job.payload or {}).get("_api_key_id", ""))
+
+    @staticmethod
+    def _units(job: Any) -> list[str]:
+        units = getattr(job, "work_units", None)
+        return list(units()) if callable(units) else [job.action]
+
+    def submit(self, job: Any) -> None:
+        key = self._key(job)
+        with self._cond:
+            queued = sum(len(self._units(j)) for q in self._queues.values() for j in q.get(key, ()))
+            if queued + len(self._units(job)) > self.max_queued_per_key:
+                raise JobQuotaExceeded(
+                    f"Too many queued jobs for this API key ({queued} queued, limit "
+                    f"{self.max_queued_per_key}); wait for some to finish."
+                )
+            self._queues[priority_class(job.action)].setdefault(key, deque()).append(job)
+            self._cond.notify()
+
+    def requeue(self, job: Any) -> None:
+        """Put back a job that gave up its worker part-way: first among its key's jobs, but its
+        key goes to the back of the round-robin."""
+        key = self._key(job)
+        with self._cond:
+            by_key = self._queues[priority_class(job.action)]
+            by_key.setdefault(key, deque()).appendleft(job)
+            by_key.move_to_end(key)
+            self._cond.notify()
+
+    def contended(self, job: Any) -> bool:
+        """True when a running job should give up its worker: another key's job in the same
+        class, or any job in a higher class, is waiting and allowed to start."""
+        key = self._key(job)
+        own_cls = priority_class(job.action)
+        with self._cond:
+            for cls in PRIORITY_CLASSES[: PRIORITY_CLASSES.index(own_cls) + 1]:
+                for other in self._queues[cls]:
+                    if cls == own_cls and other == key:
+                        continue
+                    running = self._running_per_key.get(other, 0) - (1 if other == key else 0)
+                    if running < self.max_running_per_key:
+                        return True
+        return False
+
+    def remove(self, job: Any) -> bool:
+        """Drop a job that has not started; False if it is no longer queued."""
+        key = self._key(job)
+        with self._cond:
+            by_key = self._queues[priority_class(job.action)]
+            if job not in by_key.get(key, ()):
+                return False
+            by_key[key].remove(job)
+            if not by_key[key]:
+                del by_key[key]
+            return True
+
+    def next_job(self) -> Any:
+        """Block until a job may start, and mark it running."""
+        with self._cond:
+            while True:
+                job = self._pop(self._queues, self._running_per_key)
+                if job is not None:
+                    key = self._key(job)
+                    self._running[job.job_id] = (job, time.monotonic())
+                    self._running_per_key[key] = self._running_per_key.get(key, 0) + 1
+                    return job
+                self._cond.wait()
+
+    def _pop(self, queues: dict[str, OrderedDict[str, deque[Any]]], running_per_key: dict[str, int]) -> Any:
+        for cls in PRIORITY_CLASSES:
+            by_key = queues[cls]
+            for key in list(by_key):
+                if running_per_key.get(key, 0) >= self.max_running_per_key:
+                    continue
+                job = by_key[key].popleft()
+                if by_key[key]:
+                    by_key.move_to_end(key)
+                else:
+                    del by_key[key]
+                return job
+        return None
+
+    def finished(self, job: Any, record_duration: bool = True) -> None:
+        """Free the job's worker; pass record_duration=False when its time was already recorded
+        per unit with record_duration()."""
+        with self._cond:
+            entry = self._running.pop(job.job_id, None)
+            if entry is None:
+                return
+            key = self._key(job)
+            self._running_per_key[key] = max(0, self._running_per_key.get(key, 0) - 1)
+            if record_duration:
+                self._record_locked(job.action, time.monotonic() - entry[1])
+            self._cond.notify_all()
+
+    def record_duration(self, action: str, seconds: float) -> None:
+        with self._cond:
+            self._record_locked(action, seconds)
+
+    def _record_locked(self, action: str, seconds: float) -> None:
+        prev = self._avg_seconds.get(action)
+        self._avg_seconds[action] = seconds if prev is None else prev + DURATION_SMOOTHING * (seconds - prev)
+
+    def expected_seconds(self, action: str) -> float:
+        return self._avg_seconds.get(action, DEFAULT_JOB_SECONDS)
+
+    def _job_seconds(self, job: Any) -> float:
+        return sum(self.expected_seconds(action) for action in self._units(job))
+
+    def placement(self, job_id: str) -> tuple[int | None, float | None]:
+        """1-based queue position and estimated seconds until start, or (None, None) if not queued."""
+        now = time.monotonic()
+        with self._cond:
+            queues = {cls: OrderedDict((k, deque(v)) for k, v in by_key.items()) for cls, by_key in self._queues.items()}
+            # Each worker frees up when its running job is expected to finish.
+            slots = sorted(
+                max(0.0, self._job_seconds(job) - (now - started))
+                for job, started in self._running.values()
+            )
+            slots = (slots + [0.0] * self.workers)[: self.workers]
+            position = 0
+            # Dispatch order ignoring per-key concurrency; close enough for an estimate.
+            while True:
+                job = self._pop(queues, {})
+                if job is None:
+                    return None, None
+                position += 1
+                slots.sort()
+                if job.job_id == job_id:
+                    return position, round(slots[0], 1)
+                slots[0] += self._job_seconds(job)
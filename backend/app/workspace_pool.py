@@ -0,0 +1,102 @@
+from __future__ import annotations
+
+import queue
+import shutil
+import sqlite3
+import threading
+import uuid
+from pathlib import Path
+from typing import Callable
+
+import app_core as core
+
+WORKSPACE_DB_NAME = "tender_manager.db"
+WORKSPACE_SUBDIRS = ("projects", "downloads", "templates")
+
+
+class WorkspacePool:
+    """Pre-initialised ephemeral workspaces, reset in the background after each job.
+
+    Every workspace starts from one template database built by `core.init_db()`; a
+    reset clears its folders and restores the template with SQLite's backup API
+    instead of rebuilding the schema.
+    """
+
+    def __init__(self, root: Path, size: int = 2, on_reset: Callable[[], None] | None = None) -> None:
+        self.root = Path(root).resolve()
+        self.size = max(0, int(size))
+        self.on_reset = on_reset
+        self.template_db = self.root / "_template.db"
+        self._ready: queue.Queue[Path] = queue.Queue()
+        self._dirty: queue.Queue[Path] = queue.Queue()
+        # Workspaces left behind by an earlier process are cleared before anything else.
+        if self.root.exists():
+            shutil.rmtree(self.root, ignore_errors=True)
+        self.root.mkdir(parents=True, exist_ok=True)
+        self._build_template()
+        for _ in range(self.size):
+            self._ready.put(self._prepare(self._new_path()))
+        threading.Thread(target=self._reset_loop, name="workspace-reset", daemon=True).start()
+
+    def _build_template(self) -> None:
+        # Only called before job workers start, so swapping core.DB_FILE here is safe.
+        previous = core.DB_FILE
+        core.DB_FILE = str(self.template_db)
+        try:
+            core.init_db()
+        finally:
+            core.DB_FILE = previous
+
+    def _new_path(self) -> Path:
+        return self.root / f"ws-{uuid.uuid4().hex[:12]}"
+
+    def _prepare(self, path: Path) -> Path:
+        for name in WORKSPACE_SUBDIRS:
+            sub = path / name
+            if sub.exists():
+                shutil.rmtree(sub, ignore_errors=True)
+            sub.mkdir(parents=True, exist_ok=True)
+        db_path = path / WORKSPACE_DB_NAME
+        for suffix in ("-wal", "-shm", "-journal"):
+            Path(f"{db_path}{suffix}").unlink(missing_ok=True)
+        src = sqlite3.connect(str(self.template_db))
+        dst = sqlite3.connect(str(db_path))
+        try:
+            src.backup(dst)
+        finally:
+            dst.close()
+            src.close()
+        return path
+
+    def acquire(self) -> Path:
+        """A clean workspace; prepared on the spot when none is waiting."""
+        try:
+            return self._ready.get_nowait()
+        except queue.Empty:
+            return self._prepare(self._new_path())
+
+    def release(self, path: Path) -> None:
+        """Hand a used workspace to the reset thread; returns immediately."""
+        self._dirty.put(Path(path))
+
+    def _reset_loop(self) -> None:
+        while True:
+            path = self._dirty.get()
+            try:
+                if self._ready.qsize() < self.size:
+                    for child in path.iterdir():
+                        if child.name not in WORKSPACE_SUBDIRS and child.name != WORKSPACE_DB_NAME:
+                            if child.is_dir():
+                                shutil.rmtree(child, ignore_errors=True)
+                            else:
+                                child.unlink(missing_ok=True)
+                    self._ready.put(self._prepare(path))
+                else:
+                    shutil.rmtree(path, ignore_errors=True)
+            except Exception:
+                shutil.rmtree(path, ignore_errors=True)
+            if self.on_reset is not None:
+                try:
+                    self.on_reset()
+                except Exception:
+                    pass
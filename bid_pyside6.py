@@ -8,7 +8,6 @@ import subprocess
 import sys
 import threading
 import tempfile
-import zipfile
 import base64
 import time
 import importlib
@@ -16,7 +15,7 @@ import textwrap
 from concurrent.futures import ThreadPoolExecutor
 import queue as py_queue
 
-from PySide6.QtCore import QByteArray, QDateTime, QEasingCurve, QEvent, QItemSelectionModel, QPoint, QPropertyAnimation, QRegularExpression, QTime, QTimer, Qt, Signal
+from PySide6.QtCore import QAbstractTableModel, QByteArray, QDateTime, QEasingCurve, QEvent, QItemSelectionModel, QModelIndex, QPoint, QPropertyAnimation, QRegularExpression, QSortFilterProxyModel, QTime, QTimer, Qt, Signal
 from PySide6.QtGui import QColor, QFont, QImage, QKeyEvent, QPainter, QPixmap, QPolygon, QRegularExpressionValidator
 from PySide6.QtWidgets import (
     QAbstractItemView,
@@ -45,6 +44,7 @@ from PySide6.QtWidgets import (
     QTabWidget,
     QSplitter,
     QTableWidget,
+    QTableView,
     QTableWidgetItem,
     QTextBrowser,
     QTextEdit,
@@ -59,9 +59,12 @@ from PySide6.QtWidgets import (
 
 import app_core as core
 from frontend.api_client import BidApiClient
+from frontend.remote_worker import extract_artifact
 from templates_ui import TemplatesPage, import_templates_into_project
 
 FRONTEND_REMOTE_ONLY = str(os.getenv("BID_FRONTEND_REMOTE_ONLY", "") or "").strip().lower() in {"1", "true", "yes", "on"}
+# Remote jobs post here when the backend has a captcha waiting; the main window opens the inbox.
+remote_captcha_notices = py_queue.Queue()
 
 
 class BackendModeScraperProxy:
@@ -72,9 +75,12 @@ class BackendModeScraperProxy:
         "downloaded_files",
         "auto_archive_runs",
     )
+    # The server's per-batch item limit (backend MAX_BATCH_ITEMS).
+    SERVER_BATCH_MAX_ITEMS = 20
 
     def __init__(self):
         self.local = core.ScraperBackend
+        self._stop_event = threading.Event()
 
     def _mode(self):
         if FRONTEND_REMOTE_ONLY:
@@ -94,6 +100,15 @@ class BackendModeScraperProxy:
     def is_remote_mode(self):
         return self._mode() == "remote"
 
+    def request_stop(self):
+        """Stop the running scraper task: the local scrape and any remote job it is waiting on."""
+        self._stop_event.set()
+        core.request_scrape_cancel()
+
+    def clear_stop(self):
+        self._stop_event.clear()
+        core.reset_scrape_cancel()
+
     def is_local_mode(self):
         return self._mode() != "remote"
 
@@ -122,6 +137,9 @@ class BackendModeScraperProxy:
                     table_name = str(row[0] or "").strip()
                     if not table_name or table_name in keep:
                         continue
+                    if table_name.startswith(core.TENDER_FTS_TABLE):
+                        # FTS index and shadow tables follow the kept tenders table.
+                        continue
                     try:
                         conn.execute(f'DELETE FROM "{table_name}"')
                     except Exception:
@@ -158,6 +176,9 @@ class BackendModeScraperProxy:
                         f'INSERT INTO "{table_name}" ({col_csv}) '
                         f'SELECT {col_csv} FROM {attach_name}."{table_name}"'
                     )
+                    if table_name == "tenders":
+                        # Download states were computed against the server's folders.
+                        dst_conn.execute("UPDATE tenders SET download_state_key=NULL")
                 dst_conn.commit()
             finally:
                 dst_conn.execute(f"DETACH DATABASE {attach_name}")
@@ -184,60 +205,75 @@ class BackendModeScraperProxy:
         return copied
 
     def _apply_remote_artifact(self, zip_path):
-        copied_download_files = 0
-        tmp_dir = tempfile.mkdtemp(prefix="bm_remote_")
+        # Documents stream straight into the download folder; only the state DB goes to a temp dir.
+        state_dir = tempfile.mkdtemp(prefix="bm_remote_state_")
         try:
-            with zipfile.ZipFile(zip_path, "r") as zf:
-                zf.extractall(tmp_dir)
-
-            state_db = os.path.join(tmp_dir, "__state", "tender_manager.db")
-            if os.path.isfile(state_db):
-                self._merge_remote_scraper_db(state_db)
-
-            for item in os.listdir(tmp_dir):
-                if item == "__state":
-                    continue
-                src = os.path.join(tmp_dir, item)
-                dst = os.path.join(core.BASE_DOWNLOAD_DIRECTORY, item)
-                if os.path.isdir(src):
-                    copied_download_files += self._merge_folder_tree(src, dst)
-                elif os.path.isfile(src):
-                    os.makedirs(core.BASE_DOWNLOAD_DIRECTORY, exist_ok=True)
-                    try:
-                        shutil.copy2(src, os.path.join(core.BASE_DOWNLOAD_DIRECTORY, item))
-                        copied_download_files += 1
-                    except Exception:
-                        pass
+            try:
+                os.makedirs(core.BASE_DOWNLOAD_DIRECTORY, exist_ok=True)
+                counts = extract_artifact(
+                    zip_path, core.BASE_DOWNLOAD_DIRECTORY, state_dir=state_dir, log=core.log_to_gui
+                )
+            finally:
+                # The state DB is extracted first, so it is merged even if a document failed.
+                state_db = os.path.join(state_dir, "tender_manager.db")
+                if os.path.isfile(state_db):
+                    self._merge_remote_scraper_db(state_db)
         finally:
-            shutil.rmtree(tmp_dir, ignore_errors=True)
-        return copied_download_files
+            shutil.rmtree(state_dir, ignore_errors=True)
+        if counts["skipped"]:
+            core.log_to_gui(f"Remote sync skipped {counts['skipped']} file(s) that could not be replaced.")
+        return counts["written"]
 
     def _run_remote_action(self, action, payload, sync_back=True):
         client = self._new_client()
         body = dict(payload or {})
         job = client.create_job(action=action, payload=body, build_artifact=bool(sync_back))
+        return self._await_remote_job(client, job, action, sync_back=sync_back)
+
+    def _await_remote_job(self, client, job, action, sync_back=True):
         job_id = str(job.get("job_id") or "")
         if not job_id:
             raise RuntimeError("Remote job creation failed.")
 
+        notified_challenge_id = ""
+        reported_position = None
+        reported_items = {}
+        cancel_sent = False
         while True:
+            if self._stop_event.is_set() and not cancel_sent:
+                cancel_sent = True
+                stopped = client.cancel_job(job_id)
+                if not stopped.get("cancel_requested") and str(stopped.get("status") or "") not in (
+                    "completed", "failed", "cancelled"
+                ):
+                    # Other identical requests share this job, so the server only detached this one.
+                    core.log_to_gui(f"Stop requested; left the shared {action} job running for other requests.")
+                    return False
+                core.log_to_gui(f"Stop requested; asked the server to stop the {action} job.")
             job = client.get_job(job_id)
             status = str(job.get("status") or "")
+            for item in job.get("batch_items") or []:
+                item_status = str(item.get("status") or "")
+                index = int(item.get("index") or 0)
+                if item_status not in ("queued", reported_items.get(index, "queued")):
+                    reported_items[index] = item_status
+                    detail = f": {item['error']}" if item.get("error") else "."
+                    core.log_to_gui(f"Remote batch item {index + 1} ({item.get('action')}) {item_status}{detail}")
             if status == "captcha_required":
                 cap = job.get("captcha") or {}
                 challenge_id = str(cap.get("challenge_id") or "")
-                image_b64 = str(cap.get("image_base64") or "")
-                if not challenge_id or not image_b64:
+                if not challenge_id:
                     raise RuntimeError("Remote captcha payload is invalid.")
-                img_data = base64.b64decode(image_b64.encode("ascii"))
-                core.captcha_req_queue.put(img_data)
-                answer = core.captcha_res_queue.get()
-                if not answer:
-                    raise RuntimeError("Captcha cancelled.")
-                client.submit_captcha(job_id=job_id, challenge_id=challenge_id, value=str(answer))
+                # Answered from the captcha inbox, which drains every job's captchas at once.
+                if challenge_id != notified_challenge_id:
+                    notified_challenge_id = challenge_id
+                    remote_captcha_notices.put(challenge_id)
+                time.sleep(1.0)
             elif status == "failed":
                 raise RuntimeError(str(job.get("error") or "Remote job failed."))
-            elif status == "completed":
+            elif status in ("completed", "cancelled"):
+                if status == "cancelled":
+                    core.log_to_gui(f"Remote {action} job stopped; syncing what it finished.")
                 result = job.get("result") or {}
                 if sync_back and bool(result.get("artifact_available")):
                     tmp_zip = os.path.join(tempfile.gettempdir(), f"bm_artifact_{job_id}.zip")
@@ -247,12 +283,18 @@ class BackendModeScraperProxy:
                         os.remove(tmp_zip)
                     except Exception:
                         pass
-                    if action in {"fetch_organisations", "fetch_tenders"}:
+                    if action in {"fetch_organisations", "fetch_tenders", "batch"}:
                         core.log_to_gui("Remote sync complete. Scraper data synced.")
                     else:
                         core.log_to_gui(f"Remote sync complete. Download files synced: {copied}")
                 return True
             else:
+                position = job.get("queue_position")
+                if status == "queued" and position and position != reported_position:
+                    reported_position = position
+                    eta = job.get("eta_seconds")
+                    eta_txt = f", about {int(eta // 60)} min {int(eta % 60)} s" if eta else ""
+                    core.log_to_gui(f"Remote {action} job queued at position {position}{eta_txt}.")
                 time.sleep(1.0)
 
     def _run_remote_ephemeral_action(self, action, payload, sync_back=True):
@@ -308,6 +350,18 @@ class BackendModeScraperProxy:
             return True
         return self._run_remote_action(action="sync_state", payload={}, sync_back=True)
 
+    def run_server_batch(self, items):
+        """Run (action, payload) pairs as server batch jobs, syncing the state DB after each one."""
+        if not items:
+            return True
+        client = self._new_client()
+        step = self.SERVER_BATCH_MAX_ITEMS
+        for start in range(0, len(items), step):
+            job = client.create_job_batch(items[start:start + step], build_artifact=True, include_files=False)
+            if not self._await_remote_job(client, job, "batch", sync_back=True):
+                return False
+        return True
+
     def push_local_state(self):
         if not self._remote_enabled():
             return True
@@ -351,17 +405,19 @@ class BackendModeScraperProxy:
             forced_mode=forced_mode,
         )
 
-    def check_tender_status_logic(self, website_id, archived_only=False):
+    def check_tender_status_logic(self, website_id, archived_only=False, force=False):
         if self._mode() == "remote":
             url, api_key = self._remote_config()
             if not url or not api_key:
                 raise RuntimeError("Remote backend is required. Configure Backend URL and API key in Settings.")
             return self._run_remote_ephemeral_action(
                 action="check_status",
-                payload={"website_id": int(website_id), "archived_only": bool(archived_only)},
+                payload={"website_id": int(website_id), "archived_only": bool(archived_only), "force": bool(force)},
                 sync_back=True,
             )
-        return self.local.check_tender_status_logic(int(website_id), archived_only=bool(archived_only))
+        return self.local.check_tender_status_logic(
+            int(website_id), archived_only=bool(archived_only), force=bool(force)
+        )
 
     def download_tender_results_logic(self, website_id):
         if self._mode() == "remote":
@@ -421,10 +477,10 @@ class BackendModeScraperProxy:
             sync_back=False,
         )
 
-    def check_tender_status_server(self, website_id, archived_only=False):
+    def check_tender_status_server(self, website_id, archived_only=False, force=False):
         return self._run_remote_action(
             action="check_status",
-            payload={"website_id": int(website_id), "archived_only": bool(archived_only)},
+            payload={"website_id": int(website_id), "archived_only": bool(archived_only), "force": bool(force)},
             sync_back=False,
         )
 
@@ -469,6 +525,9 @@ class BackendModeScraperProxy:
         return self._remote_download_to_folder(source_tender_id, destination_folder, "update")
 
 def auto_fit_table_rows(table, min_height=24, max_height=None):
+    if isinstance(table, RowTableView):
+        table.fit_visible_rows(min_height=min_height, max_height=max_height)
+        return
     table.resizeRowsToContents()
     for row in range(table.rowCount()):
         h = table.rowHeight(row)
@@ -478,6 +537,244 @@ def auto_fit_table_rows(table, min_height=24, max_height=None):
             table.setRowHeight(row, max_height)
 
 
+class RowTableModel(QAbstractTableModel):
+    """
+    Read-only model over a plain list of row tuples. Cells are rendered with str(),
+    so loading a table is one list assignment instead of a QTableWidgetItem per cell.
+    """
+
+    def __init__(self, headers, parent=None):
+        super().__init__(parent)
+        self._headers = list(headers)
+        self._rows = []
+        self._center_cols = frozenset()
+        self._fetch_more = None
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._rows)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._headers)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        if role == Qt.DisplayRole:
+            row = self._rows[index.row()]
+            col = index.column()
+            return str(row[col]) if col < len(row) else ""
+        if role == Qt.TextAlignmentRole and index.column() in self._center_cols:
+            return int(Qt.AlignCenter)
+        return None
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if role == Qt.DisplayRole and orientation == Qt.Horizontal and 0 <= section < len(self._headers):
+            return self._headers[section]
+        return super().headerData(section, orientation, role)
+
+    def set_rows(self, rows, center_cols=None, fetch_more=None):
+        """
+        Replace the rows. fetch_more, when given, is called as the view scrolls to the end
+        and returns (next_rows, has_more); it is dropped once has_more is False.
+        """
+        self.beginResetModel()
+        self._rows = [tuple(r) for r in rows]
+        self._center_cols = frozenset(center_cols or ())
+        self._fetch_more = fetch_more
+        self.endResetModel()
+
+    def clear(self):
+        self.set_rows([], self._center_cols)
+
+    def canFetchMore(self, parent=QModelIndex()):
+        return not parent.isValid() and self._fetch_more is not None
+
+    def fetchMore(self, parent=QModelIndex()):
+        if parent.isValid() or self._fetch_more is None:
+            return
+        rows, has_more = self._fetch_more()
+        if not has_more:
+            self._fetch_more = None
+        if not rows:
+            return
+        start = len(self._rows)
+        self.beginInsertRows(QModelIndex(), start, start + len(rows) - 1)
+        self._rows.extend(tuple(r) for r in rows)
+        self.endInsertRows()
+
+    def row_values(self, row):
+        return self._rows[row]
+
+    def set_cell(self, row, col, value):
+        if not (0 <= row < len(self._rows)) or not (0 <= col < len(self._headers)):
+            return
+        vals = list(self._rows[row])
+        vals.extend([""] * (col + 1 - len(vals)))
+        vals[col] = value
+        self._rows[row] = tuple(vals)
+        idx = self.index(row, col)
+        self.dataChanged.emit(idx, idx, [Qt.DisplayRole])
+
+    def update_column(self, col, updates_by_key, key_col):
+        """Set column `col` from updates_by_key[row[key_col]] in one pass and one dataChanged."""
+        changed = False
+        for i, row in enumerate(self._rows):
+            key = str(row[key_col] if key_col < len(row) else "").strip()
+            if key not in updates_by_key or col >= len(row):
+                continue
+            vals = list(row)
+            vals[col] = updates_by_key[key]
+            self._rows[i] = tuple(vals)
+            changed = True
+        if changed and self._rows:
+            self.dataChanged.emit(self.index(0, col), self.index(len(self._rows) - 1, col), [Qt.DisplayRole])
+
+
+class RowFilterProxyModel(QSortFilterProxyModel):
+    """
+    Filters RowTableModel rows with a Python predicate over the row tuple and,
+    when serial_col is set, numbers that column by visible position (the "Sr" column).
+    """
+
+    def __init__(self, serial_col=None, parent=None):
+        super().__init__(parent)
+        self._predicate = None
+        self._serial_col = serial_col
+
+    def set_predicate(self, predicate, invalidate=True):
+        self._predicate = predicate
+        if invalidate:
+            self.invalidateFilter()
+
+    def filterAcceptsRow(self, source_row, source_parent):
+        if self._predicate is None:
+            return True
+        return bool(self._predicate(self.sourceModel().row_values(source_row)))
+
+    def data(self, index, role=Qt.DisplayRole):
+        if role == Qt.DisplayRole and index.isValid() and index.column() == self._serial_col:
+            return str(index.row() + 1)
+        return super().data(index, role)
+
+
+class _RowCell:
+    """The text()/setText() subset of QTableWidgetItem, bound to one cell of a RowTableView."""
+
+    __slots__ = ("_view", "_row", "_col")
+
+    def __init__(self, view, row, col):
+        self._view = view
+        self._row = row
+        self._col = col
+
+    def text(self):
+        return str(self._view.model().index(self._row, self._col).data(Qt.DisplayRole) or "")
+
+    def setText(self, value):
+        self._view.set_cell_text(self._row, self._col, value)
+
+
+class RowTableView(QTableView):
+    """
+    QTableView over RowTableModel + RowFilterProxyModel. Keeps the small part of the
+    QTableWidget API the pages use (item/rowCount/setCurrentCell and the cell signals),
+    row indexes being view (filtered) rows. Row heights are fitted lazily, only for rows
+    scrolled into view, instead of resizeRowsToContents() over the whole table.
+    """
+
+    cellClicked = Signal(int, int)
+    cellDoubleClicked = Signal(int, int)
+    itemSelectionChanged = Signal()
+
+    def __init__(self, headers, serial_col=None, parent=None):
+        super().__init__(parent)
+        self._source = RowTableModel(headers, self)
+        self._proxy = RowFilterProxyModel(serial_col, self)
+        self._proxy.setSourceModel(self._source)
+        self.setModel(self._proxy)
+        self._row_fit = (24, None)
+        self._fitted_rows = set()
+        self._rowfit_timer = QTimer(self)
+        self._rowfit_timer.setSingleShot(True)
+        self._rowfit_timer.timeout.connect(self._fit_visible_rows)
+        self.clicked.connect(lambda idx: self.cellClicked.emit(idx.row(), idx.column()))
+        self.doubleClicked.connect(lambda idx: self.cellDoubleClicked.emit(idx.row(), idx.column()))
+        self.selectionModel().selectionChanged.connect(lambda *_args: self.itemSelectionChanged.emit())
+        self.verticalScrollBar().valueChanged.connect(lambda *_args: self._rowfit_timer.start(30))
+        for sig in (self._proxy.modelReset, self._proxy.layoutChanged, self._proxy.rowsInserted, self._proxy.rowsRemoved):
+            sig.connect(self._invalidate_row_fit)
+
+    def set_rows(self, rows, center_cols=None, predicate=None, fetch_more=None):
+        # Install the predicate before the reset so the proxy filters the new rows once.
+        self._proxy.set_predicate(predicate, invalidate=False)
+        self._source.set_rows(rows, center_cols, fetch_more=fetch_more)
+
+    def fetch_all(self):
+        """Pull every remaining page of a lazily fetched table (exports, Filters dialog)."""
+        while self._source.canFetchMore():
+            self._source.fetchMore()
+
+    def clear_rows(self):
+        self._proxy.set_predicate(None, invalidate=False)
+        self._source.clear()
+
+    def rowCount(self):
+        return self._proxy.rowCount()
+
+    def columnCount(self):
+        return self._source.columnCount()
+
+    def item(self, row, col):
+        if not (0 <= row < self._proxy.rowCount()) or not (0 <= col < self._source.columnCount()):
+            return None
+        return _RowCell(self, row, col)
+
+    def row_values(self, row):
+        return self._source.row_values(self._proxy.mapToSource(self._proxy.index(row, 0)).row())
+
+    def set_cell_text(self, row, col, value):
+        src = self._proxy.mapToSource(self._proxy.index(row, col))
+        if src.isValid():
+            self._source.set_cell(src.row(), src.column(), value)
+
+    def update_column(self, col, updates_by_key, key_col):
+        self._source.update_column(col, updates_by_key, key_col)
+
+    def setCurrentCell(self, row, col, command=QItemSelectionModel.ClearAndSelect):
+        self.selectionModel().setCurrentIndex(self._proxy.index(row, col), command)
+
+    def fit_visible_rows(self, min_height=24, max_height=None):
+        self._row_fit = (min_height, max_height)
+        self._fitted_rows.clear()
+        self._fit_visible_rows()
+
+    def _invalidate_row_fit(self, *_args):
+        self._fitted_rows.clear()
+        self._rowfit_timer.start(0)
+
+    def _fit_visible_rows(self):
+        count = self._proxy.rowCount()
+        if count <= 0:
+            return
+        min_height, max_height = self._row_fit
+        row = max(0, self.rowAt(0))
+        bottom = self.viewport().height()
+        while row < count and self.rowViewportPosition(row) < bottom:
+            if row not in self._fitted_rows:
+                self.resizeRowToContents(row)
+                h = self.rowHeight(row)
+                if h < min_height:
+                    self.setRowHeight(row, min_height)
+                elif max_height is not None and h > max_height:
+                    self.setRowHeight(row, max_height)
+                self._fitted_rows.add(row)
+            row += 1
+
+    def resizeEvent(self, event):
+        super().resizeEvent(event)
+        self._rowfit_timer.start(30)
+
+
 def _project_metadata_path(folder_path):
     return os.path.join(str(folder_path or "").strip(), ".bidmanager_project.json")
 
@@ -1334,16 +1631,8 @@ class CreateProjectDialog(QDialog):
         self._update_batch_nav()
 
     def _init_tender_autofill(self):
-        self._tender_records = self._load_tender_records()
-        self._tender_by_id = {}
-        self._tender_by_title = {}
-        for rec in self._tender_records:
-            tid = str(rec.get("tender_id", "")).strip()
-            title = str(rec.get("title", "")).strip()
-            if tid:
-                self._tender_by_id.setdefault(tid.lower(), rec)
-            if title:
-                self._tender_by_title.setdefault(title.lower(), rec)
+        # With the FTS index, lookups go to SQLite on demand instead of preloading every tender.
+        self._tender_records = [] if core.tender_fts_available() else self._load_tender_records()
         self.title_edit.installEventFilter(self)
         self.desc_edit.installEventFilter(self)
         # Popup completer intentionally disabled for Tender Id for now.
@@ -1351,21 +1640,33 @@ class CreateProjectDialog(QDialog):
         self._format_value_field()
         self._set_prebid_from_text(self.prefill.get("prebid", ""))
 
-    def _load_tender_records(self):
+    def _load_tender_records(self, ids=None):
+        sql = (
+            "SELECT id, COALESCE(tender_id,''), COALESCE(title,''), COALESCE(org_chain,''), "
+            "COALESCE(tender_value,''), COALESCE(pre_bid_meeting_date,''), "
+            "COALESCE(closing_date,''), '', COALESCE(is_archived,0) "
+            "FROM tenders"
+        )
+        params = ()
+        if ids is not None:
+            if not ids:
+                return []
+            sql += f" WHERE id IN ({','.join('?' for _ in ids)})"
+            params = tuple(ids)
+        else:
+            sql += " ORDER BY id DESC"
         conn = sqlite3.connect(core.DB_FILE)
         try:
-            rows = conn.execute(
-                "SELECT COALESCE(tender_id,''), COALESCE(title,''), COALESCE(org_chain,''), "
-                "COALESCE(tender_value,''), COALESCE(pre_bid_meeting_date,''), "
-                "COALESCE(closing_date,''), COALESCE(closing_time,''), COALESCE(is_archived,0) "
-                "FROM tenders ORDER BY id DESC"
-            ).fetchall()
+            rows = conn.execute(sql, params).fetchall()
         except Exception:
             rows = []
         finally:
             conn.close()
+        if ids is not None:
+            rank = {int(x): i for i, x in enumerate(ids)}
+            rows.sort(key=lambda r: rank.get(int(r[0]), len(rank)))
         out = []
-        for tid, title, org, val, prebid, cdate, ctime, is_archived in rows:
+        for _db_id, tid, title, org, val, prebid, cdate, ctime, is_archived in rows:
             out.append(
                 {
                     "tender_id": str(tid or "").strip(),
@@ -1414,30 +1715,30 @@ class CreateProjectDialog(QDialog):
         if digits.isdigit():
             self.value_edit.setText(f"{int(digits):,}")
 
-    def _autofill_from_text(self, raw_text, mode="any"):
+    def _find_tender_record(self, raw_text, mode="any"):
         raw = str(raw_text or "").strip()
         if not raw:
-            return False
+            return None
         raw_l = raw.lower()
-        rec = None
-        if mode in ("tender_id", "any"):
-            rec = self._tender_by_id.get(raw_l)
-        if rec is None and mode in ("title", "any"):
-            rec = self._tender_by_title.get(raw_l)
-        if rec is None:
-            for row in self._tender_records:
-                tid_txt = str(row.get("tender_id", "")).lower()
-                title_txt = str(row.get("title", "")).lower()
-                ok = False
-                if mode == "tender_id":
-                    ok = raw_l in tid_txt
-                elif mode == "title":
-                    ok = raw_l in title_txt
-                else:
-                    ok = (raw_l in tid_txt) or (raw_l in title_txt)
-                if ok:
-                    rec = row
-                    break
+        fields = {"tender_id": ["tender_id"], "title": ["title"]}.get(mode, ["tender_id", "title"])
+        if core.tender_fts_available():
+            records = self._load_tender_records(core.search_tender_ids(raw, columns=fields, limit=50))
+        else:
+            records = self._tender_records
+        # Exact match wins, then substring match, then the best FTS (bm25) hit.
+        for field in fields:
+            for row in records:
+                if str(row.get(field, "")).lower() == raw_l:
+                    return row
+        for row in records:
+            if any(raw_l in str(row.get(field, "")).lower() for field in fields):
+                return row
+        if core.tender_fts_available() and records:
+            return records[0]
+        return None
+
+    def _autofill_from_text(self, raw_text, mode="any"):
+        rec = self._find_tender_record(raw_text, mode)
         if rec is None:
             return False
         tid = str(rec.get("tender_id", "")).strip()
@@ -1525,8 +1826,8 @@ class CreateProjectDialog(QDialog):
         if not tid:
             QMessageBox.information(self, "Fetch Tender", "Enter a Tender Id first.")
             return
-        rec = self._tender_by_id.get(tid.lower())
-        if rec is None:
+        rec = self._find_tender_record(tid, mode="tender_id")
+        if rec is None or str(rec.get("tender_id", "")).lower() != tid.lower():
             QMessageBox.information(self, "Fetch Tender", "No tender found in Database.")
             return
         self._autofill_from_text(tid, mode="tender_id")
@@ -1575,12 +1876,11 @@ class CreateProjectDialog(QDialog):
         if event.type() == QEvent.KeyPress and event.key() == Qt.Key_Tab:
             if obj is self.title_edit:
                 raw = str(self.title_edit.text() or "").strip().lower()
-                if raw and raw not in self._tender_by_id:
-                    for row in self._tender_records:
-                        tid_txt = str(row.get("tender_id", "")).strip()
-                        if tid_txt.lower().startswith(raw):
-                            self.title_edit.setText(tid_txt)
-                            break
+                rec = self._find_tender_record(raw, mode="tender_id") if raw else None
+                if rec is not None:
+                    tid_txt = str(rec.get("tender_id", "")).strip()
+                    if tid_txt.lower() != raw and tid_txt.lower().startswith(raw):
+                        self.title_edit.setText(tid_txt)
                 self._autofill_from_text(self.title_edit.text(), mode="tender_id")
             elif obj is self.desc_edit:
                 self._autofill_from_text(self.desc_edit.toPlainText(), mode="title")
@@ -4939,6 +5239,55 @@ class ViewTendersPage(QWidget):
         "Sr", "ID", "Website", "Tender ID", "Title", "Work Description", "Value", "EMD",
         "Org Chain", "Closing Date", "Closing Time", "Pre-Bid", "Location", "Category", "Status", "Select", "Download"
     ]
+    # Table columns backed by the tenders FTS index (core.TENDER_FTS_COLUMNS).
+    fts_filter_columns = {
+        "Tender ID": "tender_id",
+        "Title": "title",
+        "Work Description": "work_description",
+        "Org Chain": "org_chain",
+        "Location": "location",
+        "Category": "tender_category",
+        "Value": "tender_value",
+        "EMD": "emd",
+        "Status": "status",
+    }
+    TENDER_PAGE_SIZE = 500
+    # SQL behind the tender table columns: (text as displayed, numeric value or None, sort keys).
+    # Sort keys are never NULL so a page can be continued with a keyset comparison; "Value"
+    # has its own NA ordering in _tender_sort_keys. Sr is numbered by the view.
+    tender_sql_columns = {
+        "ID": ("CAST(t.id AS TEXT)", "t.id", ("t.id",)),
+        "Website": ("COALESCE(w.name,'')", None, ("LOWER(COALESCE(w.name,''))",)),
+        "Tender ID": ("COALESCE(t.tender_id,'')", None, ("LOWER(COALESCE(t.tender_id,''))",)),
+        "Title": ("COALESCE(t.title,'')", None, ("LOWER(COALESCE(t.title,''))",)),
+        "Work Description": ("COALESCE(t.work_description,'')", None, ("LOWER(COALESCE(t.work_description,''))",)),
+        "Value": ("COALESCE(t.tender_value,'')", "t.value_num", ()),
+        "EMD": (
+            "COALESCE(t.emd,'')", "t.emd_num",
+            ("(t.emd_num IS NULL)", "COALESCE(t.emd_num,0)", "LOWER(COALESCE(t.emd,''))"),
+        ),
+        "Org Chain": ("COALESCE(t.org_chain,'')", None, ("LOWER(COALESCE(t.org_chain,''))",)),
+        "Closing Date": (
+            "COALESCE(t.closing_day_text,'')", None,
+            ("(COALESCE(t.closing_at,'')='')", "COALESCE(t.closing_at,'')", "LOWER(COALESCE(t.closing_day_text,''))"),
+        ),
+        "Closing Time": (
+            "COALESCE(t.closing_time_text,'')", None,
+            ("COALESCE(SUBSTR(t.closing_at,12),'')", "LOWER(COALESCE(t.closing_time_text,''))"),
+        ),
+        "Pre-Bid": (
+            "COALESCE(t.pre_bid_meeting_date,'')", None,
+            ("(COALESCE(t.pre_bid_at,'')='')", "COALESCE(t.pre_bid_at,'')", "LOWER(COALESCE(t.pre_bid_meeting_date,''))"),
+        ),
+        "Location": ("COALESCE(t.location,'')", None, ("LOWER(COALESCE(t.location,''))",)),
+        "Category": ("COALESCE(t.tender_category,'')", None, ("LOWER(COALESCE(t.tender_category,''))",)),
+        "Status": ("COALESCE(t.status,'')", None, ("LOWER(COALESCE(t.status,''))",)),
+        "Select": (
+            "CASE WHEN COALESCE(t.is_downloaded,0)!=0 THEN 'Yes' ELSE 'No' END", None,
+            ("(COALESCE(t.is_downloaded,0)!=0)",),
+        ),
+        "Download": ("COALESCE(t.download_state,'')", None, ("LOWER(COALESCE(t.download_state,''))",)),
+    }
 
     def __init__(self, controller):
         super().__init__()
@@ -5059,6 +5408,9 @@ class ViewTendersPage(QWidget):
         self.btn_select_all = QPushButton("Select All")
         self.btn_download_results = QPushButton("Download Results")
         self.btn_check_status = QPushButton("Check Status")
+        self.btn_stop_task = QPushButton("Stop")
+        self.btn_stop_task.setToolTip("Stop the running scraper task after the current tender or page.")
+        self.btn_stop_task.setVisible(False)
         self.btn_add_projects = QPushButton("Add Projects")
         self.btn_filters = QPushButton("Filters")
         self.btn_advanced = QPushButton("Advanced")
@@ -5071,6 +5423,10 @@ class ViewTendersPage(QWidget):
         self.btn_download_selected.setObjectName("ScraperDownloadSelectedButton")
         self.btn_download_results.setObjectName("ScraperDownloadResultsButton")
         self.btn_check_status.setObjectName("ScraperCheckStatusButton")
+        self.btn_check_status.setToolTip(
+            "Check selected tenders whose status is not final and was not checked recently.\n"
+            "Right-click the table and choose Re-check Status Now to check them all."
+        )
         self.btn_add_projects.setObjectName("ScraperAddProjectsButton")
         self.btn_filters.setObjectName("ScraperFiltersButton")
         self.btn_fetch_orgs.clicked.connect(self.run_fetch_orgs)
@@ -5078,13 +5434,14 @@ class ViewTendersPage(QWidget):
         self.btn_download_selected.clicked.connect(self.run_download)
         self.btn_select_all.clicked.connect(self.select_all_tenders)
         self.btn_download_results.clicked.connect(self.run_download_results)
-        self.btn_check_status.clicked.connect(self.run_status_check)
+        self.btn_check_status.clicked.connect(lambda: self.run_status_check())
+        self.btn_stop_task.clicked.connect(self.stop_bg_task)
         self.btn_add_projects.clicked.connect(self.add_selected_tenders_to_new_project)
         self.btn_filters.clicked.connect(self.open_filters_dialog)
         self.btn_advanced.clicked.connect(self.open_advanced_dialog)
         for b in (
             self.btn_fetch_orgs, self.btn_get_tenders, self.btn_download_selected, self.btn_select_all,
-            self.btn_download_results, self.btn_check_status, self.btn_add_projects,
+            self.btn_download_results, self.btn_check_status, self.btn_stop_task, self.btn_add_projects,
             self.btn_filters, self.btn_advanced
         ):
             b.setProperty("compact", True)
@@ -5096,6 +5453,7 @@ class ViewTendersPage(QWidget):
             self.btn_select_all: 138,
             self.btn_download_results: 168,
             self.btn_check_status: 150,
+            self.btn_stop_task: 90,
             self.btn_add_projects: 136,
             self.btn_filters: 118,
             self.btn_advanced: 126,
@@ -5104,7 +5462,7 @@ class ViewTendersPage(QWidget):
             b.setFixedWidth(w)
         for b in (
             self.btn_fetch_orgs, self.btn_get_tenders, self.btn_download_selected, self.btn_select_all,
-            self.btn_download_results, self.btn_check_status
+            self.btn_download_results, self.btn_check_status, self.btn_stop_task
         ):
             actions.addWidget(b)
         for b in (self.btn_add_projects, self.btn_filters):
@@ -5255,12 +5613,11 @@ class ViewTendersPage(QWidget):
 
     def _make_table(self, headers, hidden_cols=None, table_key=None):
         hidden_cols = hidden_cols or set()
-        tbl = QTableWidget(0, len(headers))
-        tbl.setHorizontalHeaderLabels(headers)
+        tbl = RowTableView(headers, serial_col=headers.index("Sr") if "Sr" in headers else None)
         tbl.setEditTriggers(QAbstractItemView.NoEditTriggers)
         tbl.verticalHeader().setVisible(False)
-        tbl.setSelectionBehavior(QTableWidget.SelectRows)
-        tbl.setSelectionMode(QTableWidget.ExtendedSelection)
+        tbl.setSelectionBehavior(QAbstractItemView.SelectRows)
+        tbl.setSelectionMode(QAbstractItemView.ExtendedSelection)
         tbl.setAlternatingRowColors(True)
         tbl.setWordWrap(True)
         tbl.setContextMenuPolicy(Qt.CustomContextMenu)
@@ -5467,19 +5824,7 @@ class ViewTendersPage(QWidget):
     def _update_visible_select_values(self, table, cols, updates_by_id):
         if table is None or not updates_by_id or "Select" not in cols:
             return
-        select_idx = cols.index("Select")
-        for row in range(table.rowCount()):
-            id_item = table.item(row, 1)
-            if not id_item:
-                continue
-            row_id = str(id_item.text() or "").strip()
-            if row_id not in updates_by_id:
-                continue
-            item = table.item(row, select_idx)
-            if item is None:
-                item = QTableWidgetItem("")
-                table.setItem(row, select_idx, item)
-            item.setText(str(updates_by_id[row_id]))
+        table.update_column(cols.index("Select"), {str(k): str(v) for k, v in updates_by_id.items()}, 1)
 
     def _show_table_context_menu(self, key, table, pos):
         menu = QMenu(self)
@@ -5490,8 +5835,11 @@ class ViewTendersPage(QWidget):
         if key in ("tenders", "archived"):
             menu.addSeparator()
             a_select_all = menu.addAction("Toggle Select All")
+            a_recheck = menu.addAction("Re-check Status Now")
+            a_recheck.setEnabled(self.btn_check_status.isEnabled())
         else:
             a_select_all = None
+            a_recheck = None
 
         action = menu.exec(table.viewport().mapToGlobal(pos))
         if action == a_cols:
@@ -5504,6 +5852,9 @@ class ViewTendersPage(QWidget):
             idx = 2 if key == "archived" else 1
             self.tabs.setCurrentIndex(idx)
             self.select_all_tenders()
+        elif a_recheck is not None and action == a_recheck:
+            self.tabs.setCurrentIndex(2 if key == "archived" else 1)
+            self.run_status_check(force=True)
 
     def _show_header_context_menu(self, key, table, pos):
         header = table.horizontalHeader()
@@ -5780,8 +6131,10 @@ class ViewTendersPage(QWidget):
         self._restore_column_order(key)
         self._restore_column_widths(key)
 
-    def row_matches_filters(self, key, row_values):
+    def row_matches_filters(self, key, row_values, skip_cols=None):
         filters = self.filter_map.get(key, {}) or {}
+        if skip_cols:
+            filters = {col: needle for col, needle in filters.items() if col not in skip_cols}
         if not filters:
             return True
         cols = self._columns_for_key(key)
@@ -5830,16 +6183,7 @@ class ViewTendersPage(QWidget):
                     return False
         return True
 
-    def _set_row(self, table, row_idx, values, center_cols=None):
-        center_cols = center_cols or set()
-        for c, v in enumerate(values):
-            item = QTableWidgetItem(str(v))
-            if c in center_cols:
-                item.setTextAlignment(Qt.AlignCenter)
-            table.setItem(row_idx, c, item)
-
     def load_org_table(self):
-        self.table_orgs.setRowCount(0)
         conn = sqlite3.connect(core.DB_FILE)
         c = conn.cursor()
         sid = self.get_selected_site_id()
@@ -5859,18 +6203,13 @@ class ViewTendersPage(QWidget):
         rows = c.fetchall()
         conn.close()
 
-        display = []
-        for r in rows:
-            row_vals = (0, r[0], r[1], r[2], r[3], ("Yes" if r[4] else "No"))
-            if self.row_matches_filters("orgs", row_vals) and self.row_matches_quick_search("orgs", row_vals):
-                display.append(row_vals)
+        display = [(0, r[0], r[1], r[2], r[3], ("Yes" if r[4] else "No")) for r in rows]
         display = self.apply_sort("orgs", self.org_cols, display)
-        for i, rv in enumerate(display, 1):
-            vals = list(rv)
-            vals[0] = i
-            row = self.table_orgs.rowCount()
-            self.table_orgs.insertRow(row)
-            self._set_row(self.table_orgs, row, vals, center_cols={0, 1, 4, 5})
+        self.table_orgs.set_rows(
+            display,
+            center_cols={0, 1, 4, 5},
+            predicate=lambda vals: self.row_matches_filters("orgs", vals) and self.row_matches_quick_search("orgs", vals),
+        )
         self._apply_persisted_layout("orgs")
         self._fit_table_rows(self.table_orgs)
         self._apply_sort_indicator("orgs")
@@ -5878,144 +6217,256 @@ class ViewTendersPage(QWidget):
         self._refresh_scraper_action_labels()
 
     def split_date_time_text(self, value):
-        txt = str(value or "").strip()
-        if not txt:
-            return "", ""
-        m = core.re.search(r"^(.+?)\s+(\d{1,2}:\d{2}(?::\d{2})?\s*[APMapm]{0,2})$", txt)
-        if m:
-            return m.group(1).strip(), m.group(2).strip().upper()
-        return txt, ""
+        return core.split_closing_date(value)
 
     def get_archive_paths(self, folder_path, tender_id):
-        safe_id = core.re.sub(r'[\\/*?:"<>|]', "", str(tender_id or ""))
-        preferred = []
-        if safe_id:
-            preferred.append(os.path.join(folder_path, f"{safe_id}.rar"))
-            preferred.append(os.path.join(folder_path, f"{safe_id}.zip"))
-        existing = [p for p in preferred if os.path.exists(p)]
-        if existing:
-            return existing
-        generic = []
-        try:
-            for name in os.listdir(folder_path):
-                lower = name.lower()
-                if lower.endswith(".rar") or lower.endswith(".zip"):
-                    generic.append(os.path.join(folder_path, name))
-        except Exception:
-            return []
-        return sorted(generic)
+        return core.tender_archive_paths(folder_path, tender_id)
 
     def is_already_extracted(self, folder_path, archive_paths):
-        archive_names = {os.path.basename(p).lower() for p in archive_paths}
-        try:
-            for name in os.listdir(folder_path):
-                low = name.lower()
-                if low in archive_names:
-                    continue
-                if low.endswith(".crdownload") or low.endswith(".part"):
-                    continue
-                return True
-        except Exception:
-            return False
-        return False
+        return core.is_tender_folder_extracted(folder_path, archive_paths)
 
     def get_download_action_label(self, folder_path, tender_id):
-        if not folder_path or not os.path.exists(folder_path):
-            return ""
-        archive_paths = self.get_archive_paths(folder_path, tender_id)
-        if not archive_paths:
-            return "Open"
-        return "Open" if self.is_already_extracted(folder_path, archive_paths) else "Unzip & Open"
+        return core.compute_download_state(folder_path, tender_id)
 
-    def load_tender_table(self):
-        self.table_tenders.setRowCount(0)
-        conn = sqlite3.connect(core.DB_FILE)
-        c = conn.cursor()
+    def _tender_fts_match(self, key):
+        """
+        Build the FTS5 MATCH expressions for the Filters dialog's "contains" filters on
+        indexed columns and for the quick search. Returns (filter_match, handled_filter_cols,
+        quick_match). A "contains" filter is only handled here when the trigram index can
+        answer it as a substring test; shorter values stay SQL substring filters.
+        """
+        if not core.tender_fts_available():
+            return "", set(), ""
+        parts = []
+        handled = set()
+        quick_match = core.build_fts_match(self.quick_search_map.get(key, ""))
+        for col, needle in (self.filter_map.get(key, {}) or {}).items():
+            db_col = self.fts_filter_columns.get(col)
+            if not db_col:
+                continue
+            if isinstance(needle, str):
+                value = needle
+            elif isinstance(needle, dict) and str(needle.get("mode", "")).strip().lower() == "contains":
+                value = needle.get("value", "")
+            else:
+                continue
+            col_match = core.build_fts_substring(value, [db_col])
+            if col_match:
+                parts.append(f"({col_match})")
+                handled.add(col)
+        return " AND ".join(parts), handled, quick_match
+
+    def _tender_filter_sql(self, spec, needle):
+        """SQL for one Filters-dialog entry on a SQL-backed column; None means "filter in Python"."""
+        text_expr, num_expr, _sort_keys = spec
+        if isinstance(needle, str):
+            return f"INSTR(LOWER({text_expr}), ?) > 0", [needle.lower()]
+        mode = str(needle.get("mode", "")).strip().lower()
+        if mode == "values":
+            selected = [str(x) for x in needle.get("selected", [])]
+            if not selected:
+                return "", []
+            if len(selected) > 900:
+                return None
+            return f"{text_expr} IN ({','.join('?' * len(selected))})", selected
+        if mode == "equals":
+            return f"LOWER({text_expr}) = ?", [str(needle.get("value", "")).lower()]
+        if mode == "contains":
+            return f"INSTR(LOWER({text_expr}), ?) > 0", [str(needle.get("value", "")).lower()]
+        if mode == "number":
+            rhs = core.parse_amount(needle.get("value"))
+            op = needle.get("op", "=")
+            if rhs is None or op not in ("=", "!=", ">", ">=", "<", "<="):
+                return "0", []
+            return f"{num_expr or f'bm_to_num({text_expr})'} {op} ?", [rhs]
+        return "", []
+
+    def _tender_sort_keys(self, key, cols, rank_expr=None):
+        """ORDER BY terms as (expr, descending); always ends with t.id so the keyset is unique."""
+        state = self.sort_map.get(key, {}) or {}
+        col = state.get("column")
+        asc = bool(state.get("ascending", True))
+        keys = []
+        if col == "Value" and col in cols:
+            # Same as apply_sort: ascending keeps NA first, descending keeps NA last.
+            if asc:
+                keys = [("(t.value_num IS NOT NULL)", False), ("COALESCE(t.value_num,0)", False)]
+            else:
+                keys = [("(t.value_num IS NULL)", False), ("COALESCE(t.value_num,0)", True)]
+        elif col in cols and col in self.tender_sql_columns:
+            keys = [(expr, not asc) for expr in self.tender_sql_columns[col][2]]
+        if keys:
+            if rank_expr:
+                keys.append((rank_expr, False))
+        else:
+            keys = ([(rank_expr, False)] if rank_expr else []) + [("COALESCE(t.created_at,'')", True)]
+        keys.append(("t.id", True))
+        return keys
+
+    def _tender_sql_query(self, key, archived, sql_filters=True):
+        """
+        Translate the tab's filters, quick search and sort into a SQL query description.
+        Returns None when a filter cannot be expressed in SQL (a column without a SQL
+        expression, or a very long value list); the caller then loads every row and
+        filters in the proxy.
+        With sql_filters=False only the website/archived scope, the FTS filter match and
+        the quick search apply.
+        """
+        cols = self._columns_for_key(key)
+        sort_col = (self.sort_map.get(key, {}) or {}).get("column")
+        if sql_filters and sort_col in cols and sort_col != "Sr" and sort_col not in self.tender_sql_columns:
+            return None
+        fts_match, fts_cols, quick_match = self._tender_fts_match(key)
+        where_parts = ["COALESCE(t.is_archived,0)=?"]
+        params = [1 if archived else 0]
         sid = self.get_selected_site_id()
-        where_parts = []
-        params = []
         if sid is not None:
             where_parts.append("t.website_id=?")
             params.append(sid)
-        where_parts.append("COALESCE(t.is_archived,0)=0")
-        where_sql = (" WHERE " + " AND ".join(where_parts)) if where_parts else ""
-        c.execute(
-            f"""SELECT t.id, w.name, t.tender_id, t.title, t.work_description, t.tender_value, t.emd, t.org_chain, t.closing_date,
-                       t.pre_bid_meeting_date, t.location, t.tender_category, t.status, t.is_downloaded, t.folder_path
-                FROM tenders t JOIN websites w ON w.id=t.website_id {where_sql}
-                ORDER BY t.created_at DESC""",
-            tuple(params),
-        )
-        rows = c.fetchall()
-        conn.close()
-        display = []
-        for r in rows:
-            closing_date_text, closing_time_text = self.split_date_time_text(r[8])
-            download_action = self.get_download_action_label(r[14], r[2])
-            row_vals = (
-                0, r[0], r[1], r[2], r[3], r[4], r[5], r[6], r[7], closing_date_text, closing_time_text, r[9], r[10], r[11],
-                ("Yes" if r[13] else "No"), download_action
+        if sql_filters:
+            for col, needle in (self.filter_map.get(key, {}) or {}).items():
+                if col in fts_cols:
+                    continue
+                spec = self.tender_sql_columns.get(col)
+                built = self._tender_filter_sql(spec, needle) if spec else None
+                if built is None:
+                    return None
+                clause, clause_params = built
+                if clause:
+                    where_parts.append(clause)
+                    params.extend(clause_params)
+        quick = (self.quick_search_map.get(key, "") or "").strip().lower()
+        if quick and not core.tender_fts_available():
+            # No FTS5 in this SQLite build: substring over every visible column.
+            hay = " || ' | ' || ".join(self.tender_sql_columns[c][0] for c in cols if c in self.tender_sql_columns)
+            where_parts.append(f"INSTR(LOWER({hay}), ?) > 0")
+            params.append(quick)
+        # With FTS the quick search is answered by the index alone: each word of three or more
+        # characters must occur in an indexed column (Tender ID, Title, Work Description, Org
+        # Chain, Location, Category, Value, EMD, Status); shorter words are ignored.
+        match = " AND ".join(f"({m})" for m in (fts_match, quick_match) if m)
+        joins = ""
+        join_params = []
+        rank_expr = None
+        if match:
+            fts = core.TENDER_FTS_TABLE
+            joins = (
+                f" JOIN (SELECT rowid AS fts_id, bm25({fts}) AS fts_rank FROM {fts} WHERE {fts} MATCH ?) f"
+                " ON f.fts_id=t.id"
             )
-            if self.row_matches_filters("tenders", row_vals) and self.row_matches_quick_search("tenders", row_vals):
-                display.append(row_vals)
-        display = self.apply_sort("tenders", self.tender_cols, display)
-        for i, rv in enumerate(display, 1):
-            vals = list(rv)
-            vals[0] = i
-            row = self.table_tenders.rowCount()
-            self.table_tenders.insertRow(row)
-            self._set_row(self.table_tenders, row, vals, center_cols={0, 1, 9, 10, 14, 15})
-        self._apply_persisted_layout("tenders")
-        self._fit_table_rows(self.table_tenders)
-        self._apply_sort_indicator("tenders")
-        self._schedule_table_reflow(self.table_tenders)
-        self._refresh_scraper_action_labels()
+            join_params.append(match)
+            rank_expr = "f.fts_rank"
+        return {
+            "archived": archived,
+            "joins": joins,
+            "join_params": join_params,
+            "where": where_parts,
+            "params": params,
+            "keys": self._tender_sort_keys(key if sql_filters else None, cols, rank_expr),
+            "fts_cols": fts_cols,
+        }
 
-    def load_archived_table(self):
-        self.table_archived.setRowCount(0)
+    @staticmethod
+    def _keyset_after(keys, last):
+        """WHERE clause selecting rows strictly after `last` in the (expr, descending) ordering."""
+        clauses = []
+        params = []
+        for i, (expr, desc) in enumerate(keys):
+            parts = [f"{keys[j][0]}=?" for j in range(i)]
+            parts.append(f"{expr}{'<' if desc else '>'}?")
+            clauses.append("(" + " AND ".join(parts) + ")")
+            params.extend(last[:i])
+            params.append(last[i])
+        return "(" + " OR ".join(clauses) + ")", params
+
+    def _fetch_tender_page(self, query, after=None, limit=None):
+        """Return (display_rows, last_keys, has_more) for one keyset page; limit=None fetches all."""
+        keys = query["keys"]
+        where_parts = list(query["where"])
+        params = list(query["params"])
+        if after is not None:
+            clause, clause_params = self._keyset_after(keys, after)
+            where_parts.append(clause)
+            params.extend(clause_params)
+        key_sql = ", ".join(expr for expr, _desc in keys)
+        order_sql = ", ".join(f"{expr} {'DESC' if desc else 'ASC'}" for expr, desc in keys)
+        limit_sql = " LIMIT ?" if limit else ""
         conn = sqlite3.connect(core.DB_FILE)
-        c = conn.cursor()
-        sid = self.get_selected_site_id()
-        if sid is None:
-            c.execute(
-                """SELECT t.id, w.name, t.tender_id, t.title, t.work_description, t.tender_value, t.emd, t.org_chain, t.closing_date,
-                          t.pre_bid_meeting_date, t.location, t.tender_category, t.status, t.is_downloaded, t.folder_path
-                   FROM tenders t JOIN websites w ON w.id=t.website_id
-                   WHERE COALESCE(t.is_archived,0)=1 ORDER BY t.created_at DESC"""
-            )
-        else:
-            c.execute(
-                """SELECT t.id, w.name, t.tender_id, t.title, t.work_description, t.tender_value, t.emd, t.org_chain, t.closing_date,
-                          t.pre_bid_meeting_date, t.location, t.tender_category, t.status, t.is_downloaded, t.folder_path
-                   FROM tenders t JOIN websites w ON w.id=t.website_id
-                   WHERE t.website_id=? AND COALESCE(t.is_archived,0)=1 ORDER BY t.created_at DESC""",
-                (sid,),
-            )
-        rows = c.fetchall()
-        conn.close()
+        conn.create_function("bm_to_num", 1, core.parse_amount, deterministic=True)
+        try:
+            rows = conn.execute(
+                f"""SELECT t.id, COALESCE(w.name,''), COALESCE(t.tender_id,''), COALESCE(t.title,''), COALESCE(t.work_description,''),
+                           COALESCE(t.tender_value,''), COALESCE(t.emd,''), COALESCE(t.org_chain,''), COALESCE(t.closing_day_text,''),
+                           COALESCE(t.closing_time_text,''), COALESCE(t.pre_bid_meeting_date,''), COALESCE(t.location,''),
+                           COALESCE(t.tender_category,''), COALESCE(t.status,''), COALESCE(t.is_downloaded,0), COALESCE(t.download_state,''), {key_sql}
+                    FROM tenders t JOIN websites w ON w.id=t.website_id{query["joins"]}
+                    WHERE {" AND ".join(where_parts)}
+                    ORDER BY {order_sql}{limit_sql}""",
+                (*query["join_params"], *params, *([int(limit)] if limit else [])),
+            ).fetchall()
+        finally:
+            conn.close()
         display = []
         for r in rows:
-            closing_date_text, closing_time_text = self.split_date_time_text(r[8])
-            download_action = self.get_download_action_label(r[14], r[2])
-            row_vals = (
-                0, r[0], r[1], r[2], r[3], r[4], r[5], r[6], r[7], closing_date_text, closing_time_text, r[9], r[10], r[11], r[12],
-                ("Yes" if r[13] else "No"), download_action
+            vals = [0, r[0], r[1], r[2], r[3], r[4], r[5], r[6], r[7], r[8], r[9], r[10], r[11], r[12]]
+            if query["archived"]:
+                vals.append(r[13])
+            vals.extend([("Yes" if r[14] else "No"), r[15]])
+            display.append(tuple(vals))
+        last = tuple(rows[-1][16:]) if rows else after
+        return display, last, bool(limit) and len(rows) >= int(limit)
+
+    def _tender_page_fetcher(self, query, after):
+        state = {"after": after}
+
+        def fetch_more():
+            rows, state["after"], has_more = self._fetch_tender_page(query, state["after"], limit=self.TENDER_PAGE_SIZE)
+            return rows, has_more
+        return fetch_more
+
+    def _refresh_tender_sort_keys(self):
+        conn = sqlite3.connect(core.DB_FILE)
+        try:
+            if core.refresh_tender_sort_keys(conn):
+                conn.commit()
+        except sqlite3.OperationalError:
+            pass
+        finally:
+            conn.close()
+
+    def _load_tender_tab(self, key):
+        archived = key == "archived"
+        table = self._table_for_key(key)
+        cols = self._columns_for_key(key)
+        center_cols = {0, 1, 9, 10, 14, 15, 16} if archived else {0, 1, 9, 10, 14, 15}
+        self._refresh_tender_sort_keys()
+        query = self._tender_sql_query(key, archived)
+        if query is not None:
+            rows, after, has_more = self._fetch_tender_page(query, limit=self.TENDER_PAGE_SIZE)
+            fetch_more = self._tender_page_fetcher(query, after) if has_more else None
+            table.set_rows(rows, center_cols=center_cols, fetch_more=fetch_more)
+        else:
+            query = self._tender_sql_query(key, archived, sql_filters=False)
+            rows, _after, _has_more = self._fetch_tender_page(query)
+            fts_cols = query["fts_cols"]
+            # The quick search is already applied in SQL.
+            table.set_rows(
+                self.apply_sort(key, cols, rows),
+                center_cols=center_cols,
+                predicate=lambda vals: self.row_matches_filters(key, vals, skip_cols=fts_cols),
             )
-            if self.row_matches_filters("archived", row_vals) and self.row_matches_quick_search("archived", row_vals):
-                display.append(row_vals)
-        display = self.apply_sort("archived", self.archived_cols, display)
-        for i, rv in enumerate(display, 1):
-            vals = list(rv)
-            vals[0] = i
-            row = self.table_archived.rowCount()
-            self.table_archived.insertRow(row)
-            self._set_row(self.table_archived, row, vals, center_cols={0, 1, 9, 10, 14, 15, 16})
-        self._apply_persisted_layout("archived")
-        self._fit_table_rows(self.table_archived)
-        self._apply_sort_indicator("archived")
-        self._schedule_table_reflow(self.table_archived)
+        self._apply_persisted_layout(key)
+        self._fit_table_rows(table)
+        self._apply_sort_indicator(key)
+        self._schedule_table_reflow(table)
         self._refresh_scraper_action_labels()
 
+    def load_tender_table(self):
+        self._load_tender_tab("tenders")
+
+    def load_archived_table(self):
+        self._load_tender_tab("archived")
+
     def refresh_backend_mode_ui(self):
         is_remote = bool(getattr(self.backend, "is_remote_mode", lambda: False)())
         self.btn_fetch_data.setEnabled(is_remote)
@@ -6320,6 +6771,7 @@ class ViewTendersPage(QWidget):
         if archive_paths and not self.is_already_extracted(folder_path, archive_paths):
             for ap in archive_paths:
                 self.extract_archive(ap, folder_path)
+            core.refresh_download_states(tender_ids=[db_id])
         try:
             if sys.platform.startswith("win"):
                 os.startfile(folder_path)
@@ -6361,22 +6813,39 @@ class ViewTendersPage(QWidget):
             return
         if switch_to_logs:
             self.tabs.setCurrentIndex(3)
+        if hasattr(self.backend, "clear_stop"):
+            self.backend.clear_stop()
         self._task_future = self._task_executor.submit(worker_fn)
-        if done_refresh:
-            QTimer.singleShot(300, self._poll_bg_task)
+        self.btn_stop_task.setEnabled(True)
+        self.btn_stop_task.setVisible(True)
+        QTimer.singleShot(300, lambda: self._poll_bg_task(done_refresh))
 
-    def _poll_bg_task(self):
+    def _poll_bg_task(self, done_refresh=True):
         if not self._task_future:
             return
         if not self._task_future.done():
-            QTimer.singleShot(300, self._poll_bg_task)
+            QTimer.singleShot(300, lambda: self._poll_bg_task(done_refresh))
             return
         try:
             self._task_future.result()
         except Exception as e:
             self.append_log(f"Task failed: {e}")
         self._task_future = None
-        self.on_site_changed()
+        self.btn_stop_task.setVisible(False)
+        if hasattr(self.backend, "clear_stop"):
+            self.backend.clear_stop()
+        if done_refresh:
+            self.on_site_changed()
+
+    def stop_bg_task(self):
+        if not self._task_future or self._task_future.done():
+            return
+        self.btn_stop_task.setEnabled(False)
+        core.log_to_gui("Stop requested; finishing the current tender or page...")
+        if hasattr(self.backend, "request_stop"):
+            self.backend.request_stop()
+        else:
+            core.request_scrape_cancel()
 
     def _sync_remote_scraper_state_if_needed(self):
         return
@@ -6628,13 +7097,15 @@ class ViewTendersPage(QWidget):
             self.backend.download_single_tender_logic(tender_db_id, mode)
         self._run_bg(worker)
 
-    def run_status_check(self):
+    def run_status_check(self, force=False):
+        # force=True re-checks tenders whose status was checked within the TTL too.
         archived_mode = (self.tabs.currentIndex() == 2)
+        force = bool(force)
         def worker():
-            self._log_scraper_execution_mode("Status check")
+            self._log_scraper_execution_mode("Status re-check" if force else "Status check")
             self._sync_remote_scraper_state_if_needed()
             for sid in self.get_target_site_ids():
-                self.backend.check_tender_status_logic(sid, archived_only=archived_mode)
+                self.backend.check_tender_status_logic(sid, archived_only=archived_mode, force=force)
         self._run_bg(worker)
 
     def run_download_results(self):
@@ -6702,6 +7173,7 @@ class ViewTendersPage(QWidget):
                         (site_id,),
                     ).fetchall()
                 updated = 0
+                log_sessions = []
                 for tender_db_id, tender_id, folder_path in rows:
                     tender_id = str(tender_id or "").strip()
                     candidate = self._candidate_download_folder(tender_id, folder_path)
@@ -6712,17 +7184,22 @@ class ViewTendersPage(QWidget):
                         (target, str(candidate or "").strip(), int(tender_db_id)),
                     )
                     if has_files and candidate:
+                        log_session = core.DownloadLogSession(tender_id)
                         try:
                             for name in os.listdir(candidate):
                                 full = os.path.join(candidate, name)
                                 if os.path.isfile(full):
-                                    core.ScraperBackend.log_downloaded_file(tender_id, name, local_path=full)
+                                    core.ScraperBackend.log_downloaded_file(tender_id, name, local_path=full, log_session=log_session)
                         except Exception:
                             pass
+                        log_sessions.append(log_session)
                     updated += 1
                 conn.commit()
             finally:
                 conn.close()
+            # Flushed after the flag updates commit so the log writes don't wait on this connection's lock.
+            for log_session in log_sessions:
+                log_session.close()
             core.log_to_gui(f"Updated download flags for {updated} tender row(s) from local files.")
         self._run_bg(worker, done_refresh=True, switch_to_logs=False)
 
@@ -7031,7 +7508,7 @@ class ViewTendersPage(QWidget):
             f"""SELECT tender_id, title, org_chain, closing_date, website_id, tender_value, pre_bid_meeting_date, folder_path
                 FROM tenders
                 WHERE {where_sql}
-                ORDER BY created_at DESC""",
+                ORDER BY COALESCE(created_at,'') DESC""",
             tuple(params),
         )
         rows = c.fetchall()
@@ -7413,6 +7890,7 @@ class ViewTendersPage(QWidget):
                 return []
             idx = cols.index(col_name)
             vals = set()
+            table.fetch_all()
             for r in range(table.rowCount()):
                 it = table.item(r, idx)
                 vals.add("" if it is None else str(it.text()))
@@ -7570,6 +8048,7 @@ class ViewTendersPage(QWidget):
             return []
         idx_map = {c: i for i, c in enumerate(self.tender_cols)}
         rows = []
+        self.table_tenders.fetch_all()
         for r in range(self.table_tenders.rowCount()):
             row_out = []
             for col in selected_cols:
@@ -8477,12 +8956,11 @@ class ServerStoragePage(QWidget):
 
     def _make_mirror_table(self, headers, hidden_cols=None):
         hidden_cols = hidden_cols or set()
-        tbl = QTableWidget(0, len(headers))
-        tbl.setHorizontalHeaderLabels(headers)
+        tbl = RowTableView(headers, serial_col=headers.index("Sr") if "Sr" in headers else None)
         tbl.setEditTriggers(QAbstractItemView.NoEditTriggers)
         tbl.verticalHeader().setVisible(False)
-        tbl.setSelectionBehavior(QTableWidget.SelectRows)
-        tbl.setSelectionMode(QTableWidget.ExtendedSelection)
+        tbl.setSelectionBehavior(QAbstractItemView.SelectRows)
+        tbl.setSelectionMode(QAbstractItemView.ExtendedSelection)
         tbl.setAlternatingRowColors(True)
         tbl.setWordWrap(True)
         tbl.horizontalHeader().setStretchLastSection(False)
@@ -8515,10 +8993,6 @@ class ServerStoragePage(QWidget):
             tbl.setColumnWidth(idx, widths.get(name, 120))
             if name in hidden_cols:
                 tbl.setColumnHidden(idx, True)
-        rowfit_timer = QTimer(tbl)
-        rowfit_timer.setSingleShot(True)
-        rowfit_timer.timeout.connect(lambda t=tbl: auto_fit_table_rows(t, min_height=24, max_height=None))
-        tbl._rowfit_timer = rowfit_timer
         return tbl
 
     def _server_org_selection_key(self, website_id, name):
@@ -8558,75 +9032,19 @@ class ServerStoragePage(QWidget):
         payload = sorted({str(x).strip() for x in (values or []) if str(x).strip()})
         self._save_json_user_setting("server_control_tender_selection_keys", payload)
 
-    def _set_row(self, table, row_idx, values, center_cols=None):
-        center_cols = center_cols or set()
-        for c, v in enumerate(values):
-            item = QTableWidgetItem(str(v))
-            if c in center_cols:
-                item.setTextAlignment(Qt.AlignmentFlag.AlignCenter)
-            table.setItem(row_idx, c, item)
-
     def _split_date_time_text(self, value):
-        txt = str(value or "").strip()
-        if not txt:
-            return "", ""
-        m = core.re.search(r"^(.+?)\s+(\d{1,2}:\d{2}(?::\d{2})?\s*[APMapm]{0,2})$", txt)
-        if m:
-            return m.group(1).strip(), m.group(2).strip().upper()
-        return txt, ""
-
-    def _get_archive_paths(self, folder_path, tender_id):
-        safe_id = core.re.sub(r'[\\/*?:"<>|]', "", str(tender_id or ""))
-        preferred = []
-        if safe_id:
-            preferred.append(os.path.join(folder_path, f"{safe_id}.rar"))
-            preferred.append(os.path.join(folder_path, f"{safe_id}.zip"))
-        existing = [p for p in preferred if os.path.exists(p)]
-        if existing:
-            return existing
-        generic = []
-        try:
-            for name in os.listdir(folder_path):
-                lower = name.lower()
-                if lower.endswith(".rar") or lower.endswith(".zip"):
-                    generic.append(os.path.join(folder_path, name))
-        except Exception:
-            return []
-        return sorted(generic)
-
-    def _is_already_extracted(self, folder_path, archive_paths):
-        archive_names = {os.path.basename(p).lower() for p in archive_paths}
-        try:
-            for name in os.listdir(folder_path):
-                low = name.lower()
-                if low in archive_names:
-                    continue
-                if low.endswith(".crdownload") or low.endswith(".part"):
-                    continue
-                return True
-        except Exception:
-            return False
-        return False
-
-    def _get_download_action_label(self, folder_path, tender_id):
-        if not folder_path or not os.path.exists(folder_path):
-            return ""
-        archive_paths = self._get_archive_paths(folder_path, tender_id)
-        if not archive_paths:
-            return "Open"
-        return "Open" if self._is_already_extracted(folder_path, archive_paths) else "Unzip & Open"
+        return core.split_closing_date(value)
 
     def _refresh_server_tables(self):
         if not self._remote_scraper_ready():
             for table in (self.table_orgs, self.table_tenders, self.table_archived):
-                table.setRowCount(0)
+                table.clear_rows()
             return
         self._load_server_org_table()
         self._load_server_tender_table(archived=False)
         self._load_server_tender_table(archived=True)
 
     def _load_server_org_table(self):
-        self.table_orgs.setRowCount(0)
         sid = self.get_selected_site_id()
         org_selected = self._get_server_control_org_selections()
         conn = sqlite3.connect(core.DB_FILE)
@@ -8646,20 +9064,14 @@ class ServerStoragePage(QWidget):
                 ).fetchall()
         finally:
             conn.close()
-        for i, r in enumerate(rows, 1):
+        display = []
+        for r in rows:
             selected = "Yes" if self._server_org_selection_key(r[1], r[3]) in org_selected else "No"
-            vals = [i, r[0], r[2], r[3], r[4], selected]
-            row = self.table_orgs.rowCount()
-            self.table_orgs.insertRow(row)
-            self._set_row(self.table_orgs, row, vals, center_cols={0, 1, 4, 5})
-        timer = getattr(self.table_orgs, "_rowfit_timer", None)
-        if timer is not None:
-            timer.start(0)
+            display.append((0, r[0], r[2], r[3], r[4], selected))
+        self.table_orgs.set_rows(display, center_cols={0, 1, 4, 5})
 
     def _load_server_tender_table(self, archived=False):
         table = self.table_archived if archived else self.table_tenders
-        cols = self.archived_cols if archived else self.tender_cols
-        table.setRowCount(0)
         sid = self.get_selected_site_id()
         tender_selected = self._get_server_control_tender_selections()
         where_parts = ["COALESCE(t.is_archived,0)=?"]
@@ -8674,33 +9086,29 @@ class ServerStoragePage(QWidget):
                 f"""SELECT t.id, t.website_id, w.name, COALESCE(t.tender_id,''), COALESCE(t.title,''), COALESCE(t.work_description,''),
                            COALESCE(t.tender_value,''), COALESCE(t.emd,''), COALESCE(t.org_chain,''), COALESCE(t.closing_date,''),
                            COALESCE(t.pre_bid_meeting_date,''), COALESCE(t.location,''), COALESCE(t.tender_category,''),
-                           COALESCE(t.status,''), COALESCE(t.folder_path,'')
+                           COALESCE(t.status,''), COALESCE(t.download_state,'')
                     FROM tenders t JOIN websites w ON w.id=t.website_id {where_sql}
-                    ORDER BY t.created_at DESC""",
+                    ORDER BY COALESCE(t.created_at,'') DESC""",
                 tuple(params),
             ).fetchall()
         finally:
             conn.close()
-        for i, r in enumerate(rows, 1):
+        display = []
+        for r in rows:
             closing_date_text, closing_time_text = self._split_date_time_text(r[9])
-            download_action = self._get_download_action_label(r[14], r[3])
+            download_action = r[14]
             selected = "Yes" if self._server_tender_selection_key(r[1], r[3]) in tender_selected else "No"
             vals = [
-                i, r[0], r[2], r[3], r[4], r[5], r[6], r[7], r[8],
+                0, r[0], r[2], r[3], r[4], r[5], r[6], r[7], r[8],
                 closing_date_text, closing_time_text, r[10], r[11], r[12]
             ]
             if archived:
                 vals.extend([r[13], selected, download_action])
-                center_cols = {0, 1, 9, 10, 14, 15, 16}
             else:
                 vals.extend([selected, download_action])
-                center_cols = {0, 1, 9, 10, 14, 15}
-            row = table.rowCount()
-            table.insertRow(row)
-            self._set_row(table, row, vals, center_cols=center_cols)
-        timer = getattr(table, "_rowfit_timer", None)
-        if timer is not None:
-            timer.start(0)
+            display.append(vals)
+        center_cols = {0, 1, 9, 10, 14, 15, 16} if archived else {0, 1, 9, 10, 14, 15}
+        table.set_rows(display, center_cols=center_cols)
 
     def _selected_tender_db_id(self, table, archived=False):
         rows = table.selectionModel().selectedRows() if table.selectionModel() is not None else []
@@ -9099,7 +9507,11 @@ class ServerStoragePage(QWidget):
                 usage = client.storage_usage().get("usage") or {}
                 listing = client.storage_list(relative_root=root_path, max_entries=3000)
             self._populate_items(listing.get("items") or [])
-            self.usage_label.setText(f"Usage: {self._format_size(usage.get('total_bytes') or 0)}")
+            usage_text = f"Usage: {self._format_size(usage.get('total_bytes') or 0)}"
+            on_disk = usage.get("deduplicated_bytes")
+            if on_disk is not None and int(on_disk) != int(usage.get("total_bytes") or 0):
+                usage_text += f" ({self._format_size(on_disk)} on disk)"
+            self.usage_label.setText(usage_text)
             self.counts_label.setText(
                 f"Files: {int(usage.get('file_count') or 0)} | Folders: {int(usage.get('dir_count') or 0)}"
             )
@@ -9233,7 +9645,7 @@ class ServerStoragePage(QWidget):
         finally:
             conn.close()
 
-    def _run_server_job(self, label, worker):
+    def _run_server_job(self, label, worker, sync_after=True):
         if not self._remote_scraper_ready():
             self.refresh_configuration()
             return
@@ -9247,7 +9659,8 @@ class ServerStoragePage(QWidget):
             err = ""
             try:
                 worker()
-                self.controller.scraper_backend.sync_remote_state()
+                if sync_after:
+                    self.controller.scraper_backend.sync_remote_state()
                 core.log_to_gui(f"{label} completed.")
             except Exception as e:
                 err = str(e)
@@ -9283,42 +9696,56 @@ class ServerStoragePage(QWidget):
             pass
         self._set_status("Fetched latest server data.")
 
-    def run_fetch_orgs(self):
+    def _run_server_batch(self, label, build_items):
+        # One server job for every site; its artifact carries the state DB, so no separate sync.
         def worker():
-            for sid in self.get_target_site_ids():
-                self.controller.scraper_backend.fetch_organisations_server(sid)
-        self._run_server_job("Server fetch organizations", worker)
+            self.controller.scraper_backend.run_server_batch(build_items())
+        self._run_server_job(label, worker, sync_after=False)
+
+    def run_fetch_orgs(self):
+        self._run_server_batch(
+            "Server fetch organizations",
+            lambda: [("fetch_organisations", {"website_id": int(sid)}) for sid in self.get_target_site_ids()],
+        )
 
     def run_fetch_tenders(self):
-        def worker():
-            target_sites = self.get_target_site_ids()
-            for sid in target_sites:
-                self.controller.scraper_backend.fetch_tenders_server(
-                    sid,
-                    selected_org_names=self._selected_server_org_names_for_site(sid),
+        self._run_server_batch(
+            "Server fetch tenders",
+            lambda: [
+                (
+                    "fetch_tenders",
+                    {"website_id": int(sid), "selected_org_names": self._selected_server_org_names_for_site(sid)},
                 )
-        self._run_server_job("Server fetch tenders", worker)
+                for sid in self.get_target_site_ids()
+            ],
+        )
 
     def run_download(self):
-        def worker():
-            for sid in self.get_target_site_ids():
-                self.controller.scraper_backend.download_tenders_server(
-                    sid,
-                    target_tender_ids=self._selected_server_tender_ids_for_site(sid),
+        self._run_server_batch(
+            "Server download selected tenders",
+            lambda: [
+                (
+                    "download_tenders",
+                    {"website_id": int(sid), "target_tender_ids": self._selected_server_tender_ids_for_site(sid)},
                 )
-        self._run_server_job("Server download selected tenders", worker)
+                for sid in self.get_target_site_ids()
+            ],
+        )
 
     def run_download_results(self):
-        def worker():
-            for sid in self.get_target_site_ids():
-                self.controller.scraper_backend.download_results_server(sid)
-        self._run_server_job("Server download results", worker)
+        self._run_server_batch(
+            "Server download results",
+            lambda: [("download_results", {"website_id": int(sid)}) for sid in self.get_target_site_ids()],
+        )
 
     def run_status_check(self):
-        def worker():
-            for sid in self.get_target_site_ids():
-                self.controller.scraper_backend.check_tender_status_server(sid, archived_only=False)
-        self._run_server_job("Server status check", worker)
+        self._run_server_batch(
+            "Server status check",
+            lambda: [
+                ("check_status", {"website_id": int(sid), "archived_only": False})
+                for sid in self.get_target_site_ids()
+            ],
+        )
 
     def run_fetch_data(self):
         if not self._remote_scraper_ready() or self._sync_running or self._job_running:
@@ -9382,6 +9809,198 @@ class PlaceholderPage(QWidget):
             root.addWidget(btn, 0, Qt.AlignLeft)
 
 
+class CaptchaInboxDialog(QDialog):
+    """Pending captchas of every remote job; Enter sends an answer and moves to the next one."""
+
+    captchas_loaded = Signal(object)
+    answers_sent = Signal(object)
+
+    def __init__(self, client_factory, parent=None):
+        super().__init__(parent)
+        self._client_factory = client_factory
+        self._rows = {}
+        self._loading = False
+        # Each list request gets a number; answered challenges stay hidden until a list requested
+        # after the server took the answer comes back. cid -> last load number to hide it from
+        # (None while the answer is still being sent).
+        self._load_seq = 0
+        self._in_flight = {}
+        self.setWindowTitle("Captcha Inbox")
+        self.setModal(False)
+        self.resize(460, 560)
+
+        root = QVBoxLayout(self)
+        root.setContentsMargins(12, 12, 12, 12)
+        root.setSpacing(8)
+        self.status_label = QLabel("Loading captchas...")
+        self.status_label.setObjectName("SoftText")
+        root.addWidget(self.status_label)
+
+        scroll = QScrollArea()
+        scroll.setWidgetResizable(True)
+        host = QWidget()
+        self._list_lay = QVBoxLayout(host)
+        self._list_lay.setContentsMargins(0, 0, 0, 0)
+        self._list_lay.setSpacing(6)
+        self._list_lay.addStretch(1)
+        scroll.setWidget(host)
+        root.addWidget(scroll, 1)
+
+        btns = QHBoxLayout()
+        self.btn_submit_all = QPushButton("Submit All")
+        self.btn_close = QPushButton("Close")
+        btns.addStretch(1)
+        btns.addWidget(self.btn_submit_all)
+        btns.addWidget(self.btn_close)
+        root.addLayout(btns)
+
+        self.btn_submit_all.clicked.connect(self.submit_all)
+        self.btn_close.clicked.connect(self.hide)
+        self.captchas_loaded.connect(self._apply_items)
+        self.answers_sent.connect(self._on_answers_sent)
+        self._timer = QTimer(self)
+        self._timer.timeout.connect(self.refresh)
+
+    def showEvent(self, event):
+        super().showEvent(event)
+        self._timer.start(1500)
+        self.refresh()
+
+    def hideEvent(self, event):
+        self._timer.stop()
+        super().hideEvent(event)
+
+    def refresh(self):
+        if self._loading:
+            return
+        self._loading = True
+        self._load_seq += 1
+        threading.Thread(target=self._load_worker, args=(self._load_seq,), daemon=True).start()
+
+    def _load_worker(self, seq):
+        try:
+            items = self._client_factory().list_captchas().get("items") or []
+            self.captchas_loaded.emit({"items": items, "seq": seq})
+        except Exception as e:
+            self.captchas_loaded.emit({"error": str(e), "seq": seq})
+
+    def _apply_items(self, data):
+        self._loading = False
+        if data.get("error"):
+            self.status_label.setText(f"Failed to load captchas: {data['error']}")
+            return
+        seq = int(data.get("seq") or 0)
+        for cid in [cid for cid, until in self._in_flight.items() if until is not None and seq > until]:
+            del self._in_flight[cid]
+        items = [
+            it for it in (data.get("items") or [])
+            if str(it.get("challenge_id") or "") and str(it["challenge_id"]) not in self._in_flight
+        ]
+        ids = [str(it["challenge_id"]) for it in items]
+        for cid in [cid for cid in self._rows if cid not in ids]:
+            self._remove_row(cid)
+        for item in items:
+            cid = str(item["challenge_id"])
+            if cid not in self._rows:
+                self._rows[cid] = self._make_row(item)
+        # Server order: highest priority first, then closest to expiry.
+        for idx, cid in enumerate(ids):
+            row = self._rows[cid][0]
+            self._list_lay.removeWidget(row)
+            self._list_lay.insertWidget(idx, row)
+        self.status_label.setText(f"{len(ids)} captcha(s) waiting." if ids else "No captchas waiting.")
+        focused = QApplication.focusWidget()
+        if not any(edit is focused for _row, edit in self._rows.values()):
+            self._focus_next()
+
+    def _make_row(self, item):
+        cid = str(item["challenge_id"])
+        row = QFrame()
+        lay = QHBoxLayout(row)
+        lay.setContentsMargins(4, 4, 4, 4)
+        img = QLabel("[captcha]")
+        px = QPixmap()
+        try:
+            px.loadFromData(base64.b64decode(str(item.get("image_base64") or "").encode("ascii")))
+        except Exception:
+            pass
+        if not px.isNull():
+            img.setPixmap(px)
+        lay.addWidget(img)
+        col = QVBoxLayout()
+        info = QLabel(f"{str(item.get('action') or '').replace('_', ' ')} | priority {int(item.get('priority') or 0)}")
+        info.setObjectName("SoftText")
+        col.addWidget(info)
+        edit = QLineEdit()
+        edit.setPlaceholderText("Answer, Enter to send")
+        edit.returnPressed.connect(lambda cid=cid: self._send_one(cid))
+        col.addWidget(edit)
+        lay.addLayout(col, 1)
+        skip = QPushButton("Skip")
+        skip.setToolTip("Cancel this captcha; the job carries on without it.")
+        skip.clicked.connect(lambda _=False, cid=cid: self._send({cid: ""}))
+        lay.addWidget(skip)
+        return row, edit
+
+    def _remove_row(self, cid):
+        entry = self._rows.pop(cid, None)
+        if entry is None:
+            return
+        self._list_lay.removeWidget(entry[0])
+        entry[0].deleteLater()
+
+    def _focus_next(self):
+        for idx in range(self._list_lay.count()):
+            widget = self._list_lay.itemAt(idx).widget()
+            for row, edit in self._rows.values():
+                if row is widget and not edit.text().strip():
+                    edit.setFocus()
+                    return
+
+    def _send_one(self, cid):
+        entry = self._rows.get(cid)
+        if entry is None or not entry[1].text().strip():
+            return
+        self._send({cid: entry[1].text().strip()})
+
+    def submit_all(self):
+        answers = {cid: edit.text().strip() for cid, (_row, edit) in self._rows.items() if edit.text().strip()}
+        if answers:
+            self._send(answers)
+
+    def _send(self, answers):
+        # Rows leave the inbox immediately so the next captcha can be typed while this one is sent.
+        for cid in answers:
+            self._remove_row(cid)
+            self._in_flight[cid] = None
+        self._focus_next()
+        threading.Thread(target=self._send_worker, args=(dict(answers),), daemon=True).start()
+
+    def _send_worker(self, answers):
+        sent = list(answers)
+        try:
+            results = self._client_factory().answer_captchas(answers).get("results") or {}
+            self.answers_sent.emit({"results": results, "sent": sent})
+        except Exception as e:
+            self.answers_sent.emit({"error": str(e), "sent": sent})
+
+    def _on_answers_sent(self, data):
+        for cid in data.get("sent") or []:
+            if data.get("error"):
+                # Not delivered: let the next refresh bring the row back so it can be retried.
+                self._in_flight.pop(cid, None)
+            elif cid in self._in_flight:
+                # Lists requested up to now may predate the answer.
+                self._in_flight[cid] = self._load_seq
+        if data.get("error"):
+            self.status_label.setText(f"Failed to send answers: {data['error']}")
+        else:
+            late = sum(1 for r in data["results"].values() if r != "accepted")
+            if late:
+                self.status_label.setText(f"{late} answer(s) arrived after the captcha expired or its job moved on.")
+        self.refresh()
+
+
 class BidManagerQt(QMainWindow):
     def __init__(self):
         super().__init__()
@@ -9389,8 +10008,12 @@ class BidManagerQt(QMainWindow):
         self.resize(1360, 880)
         self.archive_job_running = False
         self.server_archive_job_running = False
+        self.download_state_job_running = False
+        self._download_state_ticks = 0
         self._pending_online_refresh = False
+        self._pending_table_refresh = False
         self.scraper_backend = BackendModeScraperProxy()
+        self.captcha_inbox = None
 
         wrapper = QWidget()
         self.setCentralWidget(wrapper)
@@ -9486,6 +10109,7 @@ class BidManagerQt(QMainWindow):
             self._poll_timer.timeout.connect(self._poll_legacy_queues)
             self._poll_timer.start(200)
         self.start_daily_archive_scheduler()
+        self.start_download_state_scheduler()
 
     def _local_archive_interval_hours(self):
         try:
@@ -9618,6 +10242,7 @@ class BidManagerQt(QMainWindow):
             core.set_user_setting("main_window_maximized", bool(self.isMaximized()))
         except Exception:
             pass
+        core.flush_user_settings()
         super().closeEvent(event)
 
     def _poll_legacy_queues(self):
@@ -9643,12 +10268,29 @@ class BidManagerQt(QMainWindow):
             except py_queue.Empty:
                 break
             self._open_captcha_dialog(img_data)
+        notified = False
+        while True:
+            try:
+                remote_captcha_notices.get_nowait()
+            except py_queue.Empty:
+                break
+            notified = True
+        if notified:
+            self._show_captcha_inbox()
         if self._pending_online_refresh:
             self._pending_online_refresh = False
+            self._pending_table_refresh = False
             try:
                 self._ensure_online_page().on_site_changed()
             except Exception:
                 pass
+        if self._pending_table_refresh:
+            self._pending_table_refresh = False
+            try:
+                if hasattr(self, "online_page") and self.online_page:
+                    self.online_page.refresh_current_table_view()
+            except Exception:
+                pass
 
     def start_daily_archive_scheduler(self):
         QTimer.singleShot(5 * 60 * 1000, self._archive_scheduler_tick)
@@ -9685,6 +10327,7 @@ class BidManagerQt(QMainWindow):
             for sid in websites.keys():
                 total += int(core.ScraperBackend.archive_completed_tenders_logic(sid) or 0)
             core.ScraperBackend.set_setting("last_auto_archive_utc", datetime.datetime.now(datetime.UTC).isoformat())
+            core.optimize_db()
             core.ScraperBackend.log_auto_archive_run(
                 status="success",
                 archived_count=total,
@@ -9706,6 +10349,28 @@ class BidManagerQt(QMainWindow):
         finally:
             self.archive_job_running = False
 
+    def start_download_state_scheduler(self):
+        QTimer.singleShot(3000, self._download_state_tick)
+
+    def _download_state_tick(self):
+        # Stale rows every tick; a full mtime sweep on the first tick and every ~2 minutes
+        # picks up folders changed outside the app.
+        if not self.download_state_job_running:
+            full = self._download_state_ticks % 24 == 0
+            self._download_state_ticks += 1
+            self.download_state_job_running = True
+            threading.Thread(target=self._download_state_worker, args=(full,), daemon=True).start()
+        QTimer.singleShot(5000, self._download_state_tick)
+
+    def _download_state_worker(self, full):
+        try:
+            if core.refresh_download_states(full=full):
+                self._pending_table_refresh = True
+        except Exception as e:
+            core.log_to_gui(f"Download state refresh failed: {e}")
+        finally:
+            self.download_state_job_running = False
+
     def _run_server_archive_if_due(self):
         if self.server_archive_job_running:
             return
@@ -9736,6 +10401,16 @@ class BidManagerQt(QMainWindow):
         finally:
             self.server_archive_job_running = False
 
+    def _show_captcha_inbox(self):
+        if self.captcha_inbox is None:
+            self.captcha_inbox = CaptchaInboxDialog(self.scraper_backend._new_client, self)
+        if self.captcha_inbox.isVisible():
+            self.captcha_inbox.refresh()
+        else:
+            self.captcha_inbox.show()
+        self.captcha_inbox.raise_()
+        self.captcha_inbox.activateWindow()
+
     def _open_captcha_dialog(self, img_data):
         dlg = QDialog(self)
         dlg.setWindowTitle("Solve Captcha")
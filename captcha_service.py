@@ -0,0 +1,320 @@
+"""Captcha solving for the portal scrapers.
+
+Local solvers (on-CPU OCR and similar) are tried before the Gemini call. The last
+working Gemini model is remembered across processes so a fresh process does not
+re-run model discovery. Per-source latency and accuracy are recorded from the
+portal's verdict on each submitted answer.
+"""
+import importlib
+import io
+import json
+import os
+import re
+import threading
+import time
+
+CAPTCHA_PATTERN = re.compile(r"^[A-Za-z0-9]{6}$")
+GEMINI_PROMPT = "Extract the 6 alphanumeric characters from this CAPTCHA image. Return ONLY the text."
+GEMINI_FALLBACK_MODELS = [
+    "gemini-2.0-flash",
+    "gemini-2.0-flash-lite",
+    "gemini-1.5-flash-latest",
+    "gemini-1.5-pro-latest",
+    "gemini-1.5-flash",
+    "gemini-pro",
+]
+# A local solver is skipped once it has this many verdicts and is right less often than
+# LOCAL_SOLVER_MIN_ACCURACY: a wrong answer costs a portal round trip and a new captcha.
+LOCAL_SOLVER_MIN_VERDICTS = 20
+LOCAL_SOLVER_MIN_ACCURACY = 0.35
+
+
+def normalize_captcha_text(raw):
+    text = re.sub(r"[^a-zA-Z0-9]", "", str(raw or "").strip())
+    return text if CAPTCHA_PATTERN.match(text) else None
+
+
+class CaptchaAttempt:
+    def __init__(self, text, source, latency):
+        self.text = text
+        self.source = source
+        self.latency = latency
+
+
+class TesseractCaptchaSolver:
+    """Local OCR through pytesseract; inactive when pytesseract or the tesseract binary is missing."""
+
+    name = "tesseract"
+
+    def __init__(self):
+        self._pytesseract = None
+        self._image = None
+        self._available = None
+
+    def available(self):
+        if self._available is None:
+            try:
+                self._pytesseract = importlib.import_module("pytesseract")
+                self._image = importlib.import_module("PIL.Image")
+                self._pytesseract.get_tesseract_version()
+                self._available = True
+            except Exception:
+                self._available = False
+        return self._available
+
+    def solve(self, image_bytes):
+        if not self.available():
+            return None
+        img = self._image.open(io.BytesIO(image_bytes)).convert("L")
+        # Portal captchas are short dark glyphs on a light, noisy background.
+        img = img.resize((img.width * 2, img.height * 2)).point(lambda p: 255 if p > 140 else 0)
+        config = "--psm 7 -c tessedit_char_whitelist=ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789"
+        return self._pytesseract.image_to_string(img, config=config)
+
+
+LOCAL_SOLVER_BACKENDS = {
+    "tesseract": TesseractCaptchaSolver,
+}
+
+
+class CaptchaService:
+    def __init__(self, state_file, api_key, log=print):
+        self.state_file = state_file
+        self.api_key = api_key
+        self.log = log
+        self._lock = threading.Lock()
+        self._model_lock = threading.Lock()
+        self._model = None
+        self._model_name = None
+        self._model_probed = False
+        self._warm_thread = None
+        self._local_solvers = []
+        self._state = self._load_state()
+
+    # --- persistence ---
+    def _load_state(self):
+        try:
+            with open(self.state_file, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            if isinstance(data, dict):
+                data.setdefault("stats", {})
+                return data
+        except Exception:
+            pass
+        return {"model": None, "stats": {}}
+
+    def _save_state(self):
+        with self._lock:
+            snapshot = json.dumps(self._state, indent=2)
+        tmp = self.state_file + ".tmp"
+        try:
+            with open(tmp, "w", encoding="utf-8") as f:
+                f.write(snapshot)
+            os.replace(tmp, self.state_file)
+        except Exception:
+            pass
+
+    # --- local solvers ---
+    def register_local_solver(self, solver):
+        """Add a solver tried before Gemini: any object with `name` and `solve(image_bytes)`."""
+        with self._lock:
+            self._local_solvers = [s for s in self._local_solvers if s.name != solver.name] + [solver]
+
+    def use_local_backend(self, name):
+        factory = LOCAL_SOLVER_BACKENDS.get(str(name or "").strip().lower())
+        if factory is None:
+            return False
+        self.register_local_solver(factory())
+        return True
+
+    def _local_solver_enabled(self, name):
+        stats = self._state["stats"].get(name) or {}
+        verdicts = stats.get("correct", 0) + stats.get("wrong", 0)
+        if verdicts < LOCAL_SOLVER_MIN_VERDICTS:
+            return True
+        return stats.get("correct", 0) / verdicts >= LOCAL_SOLVER_MIN_ACCURACY
+
+    # --- Gemini model ---
+    def _genai(self):
+        genai = importlib.import_module("google.generativeai")
+        genai.configure(api_key=self.api_key)
+        return genai
+
+    def _discover_model_names(self, genai):
+        discovered = []
+        try:
+            for m in genai.list_models():
+                methods = getattr(m, "supported_generation_methods", []) or []
+                name = getattr(m, "name", None)
+                if name and "generateContent" in methods:
+                    discovered.append(name.split("/", 1)[1] if name.startswith("models/") else name)
+        except Exception as e:
+            self.log(f"Gemini list_models warning: {e}")
+        discovered.sort(key=lambda n: (0 if "flash" in n.lower() else 1, 0 if "pro" in n.lower() else 1, n))
+        names = []
+        for name in discovered + GEMINI_FALLBACK_MODELS:
+            if name and name not in names:
+                names.append(name)
+        return names
+
+    def model(self):
+        """Working Gemini model; the persisted name is used directly, discovery runs only without one."""
+        with self._model_lock:
+            if self._model is not None:
+                return self._model
+            try:
+                genai = self._genai()
+            except Exception as e:
+                self.log(f"Gemini config error: {e}")
+                return None
+            persisted = self._state.get("model")
+            if persisted:
+                self._model = genai.GenerativeModel(persisted)
+                self._model_name = persisted
+                self._model_probed = False
+                return self._model
+            last_error = None
+            for name in self._discover_model_names(genai):
+                try:
+                    model = genai.GenerativeModel(name)
+                    # lightweight capability probe
+                    model.generate_content("ok", generation_config={"temperature": 0})
+                except Exception as e:
+                    last_error = e
+                    continue
+                self._model, self._model_name = model, name
+                self._model_probed = True
+                with self._lock:
+                    self._state["model"] = name
+                self._save_state()
+                self.log(f"Gemini model selected: {name}")
+                return model
+            if last_error:
+                self.log(f"Gemini model detection failed: {last_error}")
+            return None
+
+    @property
+    def model_name(self):
+        return self._model_name
+
+    def _forget_model(self):
+        with self._model_lock:
+            self._model = None
+            self._model_name = None
+            with self._lock:
+                self._state["model"] = None
+        self._save_state()
+
+    def warm_up_async(self):
+        """Resolve the model (and open its connection) in the background, e.g. while a browser starts."""
+        with self._lock:
+            if self._model is not None or (self._warm_thread is not None and self._warm_thread.is_alive()):
+                return
+            self._warm_thread = threading.Thread(target=self._warm_up, name="captcha-warmup", daemon=True)
+            self._warm_thread.start()
+
+    def _warm_up(self):
+        model = self.model()
+        if model is None or self._model_probed:
+            return
+        try:
+            model.generate_content("ok", generation_config={"temperature": 0})
+        except Exception as e:
+            self.log(f"Gemini model {self._model_name} failed warm-up ({e}); rediscovering.")
+            self._forget_model()
+            self.model()
+
+    # --- solving ---
+    def solve(self, image_bytes):
+        """Best answer for a captcha image as a CaptchaAttempt, or None."""
+        with self._lock:
+            solvers = list(self._local_solvers)
+        for solver in solvers:
+            if not self._local_solver_enabled(solver.name):
+                continue
+            started = time.monotonic()
+            try:
+                text = normalize_captcha_text(solver.solve(image_bytes))
+            except Exception as e:
+                self.log(f"Local captcha solver {solver.name} error: {e}")
+                text = None
+            latency = time.monotonic() - started
+            self._record(solver.name, latency, answered=bool(text))
+            if text:
+                return CaptchaAttempt(text, solver.name, latency)
+        return self._solve_with_gemini(image_bytes)
+
+    def _solve_with_gemini(self, image_bytes):
+        model = self.model()
+        if model is None:
+            return None
+        source = f"gemini:{self._model_name}"
+        started = time.monotonic()
+        try:
+            image = importlib.import_module("PIL.Image").open(io.BytesIO(image_bytes))
+            response = model.generate_content([GEMINI_PROMPT, image])
+            text = normalize_captcha_text(response.text)
+        except Exception as e:
+            self.log(f"Gemini Error: {e}")
+            self._record(source, time.monotonic() - started, answered=False)
+            if self._state.get("model") == self._model_name and "not found" in str(e).lower():
+                # The remembered model was retired; discover again next time.
+                self._forget_model()
+            return None
+        latency = time.monotonic() - started
+        self._record(source, latency, answered=bool(text))
+        return CaptchaAttempt(text, source, latency) if text else None
+
+    # --- stats ---
+    def _record(self, source, latency, answered):
+        with self._lock:
+            stats = self._state["stats"].setdefault(
+                source, {"calls": 0, "answered": 0, "correct": 0, "wrong": 0, "latency_total": 0.0}
+            )
+            stats["calls"] += 1
+            stats["latency_total"] += latency
+            if answered:
+                stats["answered"] += 1
+
+    def report(self, attempt, correct):
+        """Record the portal's verdict on an answer returned by solve()."""
+        if attempt is None:
+            return
+        with self._lock:
+            stats = self._state["stats"].setdefault(
+                attempt.source, {"calls": 0, "answered": 0, "correct": 0, "wrong": 0, "latency_total": 0.0}
+            )
+            stats["correct" if correct else "wrong"] += 1
+        self._save_state()
+
+    def stats(self):
+        with self._lock:
+            out = {}
+            for source, s in self._state["stats"].items():
+                verdicts = s.get("correct", 0) + s.get("wrong", 0)
+                out[source] = {
+                    "calls": s.get("calls", 0),
+                    "avg_latency_s": round(s.get("latency_total", 0.0) / s["calls"], 3) if s.get("calls") else None,
+                    "accuracy": round(s.get("correct", 0) / verdicts, 3) if verdicts else None,
+                }
+            return out
+
+    def evaluate_local_solvers(self, fixture_dir):
+        """Offline accuracy of the local solvers over images named `<answer>.png`."""
+        results = {}
+        with self._lock:
+            solvers = list(self._local_solvers)
+        names = sorted(n for n in os.listdir(fixture_dir) if n.lower().endswith((".png", ".jpg", ".jpeg")))
+        for solver in solvers:
+            correct = 0
+            for name in names:
+                with open(os.path.join(fixture_dir, name), "rb") as f:
+                    data = f.read()
+                try:
+                    guess = normalize_captcha_text(solver.solve(data))
+                except Exception:
+                    guess = None
+                if guess and guess == os.path.splitext(name)[0]:
+                    correct += 1
+            results[solver.name] = {"images": len(names), "correct": correct}
+        return results
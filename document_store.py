@@ -0,0 +1,176 @@
+"""Content-addressed store for downloaded portal documents.
+
+Blobs live under `objects/<sha[:2]>/<sha256>` and are hardlinked into download
+folders, so a document fetched by several workspaces is kept on disk once. An
+index maps each source URL to the blob it last produced together with the
+response validators (strong ETag or Last-Modified, and Content-Length); a URL
+fetched within `max_age_seconds` is served from its blob only when a HEAD still
+reports the same ETag/Last-Modified. Content-Length alone is never enough: the
+same portal href can name a different document in another session.
+"""
+import hashlib
+import os
+import shutil
+import sqlite3
+import threading
+import time
+
+BLOB_CHUNK_SIZE = 256 * 1024
+
+
+def _sha256(path):
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(BLOB_CHUNK_SIZE), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def link_or_copy(src, dst):
+    """Place `src` at `dst` as a hardlink, copying when linking is not possible (other volume, FAT)."""
+    tmp = dst + ".link"
+    try:
+        os.remove(tmp)
+    except OSError:
+        pass
+    try:
+        os.link(src, tmp)
+    except OSError:
+        shutil.copy2(src, tmp)
+    os.replace(tmp, dst)
+
+
+class DocumentBlobStore:
+    def __init__(self, root, max_age_seconds=24 * 3600):
+        self.root = os.path.abspath(root)
+        self.objects_dir = os.path.join(self.root, "objects")
+        self.index_file = os.path.join(self.root, "index.db")
+        self.max_age_seconds = max(0, int(max_age_seconds))
+        self._lock = threading.Lock()
+        os.makedirs(self.objects_dir, exist_ok=True)
+        conn = self._connect()
+        try:
+            conn.execute(
+                """CREATE TABLE IF NOT EXISTS url_blobs (
+                       url TEXT PRIMARY KEY,
+                       sha256 TEXT,
+                       size INTEGER,
+                       validator TEXT,
+                       content_length INTEGER,
+                       fetched_at REAL
+                   )"""
+            )
+            conn.commit()
+        finally:
+            conn.close()
+
+    def _connect(self):
+        conn = sqlite3.connect(self.index_file, timeout=30)
+        conn.execute("PRAGMA journal_mode=WAL")
+        return conn
+
+    def blob_path(self, sha256):
+        return os.path.join(self.objects_dir, sha256[:2], sha256)
+
+    def recent(self, url):
+        """Index entry for `url` if it was fetched within the reuse window and its blob is still there."""
+        conn = self._connect()
+        try:
+            row = conn.execute(
+                "SELECT sha256, size, validator, content_length, fetched_at FROM url_blobs WHERE url=?",
+                (url,),
+            ).fetchone()
+        finally:
+            conn.close()
+        if not row or time.time() - float(row[4] or 0) > self.max_age_seconds:
+            return None
+        path = self.blob_path(row[0])
+        try:
+            if os.path.getsize(path) != int(row[1]):
+                return None
+        except OSError:
+            return None
+        return {"sha256": row[0], "size": row[1], "validator": row[2], "content_length": row[3], "path": path}
+
+    @staticmethod
+    def still_valid(entry, validator, content_length):
+        """True when the HEAD reports the recorded ETag/Last-Modified (and length, when both are known)."""
+        if not entry.get("validator") or not validator or entry["validator"] != validator:
+            return False
+        if str(validator).startswith("W/"):
+            return False
+        if entry.get("content_length") is not None and content_length is not None:
+            if int(entry["content_length"]) != int(content_length):
+                return False
+        return True
+
+    def materialize(self, entry, file_path, expected_sha256=None):
+        if expected_sha256 and entry["sha256"] != str(expected_sha256).lower():
+            return False
+        link_or_copy(entry["path"], file_path)
+        return True
+
+    def add(self, url, file_path, validator=None, content_length=None):
+        """Move a fresh download into the store and link it back; returns the blob's SHA-256."""
+        sha = _sha256(file_path)
+        size = os.path.getsize(file_path)
+        blob = self.blob_path(sha)
+        with self._lock:
+            if os.path.exists(blob) and os.path.getsize(blob) == size:
+                # Same bytes already stored (another URL or workspace): keep one copy.
+                link_or_copy(blob, file_path)
+            else:
+                os.makedirs(os.path.dirname(blob), exist_ok=True)
+                link_or_copy(file_path, blob)
+            conn = self._connect()
+            try:
+                conn.execute(
+                    "INSERT OR REPLACE INTO url_blobs (url, sha256, size, validator, content_length, fetched_at) "
+                    "VALUES (?, ?, ?, ?, ?, ?)",
+                    (url, sha, size, validator, content_length, time.time()),
+                )
+                conn.commit()
+            finally:
+                conn.close()
+        return sha
+
+    def prune(self):
+        """Remove blobs no download folder links to any more and whose URLs are past the reuse window."""
+        cutoff = time.time() - self.max_age_seconds
+        removed = 0
+        with self._lock:
+            conn = self._connect()
+            try:
+                recent = {r[0] for r in conn.execute("SELECT sha256 FROM url_blobs WHERE fetched_at>=?", (cutoff,))}
+                for current, _dirs, files in os.walk(self.objects_dir):
+                    for name in files:
+                        path = os.path.join(current, name)
+                        try:
+                            if name in recent or os.stat(path).st_nlink > 1:
+                                continue
+                            os.remove(path)
+                            removed += 1
+                        except OSError:
+                            continue
+                conn.execute("DELETE FROM url_blobs WHERE fetched_at<?", (cutoff,))
+                conn.commit()
+            finally:
+                conn.close()
+        return removed
+
+    def stats(self):
+        blobs = 0
+        blob_bytes = 0
+        for current, _dirs, files in os.walk(self.objects_dir):
+            for name in files:
+                try:
+                    blob_bytes += os.path.getsize(os.path.join(current, name))
+                except OSError:
+                    continue
+                blobs += 1
+        conn = self._connect()
+        try:
+            urls = conn.execute("SELECT COUNT(*) FROM url_blobs").fetchone()[0]
+        finally:
+            conn.close()
+        return {"blobs": blobs, "blob_bytes": blob_bytes, "indexed_urls": int(urls)}
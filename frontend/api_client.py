@@ -1,15 +1,111 @@
 from __future__ import annotations
 
 import base64
+import os
+import threading
 import time
 from dataclasses import dataclass
 from typing import Any, Callable
 
 import requests
+from urllib3.util import Retry
+from urllib3.util.request import ACCEPT_ENCODING
 
 
 CaptchaSolver = Callable[[dict[str, Any]], str | None]
 
+# Only calls that can be repeated safely are retried; job creation and captcha answers are not.
+IDEMPOTENT_METHODS = frozenset({"GET", "HEAD", "OPTIONS", "PUT", "DELETE"})
+RETRY_STATUSES = (502, 503, 504)
+RETRY_ATTEMPTS = 3
+RETRY_BACKOFF_SECONDS = 0.5
+
+_shared_sessions: dict[tuple[str, str], requests.Session] = {}
+_shared_sessions_lock = threading.Lock()
+
+
+def shared_session(base_url: str, api_key: str) -> requests.Session:
+    """Keep-alive session reused by every client of this backend and key."""
+    key = (base_url, api_key)
+    with _shared_sessions_lock:
+        session = _shared_sessions.get(key)
+        if session is None:
+            session = requests.Session()
+            retry = Retry(
+                total=RETRY_ATTEMPTS,
+                backoff_factor=RETRY_BACKOFF_SECONDS,
+                status_forcelist=RETRY_STATUSES,
+                allowed_methods=IDEMPOTENT_METHODS,
+                raise_on_status=False,
+            )
+            adapter = requests.adapters.HTTPAdapter(pool_connections=4, pool_maxsize=16, max_retries=retry)
+            session.mount("http://", adapter)
+            session.mount("https://", adapter)
+            # gzip/deflate, plus br/zstd when their decoders are installed.
+            session.headers.update({"X-API-Key": api_key, "Accept-Encoding": ACCEPT_ENCODING})
+            _shared_sessions[key] = session
+        return session
+
+
+class ArtifactResume:
+    """Resume bookkeeping for one artifact download, shared by the sync and async clients.
+
+    The caller sends `headers()`, hands the response status and headers to `on_response()`,
+    writes the body when told to, and calls `finish()` once the loop is done.
+    """
+
+    DONE = "done"
+    RESTART = "restart"
+
+    def __init__(self, output_zip: str) -> None:
+        self.output_zip = output_zip
+        self.part = output_zip + ".part"
+        self.etag_file = self.part + ".etag"
+        self.etag: str | None = None
+        self.offset = 0
+        if os.path.exists(self.part) and os.path.exists(self.etag_file):
+            with open(self.etag_file, "r", encoding="utf-8") as f:
+                self.etag = f.read().strip() or None
+
+    def headers(self) -> dict[str, str]:
+        self.offset = os.path.getsize(self.part) if self.etag and os.path.exists(self.part) else 0
+        if not self.offset:
+            return {}
+        return {"Range": f"bytes={self.offset}-", "If-Range": str(self.etag)}
+
+    def on_response(self, status_code: int, headers: Any) -> str | None:
+        """DONE, RESTART, the file mode to write the body with, or None for an error status."""
+        content_range = str(headers.get("Content-Range") or "")
+        if status_code == 416 and self.offset:
+            total = content_range.rpartition("/")[2]
+            if total.isdigit() and int(total) == self.offset:
+                return self.DONE
+            self.etag = None
+            return self.RESTART
+        if status_code >= 400:
+            return None
+        if status_code == 206:
+            if not content_range.startswith(f"bytes {self.offset}-"):
+                self.etag = None
+                return self.RESTART
+            mode = "ab"
+        else:
+            mode = "wb"
+        self.etag = headers.get("ETag")
+        if self.etag:
+            with open(self.etag_file, "w", encoding="utf-8") as f:
+                f.write(self.etag)
+        return mode
+
+    def finish(self) -> None:
+        os.replace(self.part, self.output_zip)
+        if os.path.exists(self.etag_file):
+            os.remove(self.etag_file)
+
+    @staticmethod
+    def backoff(attempt: int) -> float:
+        return min(2 ** attempt, 10)
+
 
 @dataclass
 class BidApiClient:
@@ -19,16 +115,48 @@ class BidApiClient:
 
     def __post_init__(self) -> None:
         self.base_url = self.base_url.rstrip("/")
-        self.session = requests.Session()
-        self.session.headers.update({"X-API-Key": self.api_key})
+        self.session = shared_session(self.base_url, self.api_key)
 
     def health(self) -> dict[str, Any]:
         return self._request("GET", "/v1/health")
 
-    def create_job(self, action: str, payload: dict[str, Any], build_artifact: bool = True) -> dict[str, Any]:
+    def create_job(
+        self,
+        action: str,
+        payload: dict[str, Any],
+        build_artifact: bool = True,
+        resume_from: str | None = None,
+    ) -> dict[str, Any]:
         body = {"action": action, "payload": payload, "build_artifact": build_artifact}
+        if resume_from:
+            body["resume_from"] = resume_from
         return self._request("POST", "/v1/jobs", json=body)
 
+    def create_job_batch(
+        self,
+        items: list[tuple[str, dict[str, Any]]],
+        payload: dict[str, Any] | None = None,
+        build_artifact: bool = True,
+        include_files: bool = True,
+        resume_from: str | None = None,
+    ) -> dict[str, Any]:
+        """Queue (action, payload) pairs as one server job; `payload` holds workspace options."""
+        body = {
+            "items": [{"action": action, "payload": item_payload} for action, item_payload in items],
+            "payload": payload or {},
+            "build_artifact": build_artifact,
+            "include_files": include_files,
+        }
+        if resume_from:
+            body["resume_from"] = resume_from
+        return self._request("POST", "/v1/job-batches", json=body)
+
+    def get_job_batch(self, job_id: str) -> dict[str, Any]:
+        return self._request("GET", f"/v1/job-batches/{job_id}")
+
+    def cancel_job(self, job_id: str) -> dict[str, Any]:
+        return self._request("POST", f"/v1/jobs/{job_id}/cancel")
+
     def get_job(self, job_id: str) -> dict[str, Any]:
         return self._request("GET", f"/v1/jobs/{job_id}")
 
@@ -36,14 +164,49 @@ class BidApiClient:
         body = {"challenge_id": challenge_id, "value": value}
         return self._request("POST", f"/v1/jobs/{job_id}/captcha", json=body)
 
-    def download_artifact(self, job_id: str, output_zip: str) -> None:
+    def list_captchas(self) -> dict[str, Any]:
+        return self._request("GET", "/v1/captchas")
+
+    def answer_captchas(self, answers: dict[str, str]) -> dict[str, Any]:
+        body = {"answers": [{"challenge_id": cid, "value": value} for cid, value in answers.items()]}
+        return self._request("POST", "/v1/captchas/answers", json=body)
+
+    def captcha_metrics(self) -> dict[str, Any]:
+        return self._request("GET", "/v1/captchas/metrics")
+
+    def download_artifact(self, job_id: str, output_zip: str, attempts: int = 5) -> None:
+        """Download a job's artifact, resuming with Range/If-Range after a dropped connection.
+
+        Bytes go to `<output_zip>.part`; a part left by an earlier call is resumed while the
+        server's ETag (kept next to it) still matches.
+        """
         url = f"{self.base_url}/v1/jobs/{job_id}/artifact"
-        with self.session.get(url, timeout=self.timeout_seconds, stream=True) as resp:
-            resp.raise_for_status()
-            with open(output_zip, "wb") as f:
-                for chunk in resp.iter_content(chunk_size=1024 * 1024):
-                    if chunk:
-                        f.write(chunk)
+        resume = ArtifactResume(output_zip)
+        last_error: Exception | None = None
+        for attempt in range(max(1, int(attempts))):
+            try:
+                with self.session.get(url, timeout=self.timeout_seconds, stream=True, headers=resume.headers()) as resp:
+                    mode = resume.on_response(resp.status_code, resp.headers)
+                    if mode is None:
+                        resp.raise_for_status()
+                    if mode == ArtifactResume.RESTART:
+                        continue
+                    if mode != ArtifactResume.DONE:
+                        with open(resume.part, mode) as f:
+                            for chunk in resp.iter_content(chunk_size=1024 * 1024):
+                                if chunk:
+                                    f.write(chunk)
+                break
+            except (
+                requests.exceptions.ConnectionError,
+                requests.exceptions.Timeout,
+                requests.exceptions.ChunkedEncodingError,
+            ) as e:
+                last_error = e
+                time.sleep(ArtifactResume.backoff(attempt))
+        else:
+            raise last_error or RuntimeError("Artifact download failed.")
+        resume.finish()
 
     def run_job_until_done(
         self,
@@ -72,10 +235,24 @@ class BidApiClient:
 
             if status == "failed":
                 raise RuntimeError(str(job.get("error") or "Remote job failed."))
-            if status == "completed":
+            if status in ("completed", "cancelled"):
                 return job
             time.sleep(poll_interval_seconds)
 
+    def run_jobs(
+        self,
+        jobs: list[tuple[str, dict[str, Any]]],
+        captcha_solver: Callable[[dict[str, Any]], Any] | None = None,
+        max_concurrent: int = 4,
+    ) -> list[dict[str, Any] | BaseException]:
+        """Blocking front for AsyncBidApiClient.run_jobs on the app-wide event loop (needs httpx)."""
+        from .async_api_client import AsyncBidApiClient
+
+        client = AsyncBidApiClient(self.base_url, self.api_key, timeout_seconds=self.timeout_seconds)
+        return client.events.run(
+            client.run_jobs(jobs, captcha_solver=captcha_solver, max_concurrent=max_concurrent)
+        )
+
     @staticmethod
     def decode_captcha_image(captcha_payload: dict[str, Any]) -> bytes:
         return base64.b64decode(str(captcha_payload.get("image_base64") or ""))
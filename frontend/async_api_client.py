@@ -0,0 +1,249 @@
+from __future__ import annotations
+
+import asyncio
+import importlib
+import inspect
+import threading
+from concurrent.futures import Future
+from typing import Any, Awaitable, Callable, TypeVar
+
+from .api_client import IDEMPOTENT_METHODS, ArtifactResume, RETRY_ATTEMPTS, RETRY_BACKOFF_SECONDS, RETRY_STATUSES
+
+T = TypeVar("T")
+AsyncCaptchaSolver = Callable[[dict[str, Any]], "str | None | Awaitable[str | None]"]
+
+
+def _httpx():
+    try:
+        return importlib.import_module("httpx")
+    except ImportError as e:
+        raise RuntimeError("AsyncBidApiClient needs httpx: pip install httpx[http2]") from e
+
+
+def _http2_available() -> bool:
+    try:
+        importlib.import_module("h2")
+        return True
+    except ImportError:
+        return False
+
+
+class ApiEventLoop:
+    """One background event loop, and one pooled HTTP client on it, for the whole app.
+
+    Every AsyncBidApiClient on this loop shares the keep-alive (HTTP/2 when `h2` is
+    installed) connections, and sync code drives it through `run()`/`submit()`.
+    """
+
+    def __init__(self) -> None:
+        self.loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self.loop.run_forever, name="api-event-loop", daemon=True)
+        self._thread.start()
+        self._http = None
+
+    def http(self):
+        # Only touched from the loop thread, so no lock is needed.
+        if self._http is None:
+            httpx = _httpx()
+            self._http = httpx.AsyncClient(
+                http2=_http2_available(),
+                limits=httpx.Limits(max_connections=32, max_keepalive_connections=16),
+            )
+        return self._http
+
+    def submit(self, coro: Awaitable[T]) -> Future[T]:
+        return asyncio.run_coroutine_threadsafe(coro, self.loop)
+
+    def run(self, coro: Awaitable[T], timeout: float | None = None) -> T:
+        return self.submit(coro).result(timeout)
+
+
+_api_loop: ApiEventLoop | None = None
+_api_loop_lock = threading.Lock()
+
+
+def api_loop() -> ApiEventLoop:
+    global _api_loop
+    with _api_loop_lock:
+        if _api_loop is None:
+            _api_loop = ApiEventLoop()
+        return _api_loop
+
+
+class AsyncBidApiClient:
+    """asyncio counterpart of BidApiClient; must be awaited on `api_loop().loop`."""
+
+    def __init__(self, base_url: str, api_key: str, timeout_seconds: int = 30, loop: ApiEventLoop | None = None) -> None:
+        self.base_url = base_url.rstrip("/")
+        self.api_key = api_key
+        self.timeout_seconds = timeout_seconds
+        self.events = loop or api_loop()
+
+    async def health(self) -> dict[str, Any]:
+        return await self._request("GET", "/v1/health")
+
+    async def create_job(
+        self,
+        action: str,
+        payload: dict[str, Any],
+        build_artifact: bool = True,
+        resume_from: str | None = None,
+    ) -> dict[str, Any]:
+        body = {"action": action, "payload": payload, "build_artifact": build_artifact}
+        if resume_from:
+            body["resume_from"] = resume_from
+        return await self._request("POST", "/v1/jobs", json=body)
+
+    async def create_job_batch(
+        self,
+        items: list[tuple[str, dict[str, Any]]],
+        payload: dict[str, Any] | None = None,
+        build_artifact: bool = True,
+        include_files: bool = True,
+        resume_from: str | None = None,
+    ) -> dict[str, Any]:
+        """Queue (action, payload) pairs as one server job; `payload` holds workspace options."""
+        body = {
+            "items": [{"action": action, "payload": item_payload} for action, item_payload in items],
+            "payload": payload or {},
+            "build_artifact": build_artifact,
+            "include_files": include_files,
+        }
+        if resume_from:
+            body["resume_from"] = resume_from
+        return await self._request("POST", "/v1/job-batches", json=body)
+
+    async def get_job_batch(self, job_id: str) -> dict[str, Any]:
+        return await self._request("GET", f"/v1/job-batches/{job_id}")
+
+    async def cancel_job(self, job_id: str) -> dict[str, Any]:
+        # Cancelling twice is harmless, so a dropped request may be repeated.
+        return await self._request("POST", f"/v1/jobs/{job_id}/cancel", idempotent=True)
+
+    async def get_job(self, job_id: str) -> dict[str, Any]:
+        return await self._request("GET", f"/v1/jobs/{job_id}")
+
+    async def submit_captcha(self, job_id: str, challenge_id: str, value: str) -> dict[str, Any]:
+        body = {"challenge_id": challenge_id, "value": value}
+        return await self._request("POST", f"/v1/jobs/{job_id}/captcha", json=body)
+
+    async def list_captchas(self) -> dict[str, Any]:
+        return await self._request("GET", "/v1/captchas")
+
+    async def answer_captchas(self, answers: dict[str, str]) -> dict[str, Any]:
+        body = {"answers": [{"challenge_id": cid, "value": value} for cid, value in answers.items()]}
+        return await self._request("POST", "/v1/captchas/answers", json=body)
+
+    async def captcha_metrics(self) -> dict[str, Any]:
+        return await self._request("GET", "/v1/captchas/metrics")
+
+    async def download_artifact(self, job_id: str, output_zip: str, attempts: int = 5) -> None:
+        """Same resume rules as BidApiClient.download_artifact (`.part` plus ETag, Range/If-Range)."""
+        httpx = _httpx()
+        url = f"{self.base_url}/v1/jobs/{job_id}/artifact"
+        resume = ArtifactResume(output_zip)
+        last_error: Exception | None = None
+        for attempt in range(max(1, int(attempts))):
+            headers = {"X-API-Key": self.api_key, **resume.headers()}
+            try:
+                async with self.events.http().stream("GET", url, headers=headers, timeout=self.timeout_seconds) as resp:
+                    mode = resume.on_response(resp.status_code, resp.headers)
+                    if mode is None:
+                        resp.raise_for_status()
+                    if mode == ArtifactResume.RESTART:
+                        continue
+                    if mode != ArtifactResume.DONE:
+                        with open(resume.part, mode) as f:
+                            async for chunk in resp.aiter_bytes(1024 * 1024):
+                                f.write(chunk)
+                break
+            except httpx.TransportError as e:
+                last_error = e
+                await asyncio.sleep(ArtifactResume.backoff(attempt))
+        else:
+            raise last_error or RuntimeError("Artifact download failed.")
+        resume.finish()
+
+    async def run_job_until_done(
+        self,
+        action: str,
+        payload: dict[str, Any],
+        captcha_solver: AsyncCaptchaSolver | None = None,
+        poll_interval_seconds: float = 1.2,
+        build_artifact: bool = True,
+    ) -> dict[str, Any]:
+        job = await self.create_job(action=action, payload=payload, build_artifact=build_artifact)
+        job_id = str(job["job_id"])
+        try:
+            while True:
+                job = await self.get_job(job_id)
+                status = str(job.get("status", ""))
+                if status == "captcha_required":
+                    cap = job.get("captcha") or {}
+                    challenge_id = str(cap.get("challenge_id", ""))
+                    if not challenge_id:
+                        raise RuntimeError("Captcha is required but challenge_id is missing.")
+                    if captcha_solver is None:
+                        raise RuntimeError("Captcha solver callback is required.")
+                    answer = await self._solve_captcha(captcha_solver, cap)
+                    if not answer:
+                        raise RuntimeError("Captcha was cancelled by user.")
+                    await self.submit_captcha(job_id=job_id, challenge_id=challenge_id, value=answer)
+                if status == "failed":
+                    raise RuntimeError(str(job.get("error") or "Remote job failed."))
+                if status in ("completed", "cancelled"):
+                    return job
+                await asyncio.sleep(poll_interval_seconds)
+        except asyncio.CancelledError:
+            # The caller gave up on this job; stop it on the server too.
+            await asyncio.shield(self.cancel_job(job_id))
+            raise
+
+    @staticmethod
+    async def _solve_captcha(captcha_solver: AsyncCaptchaSolver, cap: dict[str, Any]) -> str | None:
+        """Await an async solver; a blocking one (e.g. a dialog) runs in the loop's executor so
+        other jobs keep polling meanwhile."""
+        if inspect.iscoroutinefunction(captcha_solver):
+            return await captcha_solver(cap)
+        answer = await asyncio.get_running_loop().run_in_executor(None, captcha_solver, cap)
+        if inspect.isawaitable(answer):
+            answer = await answer
+        return answer
+
+    async def run_jobs(
+        self,
+        jobs: list[tuple[str, dict[str, Any]]],
+        captcha_solver: AsyncCaptchaSolver | None = None,
+        max_concurrent: int = 4,
+    ) -> list[dict[str, Any] | BaseException]:
+        """Drive several server jobs at once from one task each; results keep the input order."""
+        gate = asyncio.Semaphore(max(1, int(max_concurrent)))
+
+        async def one(action: str, payload: dict[str, Any]) -> dict[str, Any]:
+            async with gate:
+                return await self.run_job_until_done(action, payload, captcha_solver=captcha_solver)
+
+        return await asyncio.gather(*(one(action, payload) for action, payload in jobs), return_exceptions=True)
+
+    async def _request(self, method: str, path: str, idempotent: bool | None = None, **kwargs: Any) -> dict[str, Any]:
+        httpx = _httpx()
+        url = f"{self.base_url}{path}"
+        headers = {"X-API-Key": self.api_key, **(kwargs.pop("headers", None) or {})}
+        retry = method.upper() in IDEMPOTENT_METHODS if idempotent is None else idempotent
+        attempts = RETRY_ATTEMPTS + 1 if retry else 1
+        for attempt in range(attempts):
+            last = attempt + 1 >= attempts
+            try:
+                resp = await self.events.http().request(
+                    method, url, headers=headers, timeout=self.timeout_seconds, **kwargs
+                )
+            except httpx.TransportError:
+                if last:
+                    raise
+            else:
+                if resp.status_code not in RETRY_STATUSES or last:
+                    resp.raise_for_status()
+                    return resp.json()
+            await asyncio.sleep(RETRY_BACKOFF_SECONDS * (2 ** attempt))
+        raise RuntimeError("Request retries exhausted.")
+
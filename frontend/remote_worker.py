@@ -1,7 +1,9 @@
 from __future__ import annotations
 
-import io
+import os
+import time
 import zipfile
+import zlib
 from pathlib import Path
 from typing import Any, Callable
 
@@ -11,6 +13,73 @@ from .api_client import BidApiClient
 CaptchaDialog = Callable[[bytes], str | None]
 
 
+STATE_PREFIX = "__state/"
+EXTRACT_CHUNK_SIZE = 1024 * 1024
+
+
+def _file_crc32(path: Path) -> int:
+    crc = 0
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(EXTRACT_CHUNK_SIZE), b""):
+            crc = zlib.crc32(chunk, crc)
+    return crc
+
+
+def extract_artifact(
+    zip_path: str,
+    download_root: str,
+    state_dir: str | None = None,
+    log: Callable[[str], None] | None = None,
+) -> dict[str, int]:
+    """Stream each artifact entry to its final path; no temp tree, no second copy.
+
+    Entries are written to `<path>.sync` and renamed into place, and files that already
+    match the entry (size and CRC-32) are left alone. `__state/` entries go to
+    `state_dir` when given (and are not counted), otherwise under `download_root`; they
+    are extracted first. An entry that cannot be written (e.g. the file is open in a
+    viewer on Windows) is reported through `log`, counted as skipped, and the rest continue.
+    """
+    root = Path(download_root).resolve()
+    counts = {"written": 0, "unchanged": 0, "skipped": 0}
+    with zipfile.ZipFile(zip_path, "r") as zf:
+        infos = [info for info in zf.infolist() if not info.is_dir()]
+        infos.sort(key=lambda info: not info.filename.replace("\\", "/").startswith(STATE_PREFIX))
+        for info in infos:
+            name = info.filename.replace("\\", "/")
+            is_state = bool(state_dir) and name.startswith(STATE_PREFIX)
+            if is_state:
+                base, rel = Path(state_dir).resolve(), name[len(STATE_PREFIX):]
+            else:
+                base, rel = root, name
+            dst = (base / rel).resolve()
+            if base not in dst.parents:
+                continue
+            tmp = dst.with_name(dst.name + ".sync")
+            try:
+                if not is_state and dst.is_file() and dst.stat().st_size == info.file_size and _file_crc32(dst) == info.CRC:
+                    counts["unchanged"] += 1
+                    continue
+                dst.parent.mkdir(parents=True, exist_ok=True)
+                with zf.open(info, "r") as src, open(tmp, "wb") as out:
+                    for chunk in iter(lambda: src.read(EXTRACT_CHUNK_SIZE), b""):
+                        out.write(chunk)
+                os.replace(tmp, dst)
+                stamp = time.mktime(info.date_time + (0, 0, -1))
+                os.utime(dst, (stamp, stamp))
+            except OSError as e:
+                counts["skipped"] += 1
+                if log is not None:
+                    log(f"Could not update {rel}: {e}")
+                try:
+                    tmp.unlink(missing_ok=True)
+                except OSError:
+                    pass
+                continue
+            if not is_state:
+                counts["written"] += 1
+    return counts
+
+
 def run_remote_action_and_sync_downloads(
     client: BidApiClient,
     action: str,
@@ -29,13 +98,11 @@ def run_remote_action_and_sync_downloads(
     job_id = str(job["job_id"])
     result = job.get("result") or {}
     if bool(result.get("artifact_available", False)):
-        raw_zip = io.BytesIO()
         tmp_zip = local_root / f"{job_id}.zip"
         client.download_artifact(job_id, str(tmp_zip))
-        raw_zip.write(tmp_zip.read_bytes())
-        tmp_zip.unlink(missing_ok=True)
-        raw_zip.seek(0)
-        with zipfile.ZipFile(raw_zip, "r") as zf:
-            zf.extractall(local_root)
+        try:
+            extract_artifact(str(tmp_zip), str(local_root))
+        finally:
+            tmp_zip.unlink(missing_ok=True)
     return job
 
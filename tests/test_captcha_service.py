@@ -0,0 +1,175 @@
+import json
+import os
+import struct
+
+import pytest
+
+import captcha_service
+from captcha_service import CaptchaAttempt, CaptchaService
+
+FIXTURE_DIR = os.path.join(os.path.dirname(__file__), "fixtures", "captchas")
+
+
+def _png_text(data, keyword):
+    """Value of a PNG tEXt chunk, or None."""
+    pos = 8
+    while pos + 8 <= len(data):
+        length, kind = struct.unpack(">I4s", data[pos:pos + 8])
+        body = data[pos + 8:pos + 8 + length]
+        if kind == b"tEXt":
+            key, _, value = body.partition(b"\x00")
+            if key == keyword:
+                return value.decode("latin-1")
+        pos += 12 + length
+    return None
+
+
+class FixtureOcrSolver:
+    """Stands in for OCR: each fixture carries what a local OCR reads from it in a tEXt chunk."""
+
+    name = "fixture-ocr"
+
+    def __init__(self):
+        self.calls = 0
+
+    def solve(self, image_bytes):
+        self.calls += 1
+        return _png_text(image_bytes, b"ocr") or ""
+
+
+class FixedSolver:
+    def __init__(self, name, answer):
+        self.name = name
+        self.answer = answer
+        self.calls = 0
+
+    def solve(self, image_bytes):
+        self.calls += 1
+        if isinstance(self.answer, Exception):
+            raise self.answer
+        return self.answer
+
+
+def _fixture(name):
+    with open(os.path.join(FIXTURE_DIR, name), "rb") as f:
+        return f.read()
+
+
+@pytest.fixture()
+def service(tmp_path):
+    return CaptchaService(str(tmp_path / "captcha_service.json"), api_key="", log=lambda msg: None)
+
+
+@pytest.fixture()
+def no_gemini(service, monkeypatch):
+    calls = []
+
+    def fake(image_bytes):
+        calls.append(image_bytes)
+        return CaptchaAttempt("GEMINI", "gemini:stub", 0.0)
+
+    monkeypatch.setattr(service, "_solve_with_gemini", fake)
+    return calls
+
+
+def test_evaluate_local_solvers_scores_fixture_images(service):
+    service.register_local_solver(FixtureOcrSolver())
+    service.register_local_solver(FixedSolver("broken", RuntimeError("no OCR engine")))
+    results = service.evaluate_local_solvers(FIXTURE_DIR)
+    # A7K2QP and m4X9tB read correctly; Z3RW81 is misread as Z3RW8I; Q9PL5D is illegible.
+    assert results == {
+        "fixture-ocr": {"images": 4, "correct": 2},
+        "broken": {"images": 4, "correct": 0},
+    }
+
+
+def test_local_solvers_run_in_order_before_gemini(service, no_gemini):
+    first = FixedSolver("first", "??")
+    second = FixtureOcrSolver()
+    service.register_local_solver(first)
+    service.register_local_solver(second)
+    attempt = service.solve(_fixture("A7K2QP.png"))
+    assert (attempt.text, attempt.source) == ("A7K2QP", "fixture-ocr")
+    assert first.calls == 1 and second.calls == 1
+    assert no_gemini == []
+    stats = service._state["stats"]
+    assert stats["first"]["calls"] == 1 and stats["first"]["answered"] == 0
+    assert stats["fixture-ocr"]["answered"] == 1
+
+
+def test_falls_back_to_gemini_when_no_local_answer(service, no_gemini):
+    service.register_local_solver(FixtureOcrSolver())
+    service.register_local_solver(FixedSolver("crashing", ValueError("bad image")))
+    attempt = service.solve(_fixture("Q9PL5D.png"))
+    assert attempt.source == "gemini:stub"
+    assert len(no_gemini) == 1
+
+
+def test_inaccurate_local_solver_is_skipped(service, no_gemini):
+    solver = FixtureOcrSolver()
+    service.register_local_solver(solver)
+    service._state["stats"]["fixture-ocr"] = {
+        "calls": 20, "answered": 20, "correct": 5, "wrong": 15, "latency_total": 1.0,
+    }
+    attempt = service.solve(_fixture("A7K2QP.png"))
+    assert attempt.source == "gemini:stub"
+    assert solver.calls == 0
+
+
+def test_stats_and_model_survive_a_restart(tmp_path, monkeypatch):
+    state_file = str(tmp_path / "captcha_service.json")
+    listed = []
+
+    class FakeModel:
+        def __init__(self, name):
+            self.name = name
+
+        def generate_content(self, *args, **kwargs):
+            return None
+
+    class FakeGenai:
+        GenerativeModel = FakeModel
+
+        @staticmethod
+        def list_models():
+            listed.append(1)
+            return []
+
+    first = CaptchaService(state_file, api_key="k", log=lambda msg: None)
+    monkeypatch.setattr(first, "_genai", lambda: FakeGenai)
+    assert first.model_name is None and first.model() is not None
+    chosen = first.model_name
+    assert chosen == captcha_service.GEMINI_FALLBACK_MODELS[0]
+    first.register_local_solver(FixtureOcrSolver())
+    attempt = first.solve(_fixture("m4X9tB.png"))
+    first.report(attempt, correct=True)
+    first.report(CaptchaAttempt("Z3RW8I", "fixture-ocr", 0.1), correct=False)
+
+    with open(state_file, "r", encoding="utf-8") as f:
+        saved = json.load(f)
+    assert saved["model"] == chosen
+    assert saved["stats"]["fixture-ocr"]["correct"] == 1
+    assert saved["stats"]["fixture-ocr"]["wrong"] == 1
+
+    second = CaptchaService(state_file, api_key="k", log=lambda msg: None)
+    monkeypatch.setattr(second, "_genai", lambda: FakeGenai)
+    assert second.stats()["fixture-ocr"]["accuracy"] == 0.5
+    assert second.model() is not None and second.model_name == chosen
+    # The remembered model is used directly: no second discovery.
+    assert len(listed) == 1
+
+
+def test_corrupt_state_file_starts_empty(tmp_path):
+    state_file = tmp_path / "captcha_service.json"
+    state_file.write_text("{not json", encoding="utf-8")
+    service = CaptchaService(str(state_file), api_key="", log=lambda msg: None)
+    assert service.stats() == {}
+
+
+def test_tesseract_backend_on_fixtures(service):
+    solver = captcha_service.TesseractCaptchaSolver()
+    if not solver.available():
+        pytest.skip("pytesseract/tesseract not installed")
+    service.register_local_solver(solver)
+    results = service.evaluate_local_solvers(FIXTURE_DIR)
+    assert results["tesseract"]["images"] == 4
@@ -0,0 +1,128 @@
+import sqlite3
+
+import pytest
+
+import app_core as core
+
+UPSERT_ROW = (
+    1, "Org", "T-1", "Title", "100", "10", "01-Jan-2026", "02-Jan-2026",
+    "https://example.org/tender?id=1", "Pune", "Works", "", "Work",
+)
+
+
+def _download_log_all():
+    core.ScraperBackend.get_download_log_rows()
+
+
+def _download_log_site():
+    core.ScraperBackend.get_download_log_rows(website_id=1)
+
+
+def _downloaded_file_log():
+    core.ScraperBackend.get_downloaded_file_log("T-1")
+
+
+def _marked_tenders(monkeypatch):
+    monkeypatch.setattr(core, "ensure_scraper_dependencies", lambda: True)
+    core.ScraperBackend.download_tenders_logic(1)
+
+
+def _upsert_probes():
+    conn = sqlite3.connect(core.DB_FILE)
+    try:
+        core.ScraperBackend.upsert_tender_row(conn, UPSERT_ROW)
+    finally:
+        conn.rollback()
+        conn.close()
+
+
+# (index the loader's SELECTs must use, loader, whether it takes monkeypatch)
+LOADERS = [
+    ("idx_downloaded_files_at", _download_log_all),
+    ("idx_downloaded_files_at", _download_log_site),
+    ("idx_downloaded_file_unique", _downloaded_file_log),
+    ("idx_tenders_site_marked", _marked_tenders),
+    ("idx_tenders_site_org_title_closing", _upsert_probes),
+]
+
+
+@pytest.fixture()
+def db(tmp_path, monkeypatch):
+    monkeypatch.setattr(core, "DB_FILE", str(tmp_path / "tender_manager.db"))
+    monkeypatch.setattr(core, "log_to_gui", lambda msg: None)
+    core.init_db()
+    core.ScraperBackend.ensure_download_tables()
+    conn = sqlite3.connect(core.DB_FILE)
+    yield conn
+    conn.close()
+
+
+@pytest.fixture()
+def captured(db, monkeypatch):
+    """SQL (parameters expanded) of every statement run on connections opened from now on."""
+    statements = []
+    real_connect = sqlite3.connect
+
+    def connect(*args, **kwargs):
+        conn = real_connect(*args, **kwargs)
+        conn.set_trace_callback(statements.append)
+        return conn
+
+    monkeypatch.setattr(sqlite3, "connect", connect)
+    return statements
+
+
+def _plans(db, statements, table):
+    plans = []
+    for sql in statements:
+        if sql.lstrip().upper().startswith("SELECT") and f"FROM {table}" in sql:
+            plans.append(" | ".join(row[3] for row in db.execute("EXPLAIN QUERY PLAN " + sql)))
+    return plans
+
+
+def _assert_served(plans, index):
+    assert plans, "loader ran no matching SELECT"
+    assert any(f"USING INDEX {index}" in p or f"USING COVERING INDEX {index}" in p for p in plans), plans
+    for plan in plans:
+        assert "SCAN tenders" not in plan and "SCAN t " not in plan + " ", plan
+        assert "USE TEMP B-TREE FOR ORDER BY" not in plan, plan
+
+
+def test_init_db_creates_every_hot_path_index(db):
+    names = {r[0] for r in db.execute("SELECT name FROM sqlite_master WHERE type='index'")}
+    assert {name for name, _target in core.HOT_PATH_INDEXES} <= names
+    assert not names & set(core.RETIRED_INDEXES)
+
+
+@pytest.mark.parametrize("index, loader", LOADERS, ids=[loader.__name__.lstrip("_") for _i, loader in LOADERS])
+def test_loader_queries_use_their_index(db, captured, monkeypatch, index, loader):
+    if loader is _marked_tenders:
+        loader(monkeypatch)
+    else:
+        loader()
+    table = "downloaded_files" if index.startswith("idx_downloaded_file") else "tenders"
+    _assert_served(_plans(db, captured, table), index)
+
+
+@pytest.mark.parametrize("archived", [False, True], ids=["tenders", "archived"])
+@pytest.mark.parametrize("site", [None, 1], ids=["all_sites", "one_site"])
+def test_tender_tab_pages_use_created_index(db, captured, archived, site):
+    pytest.importorskip("PySide6")
+    import bid_pyside6
+
+    page = bid_pyside6.ViewTendersPage
+    methods = (
+        "_columns_for_key", "_tender_sql_query", "_tender_fts_match", "_tender_filter_sql",
+        "_tender_sort_keys", "_keyset_after", "_fetch_tender_page",
+    )
+    attrs = {name: page.__dict__[name] for name in methods}
+    for name in ("org_cols", "tender_cols", "archived_cols", "tender_sql_columns", "fts_filter_columns"):
+        attrs[name] = getattr(page, name)
+    tab = type("TenderTab", (), attrs)()
+    tab.sort_map, tab.filter_map, tab.quick_search_map = {}, {}, {}
+    tab.get_selected_site_id = lambda: site
+
+    key = "archived" if archived else "tenders"
+    tab._fetch_tender_page(tab._tender_sql_query(key, archived), limit=page.TENDER_PAGE_SIZE)
+    index = "idx_tenders_site_archived_created_nn" if site else "idx_tenders_archived_created_nn"
+    _assert_served(_plans(db, captured, "tenders t"), index)